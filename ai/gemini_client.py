@@ -0,0 +1,177 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+from vertexai.generative_models import GenerationConfig
+
+from config.env_config import settings
+
+REPAIR_PROMPT = """The JSON below was extracted from a document but is not valid for the response schema: {error}
+Return the same data as valid JSON that follows the schema. Do not add, remove or change any extracted value.
+"""
+
+
+class GeminiCallLimiter:
+    """
+    Bounds the Gemini extraction calls in flight on this instance and times each one out.
+
+    Calls go through the async Vertex AI client, so waiting on Gemini never blocks the event
+    loop. At most GEMINI_MAX_CONCURRENCY calls run at once, later ones queue, and a call that
+    takes longer than GEMINI_TIMEOUT_SECONDS is cancelled.
+    """
+
+    def __init__(self, max_concurrency: int, timeout_seconds: float):
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.repairs = 0
+        self.failed_repairs = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def generate_content(self, model, contents, timeout_seconds: Optional[float] = None, **kwargs):
+        """Run model.generate_content_async under the concurrency limit and timeout."""
+        queued_at = time.perf_counter()
+        self.queued += 1
+        acquired = False
+        try:
+            async with self._get_semaphore():
+                acquired = True
+                self.queued -= 1
+                started_at = time.perf_counter()
+                self.total_wait_ms += (started_at - queued_at) * 1000
+                self.in_flight += 1
+                try:
+                    return await asyncio.wait_for(
+                        model.generate_content_async(contents, **kwargs),
+                        timeout=timeout_seconds or self.timeout_seconds,
+                    )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise
+                except Exception:
+                    self.errors += 1
+                    raise
+                finally:
+                    self.in_flight -= 1
+                    elapsed_ms = (time.perf_counter() - started_at) * 1000
+                    self.calls += 1
+                    self.total_ms += elapsed_ms
+                    self.max_ms = max(self.max_ms, elapsed_ms)
+        finally:
+            # A request cancelled while still waiting for a slot
+            if not acquired:
+                self.queued -= 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout_seconds,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else None,
+            "max_ms": round(self.max_ms, 1),
+            "avg_wait_ms": round(self.total_wait_ms / self.calls, 1) if self.calls else None,
+            "json_repairs": self.repairs,
+            "failed_json_repairs": self.failed_repairs,
+        }
+
+
+gemini_limiter = GeminiCallLimiter(settings.GEMINI_MAX_CONCURRENCY, settings.GEMINI_TIMEOUT_SECONDS)
+
+
+def build_response_schema(template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Response schema of an extraction prompt's JSON template: every "" entity becomes a
+    nullable string and every nested template a nullable object with the same keys.
+    """
+    properties = {}
+    for key, value in template.items():
+        if isinstance(value, dict):
+            properties[key] = {**build_response_schema(value), "nullable": True}
+        else:
+            properties[key] = {"type": "string", "nullable": True}
+    return {"type": "object", "properties": properties}
+
+
+def parse_json_response(raw_response: str) -> Any:
+    raw_response = raw_response.strip()
+    # Remove the triple backticks and "json" if they exist
+    if raw_response.startswith("```json") and raw_response.endswith("```"):
+        raw_response = raw_response[7:-3].strip()
+    return json.loads(raw_response)
+
+
+def validate_json_response(data: Any, schema: Dict[str, Any], path: str = "response") -> Any:
+    """
+    Check parsed output against a schema from build_response_schema and return it cleaned.
+
+    Keys outside the schema are dropped and numbers given for string entities are turned
+    into strings. Raises ValueError naming the first value that does not fit.
+    """
+    if data is None and schema.get("nullable"):
+        return None
+    if schema["type"] == "string":
+        if isinstance(data, bool) or not isinstance(data, (str, int, float)):
+            raise ValueError(f"{path} must be a string")
+        return data if isinstance(data, str) else str(data)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must be an object")
+    return {
+        key: validate_json_response(data[key], property_schema, f"{path}.{key}")
+        for key, property_schema in schema["properties"].items()
+        if key in data
+    }
+
+
+async def generate_json(
+    model,
+    contents,
+    schema: Dict[str, Any],
+    postprocess: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Run an extraction in constrained JSON mode and return the validated result.
+
+    When the output still does not parse or validate (e.g. cut off by the token limit), a
+    single text-only repair call, without the document, fixes it up instead of the user
+    uploading the file again. postprocess may clean the data further, raising ValueError
+    for values that need the repair pass too.
+    """
+    generation_config = GenerationConfig(response_mime_type="application/json", response_schema=schema)
+
+    def finish(raw_response: str) -> Dict[str, Any]:
+        data = validate_json_response(parse_json_response(raw_response), schema)
+        return postprocess(data) if postprocess else data
+
+    response = await gemini_limiter.generate_content(model, contents, generation_config=generation_config)
+    raw_response = response.text
+    try:
+        return finish(raw_response)
+    except ValueError as e:
+        error = str(e)
+    print(f"Repairing extraction output: {error}")
+    gemini_limiter.repairs += 1
+
+    repair_contents = [REPAIR_PROMPT.format(error=error), raw_response]
+    response = await gemini_limiter.generate_content(model, repair_contents, generation_config=generation_config)
+    try:
+        return finish(response.text)
+    except ValueError:
+        gemini_limiter.failed_repairs += 1
+        raise
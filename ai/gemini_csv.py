@@ -1,13 +1,21 @@
+import json
+from typing import Any, Dict
+
 import vertexai
 from vertexai.generative_models import GenerativeModel, Part
+from ai.gemini_client import build_response_schema, generate_json
 from config.env_config import settings
+from models.patient_models import GeneResults
+from utils.extraction_cache import get_prompt_version
 
 project_id = settings.GCP_PROJECT_ID
 location = settings.GCP_LOCATION
 
 vertexai.init(project=project_id, location=location)
 
-model = GenerativeModel("gemini-2.0-flash-001")
+MODEL_NAME = "gemini-2.0-flash-001"
+
+model = GenerativeModel(MODEL_NAME)
 
 
 def csv_to_bytes(csv_path):
@@ -16,8 +24,7 @@ def csv_to_bytes(csv_path):
     return csv_bytes
 
 
-prompt = """You are a csv entity extraction specialist. Given a csv file of gene results, your task is to extract the text value of the results of the following entities:
-{
+entities = """{
     "CYP2R1": "",
     "VDR": "",
     "TCF7L2_rs7903146": "",
@@ -64,7 +71,10 @@ prompt = """You are a csv entity extraction specialist. Given a csv file of gene
     "OPRM1": "",
     "BDNF": "",
     "CLOCK": ""
-}
+}"""
+
+prompt = f"""You are a csv entity extraction specialist. Given a csv file of gene results, your task is to extract the text value of the results of the following entities:
+{entities}
 
 
 - The JSON schema must be followed during the extraction.
@@ -73,10 +83,26 @@ prompt = """You are a csv entity extraction specialist. Given a csv file of gene
 - If an entity is not found in the document, set the entity value to null.
 """
 
+# Constrained JSON output with exactly the entities of the prompt
+RESPONSE_SCHEMA = build_response_schema(json.loads(entities))
+
+PROMPT_VERSION = get_prompt_version(MODEL_NAME, prompt, json.dumps(RESPONSE_SCHEMA, sort_keys=True))
+
+
+def to_gene_results(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map extracted entities onto the GeneResults fields, which spell the 9P21 genes as
+    NineP21 since a field name cannot start with a digit.
+    """
+    fields = {
+        (f"NineP21_{key[len('9P21_'):]}" if key.startswith("9P21_") else key): value for key, value in response.items()
+    }
+    return GeneResults(**fields).model_dump()
+
 
-def gemini_csv_extractor(file_content: bytes):
+async def gemini_csv_extractor_async(file_content: bytes) -> Dict[str, Any]:
+    """Extract the genotypes of a gene results CSV as validated GeneResults fields, without blocking the event loop."""
     csv_file = Part.from_data(data=file_content, mime_type="text/csv")
     contents = [csv_file, prompt]
 
-    response = model.generate_content(contents)
-    return response.text
+    return await generate_json(model, contents, RESPONSE_SCHEMA, postprocess=to_gene_results)
@@ -1,13 +1,21 @@
+import json
+import re
+from typing import Any, Dict
+
 import vertexai
 from vertexai.generative_models import GenerativeModel, Part
+from ai.gemini_client import build_response_schema, generate_json
 from config.env_config import settings
+from utils.extraction_cache import get_prompt_version
 
 project_id = settings.GCP_PROJECT_ID
 location = settings.GCP_LOCATION
 
 vertexai.init(project=project_id, location=location)
 
-model = GenerativeModel("gemini-2.0-flash-001")
+MODEL_NAME = "gemini-2.0-flash-001"
+
+model = GenerativeModel(MODEL_NAME)
 
 
 def pdf_to_bytes(pdf_path):
@@ -16,8 +24,7 @@ def pdf_to_bytes(pdf_path):
     return pdf_bytes
 
 
-prompt = """You are a document entity extraction specialist. Given a document of lab results, your task is to extract the text value of the following entities:
-{
+entities = """{
     "patient": "",
     "sex": "",
     "age": "",
@@ -270,12 +277,15 @@ prompt = """You are a document entity extraction specialist. Given a document of
     "Platelet_Count": {
         "number": "",
         "unit": ""
-    }
+    },
     "Total_PSA": {
         "number": "",
         "unit": ""
     }
-}
+}"""
+
+prompt = f"""You are a document entity extraction specialist. Given a document of lab results, your task is to extract the text value of the following entities:
+{entities}
 
 - The JSON schema must be followed during the extraction.
 - The values must only include text found in the document.
@@ -286,13 +296,31 @@ prompt = """You are a document entity extraction specialist. Given a document of
 - For age, return the age in years as a number.
 """
 
+# Constrained JSON output with exactly the entities of the prompt
+RESPONSE_SCHEMA = build_response_schema(json.loads(entities))
+
+PROMPT_VERSION = get_prompt_version(MODEL_NAME, prompt, json.dumps(RESPONSE_SCHEMA, sort_keys=True))
+
+
+def normalize_lab_numbers(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check that every extracted number parses as one once the < and > operators and spaces
+    are dropped. Raises ValueError for values that need the repair pass.
+    """
+    for key, value in response.items():
+        if isinstance(value, dict) and value.get("number") is not None:
+            number = re.sub(r"[<>\s]", "", value["number"])
+            try:
+                float(number)
+            except ValueError:
+                raise ValueError(f"response.{key}.number is not a number: {value['number']!r}")
+            value["number"] = number
+    return response
+
 
-def gemini_pdf_extractor(file_content: bytes):
-    pdf_file = Part.from_data(
-        data=file_content,
-        mime_type="application/pdf",
-    )
+async def gemini_pdf_extractor_async(file_content: bytes) -> Dict[str, Any]:
+    """Extract the lab results of a PDF as validated JSON, without blocking the event loop."""
+    pdf_file = Part.from_data(data=file_content, mime_type="application/pdf")
     contents = [pdf_file, prompt]
 
-    response = model.generate_content(contents)
-    return response.text
+    return await generate_json(model, contents, RESPONSE_SCHEMA, postprocess=normalize_lab_numbers)
@@ -1,16 +1,152 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
+from requests.adapters import HTTPAdapter
+
 from config.env_config import settings
 
 
-def upload_blob(source_buffer, destination_blob_name):
-    """Uploads a file to the bucket."""
+class StorageMetrics:
+    """Per-process counters for requests made through the shared storage client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, Dict[str, float]] = {}
+        self.adapter: Optional[HTTPAdapter] = None
+
+    def record_response(self, response, *args, **kwargs):
+        """requests response hook: time every storage API call, up to its response headers, by HTTP method."""
+        elapsed_ms = response.elapsed.total_seconds() * 1000
+        with self._lock:
+            call = self.calls.setdefault(response.request.method, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            call["count"] += 1
+            call["total_ms"] += elapsed_ms
+            call["max_ms"] = max(call["max_ms"], elapsed_ms)
+        return response
+
+    def connection_counts(self) -> Dict[str, int]:
+        """Requests served and connections opened by the pooled HTTP adapter."""
+        requests_made = connections_opened = 0
+        if self.adapter is not None:
+            for pool_key in list(self.adapter.poolmanager.pools.keys()):
+                pool = self.adapter.poolmanager.pools.get(pool_key)
+                if pool is not None:
+                    requests_made += pool.num_requests
+                    connections_opened += pool.num_connections
+        return {"requests": requests_made, "connections_opened": connections_opened}
+
+    def as_dict(self) -> Dict[str, Any]:
+        counts = self.connection_counts()
+        reused = max(counts["requests"] - counts["connections_opened"], 0)
+        with self._lock:
+            calls = {
+                method: {
+                    "count": int(call["count"]),
+                    "avg_ms": round(call["total_ms"] / call["count"], 1),
+                    "max_ms": round(call["max_ms"], 1),
+                }
+                for method, call in self.calls.items()
+            }
+        return {
+            **counts,
+            "reused_connections": reused,
+            "reuse_rate": round(reused / counts["requests"], 4) if counts["requests"] else None,
+            "calls": calls,
+        }
+
+
+storage_metrics = StorageMetrics()
+
+# Bucket the report PDFs are listed and downloaded from
+REPORTS_BUCKET_NAME = "my_test_bucket_for_fastapi"
+
+# Files larger than one chunk are uploaded as chunked resumable uploads (a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = settings.STORAGE_UPLOAD_CHUNK_MB * 1024 * 1024
+
+_client_lock = threading.Lock()
+_storage_client: Optional[storage.Client] = None
+_buckets: Dict[str, storage.Bucket] = {}
+
+
+def get_storage_client() -> storage.Client:
+    """
+    Return the process-wide storage client, creating it on first use.
 
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(settings.CLOUD_STORAGE_BUCKET_NAME)
+    Credentials are discovered once and every call shares one authorized HTTP session
+    whose connection pool is sized by STORAGE_HTTP_POOL_SIZE, so concurrent uploads and
+    downloads reuse open connections instead of each opening a new one.
+    """
+    global _storage_client
+    if _storage_client is None:
+        with _client_lock:
+            if _storage_client is None:
+                started_at = time.perf_counter()
+                credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+                session = AuthorizedSession(credentials)
+                adapter = HTTPAdapter(
+                    pool_connections=settings.STORAGE_HTTP_POOL_SIZE,
+                    pool_maxsize=settings.STORAGE_HTTP_POOL_SIZE,
+                )
+                session.mount("https://", adapter)
+                session.hooks["response"].append(storage_metrics.record_response)
+                storage_metrics.adapter = adapter
+                _storage_client = storage.Client(project=project, credentials=credentials, _http=session)
+                print(f"Storage client ready in {(time.perf_counter() - started_at) * 1000:.0f} ms")
+    return _storage_client
+
+
+def get_bucket(bucket_name: Optional[str] = None) -> storage.Bucket:
+    """Return a reusable bucket handle, CLOUD_STORAGE_BUCKET_NAME by default."""
+    bucket_name = bucket_name or settings.CLOUD_STORAGE_BUCKET_NAME
+    bucket = _buckets.get(bucket_name)
+    if bucket is None:
+        bucket = _buckets.setdefault(bucket_name, get_storage_client().bucket(bucket_name))
+    return bucket
+
+
+def upload_blob(source_buffer, destination_blob_name, content_type: str = "application/pdf") -> int:
+    """Uploads a file to the bucket and returns the generation of the new object."""
+
+    bucket = get_bucket()
     blob = bucket.blob(destination_blob_name)
 
+    size = source_buffer.seek(0, 2)
     source_buffer.seek(0)
+    if size > UPLOAD_CHUNK_SIZE:
+        # Resumable upload in chunks, so a very large file is not sent in one request
+        blob.chunk_size = UPLOAD_CHUNK_SIZE
 
-    blob.upload_from_file(source_buffer, content_type="application/pdf")
+    # Uploads are only retried by default when a generation precondition is passed. An
+    # upload replaces the whole object, so a retried attempt leaves the blob holding
+    # exactly this file, as if the first attempt had succeeded; retrying is safe.
+    blob.upload_from_file(source_buffer, content_type=content_type, size=size, retry=DEFAULT_RETRY)
 
     print(f"File uploaded to {destination_blob_name}.")
+    return blob.generation
+
+
+async def upload_blob_async(source_buffer, destination_blob_name, content_type: str = "application/pdf") -> int:
+    """
+    Upload a file to the bucket in a worker thread, without blocking the event loop.
+
+    Wrap it in asyncio.create_task to start an upload while the next report is still
+    being rendered, and await the task before relying on the blob.
+    """
+    return await asyncio.to_thread(upload_blob, source_buffer, destination_blob_name, content_type)
+
+
+def get_blob_generation(blob_name: str) -> Optional[int]:
+    """Current generation of a blob in the bucket, or None if it does not exist."""
+    blob = get_bucket().get_blob(blob_name)
+    return blob.generation if blob is not None else None
+
+
+async def get_blob_generation_async(blob_name: str) -> Optional[int]:
+    """get_blob_generation in a worker thread, without blocking the event loop."""
+    return await asyncio.to_thread(get_blob_generation, blob_name)
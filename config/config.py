@@ -13,5 +13,9 @@ try:
     patients_collection = db.collection("patients")
     recommendations_collection = db.collection("recommendations")
     pdf_summaries_collection = db.collection("pdf_summaries")
+    rendered_reports_collection = db.collection("rendered_reports")
+    report_catalogue_collection = db.collection("report_catalogue")
+    extractions_collection = db.collection("extractions")
+    uploaded_files_collection = db.collection("uploaded_files")
 except Exception as e:
     raise RuntimeError(f"Failed to initialize Firestore: {str(e)}")
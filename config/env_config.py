@@ -32,6 +32,17 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: Optional[str] = None
     GCP_PROJECT_ID: Optional[str] = None
     GCP_LOCATION: Optional[str] = None
+    # Gemini extraction calls in flight per instance, and the time limit of each call
+    GEMINI_MAX_CONCURRENCY: int = 4
+    GEMINI_TIMEOUT_SECONDS: float = 90
+    # Result pages of a lab PDF sent to Gemini per call; longer documents are split into parallel calls
+    GEMINI_PDF_PAGES_PER_CALL: int = 4
+    # Lab PDFs of one batch upload extracted at the same time, and the most files a batch may hold
+    BLOOD_WORK_BATCH_CONCURRENCY: int = 3
+    BLOOD_WORK_BATCH_MAX_FILES: int = 50
+    # Also look for duplicate uploads among the hashes stored on the patient's reports when the
+    # uploaded file index has no entry; turn off once jobs.backfill_uploaded_file_index has run
+    UPLOADED_FILE_INDEX_FALLBACK: bool = True
 
     # JWT/Auth
     JWT_KEY: Optional[str] = None
@@ -40,6 +51,10 @@ class Settings(BaseSettings):
 
     # Cloud Storage
     CLOUD_STORAGE_BUCKET_NAME: Optional[str] = None
+    # Connections kept open by the shared storage client
+    STORAGE_HTTP_POOL_SIZE: int = 32
+    # Chunk size of resumable uploads, in MB
+    STORAGE_UPLOAD_CHUNK_MB: int = 8
 
     # SendGrid
     SENDGRID_API_KEY: Optional[str] = None
@@ -49,6 +64,14 @@ class Settings(BaseSettings):
     FRONTEND_PATIENT_RESET_PASSWORD_URL: str = "https://frontend-333120675205.us-central1.run.app/patient_reset_password"
     FRONTEND_PATIENT_SET_PASSWORD_URL: str = "http://localhost:3000/patient_set_password"
 
+    # Report rendering pool size (defaults to the CPUs available to the container)
+    REPORT_RENDER_WORKERS: Optional[int] = None
+    # Memory budget for rendered report pages reused between report generations
+    REPORT_PAGE_CACHE_MB: int = 128
+    # Default report download mode: "stream" through the API, "signed_url" or "redirect" to storage
+    REPORT_DOWNLOAD_MODE: str = "stream"
+    REPORT_SIGNED_URL_MINUTES: int = 5
+
     # Firestore
     FIRESTORE_CREDENTIALS_JSON: Optional[str] = None
     
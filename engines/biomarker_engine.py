@@ -1,14 +1,27 @@
+from functools import lru_cache
 import json
+from operator import itemgetter
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+BASE_DIR = Path(__file__).parent.parent
+BIOMARKER_GROUPS_PATH = BASE_DIR / "biomarkers_groups.json"
+
+# Order in which range types are checked; the first matching range wins.
+RANGE_PRECEDENCE = ("optimal", "normal", "abnormal")
+
+
+def get_biomarker_data_path(gender: str = "male") -> Path:
+    """Return the path of the reference data file for the given gender."""
+    return BASE_DIR / f"cleanedBioMarkers_{gender.lower()}.json"
 
 
 def load_biomarker_data(gender: str = "male") -> List[Dict]:
     """Load biomarker reference data from the appropriate JSON file."""
-    file_path = (
-        Path(__file__).parent.parent / f"cleanedBioMarkers_{gender.lower()}.json"
-    )
-    with open(file_path, "r") as f:
+    with open(get_biomarker_data_path(gender), "r") as f:
         return json.load(f)
 
 
@@ -21,29 +34,95 @@ def is_value_in_range(value: float, ranges: List[List[float]]) -> bool:
     )
 
 
-def evaluate_biomarker(
-    biomarker_name: str, value: float, gender: str = "male"
-) -> Dict[str, Union[str, float]]:
-    """
-    Evaluate a biomarker value against reference ranges.
+class CompiledBiomarker(NamedTuple):
+    """Reference entry for one biomarker with its ranges flattened into tagged intervals."""
 
-    Args:
-        biomarker_name (str): The name of the biomarker to evaluate
-        value (float): The value to evaluate
-        gender (str): The gender to use for reference ranges ("male" or "female")
+    name: str
+    title: str
+    unit: str
+    # (lower, upper, range_status) sorted by RANGE_PRECEDENCE, then by lower bound
+    intervals: Tuple[Tuple[float, float, str], ...]
 
-    Returns:
-        Dict containing:
-            - unit: The unit of measurement
-            - range_status: Which range the value falls into (normal, abnormal, optimal)
-            - title: The display title of the biomarker
+    def classify(self, value: float) -> str:
+        """Return the range status of a value, or "unknown" if no interval contains it."""
+        for lower, upper, status in self.intervals:
+            if lower <= value <= upper:
+                return status
+        return "unknown"
+
+
+def compile_biomarker(biomarker_data: Dict) -> CompiledBiomarker:
+    """Flatten the optimal/normal/abnormal ranges of a reference entry into sorted intervals."""
+    intervals = []
+    for precedence, status in enumerate(RANGE_PRECEDENCE):
+        for lower, upper in biomarker_data[f"{status}_range"]:
+            intervals.append((precedence, lower, upper, status))
+    intervals.sort(key=lambda interval: (interval[0], interval[1]))
+
+    return CompiledBiomarker(
+        name=biomarker_data["name"],
+        title=biomarker_data["title"],
+        unit=biomarker_data["unit"],
+        intervals=tuple((lower, upper, status) for _, lower, upper, status in intervals),
+    )
+
+
+def compile_reference_table(biomarkers: List[Dict]) -> Dict[str, CompiledBiomarker]:
+    """Build a name -> CompiledBiomarker table, keeping the first entry for duplicated names."""
+    table = {}
+    for biomarker_data in biomarkers:
+        if biomarker_data["name"] not in table:
+            table[biomarker_data["name"]] = compile_biomarker(biomarker_data)
+    return table
+
+
+class BiomarkerReferenceIndex:
     """
-    # Load the appropriate reference data
-    biomarkers = load_biomarker_data(gender)
+    Process-wide cache of compiled reference tables, keyed by gender and biomarker name.
+
+    Each table is compiled once from cleanedBioMarkers_<gender>.json and recompiled
+    when the file's mtime changes, so edits to the reference ranges are picked up
+    without restarting the server.
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, Tuple[int, Dict[str, CompiledBiomarker]]] = {}
+        self._lock = threading.Lock()
+
+    def get_table(self, gender: str = "male") -> Dict[str, CompiledBiomarker]:
+        """Return the compiled table for a gender, reloading it if the file changed."""
+        gender = gender.lower()
+        mtime = os.stat(get_biomarker_data_path(gender)).st_mtime_ns
+
+        cached = self._tables.get(gender)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with self._lock:
+            cached = self._tables.get(gender)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            table = compile_reference_table(load_biomarker_data(gender))
+            self._tables[gender] = (mtime, table)
+            return table
+
+    def get(self, biomarker_name: str, gender: str = "male") -> Optional[CompiledBiomarker]:
+        """Return the compiled reference entry for a biomarker, or None if it is unknown."""
+        return self.get_table(gender).get(biomarker_name)
+
+    def warm(self, genders: Tuple[str, ...] = ("male", "female")) -> None:
+        """Compile the tables up front so the first request does not pay for it."""
+        for gender in genders:
+            self.get_table(gender)
+
 
-    # Find the biomarker in the reference data
-    biomarker_data = next((b for b in biomarkers if b["name"] == biomarker_name), None)
+biomarker_reference_index = BiomarkerReferenceIndex()
 
+
+def _evaluate_compiled(
+    biomarker_name: str, value: float, biomarker_data: Optional[CompiledBiomarker]
+) -> Dict[str, Union[str, float]]:
+    """Build the evaluation dict for a value against an already resolved reference entry."""
     if not biomarker_data:
         return {
             "unit": "unknown",
@@ -52,38 +131,20 @@ def evaluate_biomarker(
             "error": "Biomarker not found",
         }
 
-    # Determine which range the value falls into
-    range_status = "unknown"
-    if is_value_in_range(value, biomarker_data["optimal_range"]):
-        range_status = "optimal"
-    elif is_value_in_range(value, biomarker_data["normal_range"]):
-        range_status = "normal"
-    elif is_value_in_range(value, biomarker_data["abnormal_range"]):
-        range_status = "abnormal"
-
     return {
         "name": biomarker_name,
-        "unit": biomarker_data["unit"],
-        "range_status": range_status,
-        "title": biomarker_data["title"],
+        "unit": biomarker_data.unit,
+        "range_status": biomarker_data.classify(value),
+        "title": biomarker_data.title,
         "value": value,
     }
 
 
-def evaluate_biomarkers_batch(
-    biomarkers_data: Dict[str, float], gender: str = "male"
-) -> Dict[str, Dict[str, str]]:
+def extract_biomarker_values(biomarkers_data) -> Dict[str, float]:
     """
-    Evaluate multiple biomarkers from an object and return their evaluations.
-
-    Args:
-        biomarkers_data (Dict[str, float]): Dictionary of biomarker names and their values
-        gender (str): The gender to use for reference ranges ("male" or "female")
-
-    Returns:
-        Dict[str, Dict[str, str]]: Dictionary of biomarker names and their evaluation results
+    Convert a BloodWorkResults model or a plain mapping into biomarker name -> float,
+    dropping empty and non-numeric fields (sex, dates, names, ...).
     """
-    result = {}
     # Convert Pydantic model to dictionary
     if hasattr(biomarkers_data, "model_dump"):  # Pydantic v2
         data_dict = biomarkers_data.model_dump()
@@ -92,26 +153,60 @@ def evaluate_biomarkers_batch(
     else:
         data_dict = dict(biomarkers_data)
 
-    # Remove None values from the dictionary
-    data_dict = {k: v for k, v in data_dict.items() if v is not None}
-
-    # print("biomarkers_data is:", biomarkers_data)
-    # print the type of biomarkers_data
-    print("type of biomarkers_data is:", type(data_dict))
-    # print length of biomarkers_data
-    # print("length of biomarkers_data is:", len(biomarkers_data))
+    values = {}
     for biomarker_name, value in data_dict.items():
         # Skip if value is None or not a number
         if value is None:
             continue
 
         try:
-            value_float = float(value)
+            values[biomarker_name] = float(value)
         except (ValueError, TypeError):
             continue
 
+    return values
+
+
+def evaluate_biomarker(
+    biomarker_name: str, value: float, gender: str = "male"
+) -> Dict[str, Union[str, float]]:
+    """
+    Evaluate a biomarker value against reference ranges.
+
+    Args:
+        biomarker_name (str): The name of the biomarker to evaluate
+        value (float): The value to evaluate
+        gender (str): The gender to use for reference ranges ("male" or "female")
+
+    Returns:
+        Dict containing:
+            - unit: The unit of measurement
+            - range_status: Which range the value falls into (normal, abnormal, optimal)
+            - title: The display title of the biomarker
+    """
+    biomarker_data = biomarker_reference_index.get(biomarker_name, gender)
+    return _evaluate_compiled(biomarker_name, value, biomarker_data)
+
+
+def evaluate_biomarkers_batch(
+    biomarkers_data: Dict[str, float], gender: str = "male"
+) -> Dict[str, Dict[str, str]]:
+    """
+    Evaluate multiple biomarkers from an object and return their evaluations.
+
+    Args:
+        biomarkers_data (Dict[str, float]): Dictionary of biomarker names and their values
+        gender (str): The gender to use for reference ranges ("male" or "female")
+
+    Returns:
+        Dict[str, Dict[str, str]]: Dictionary of biomarker names and their evaluation results
+    """
+    result = {}
+    reference_table = biomarker_reference_index.get_table(gender)
+
+    for biomarker_name, value_float in extract_biomarker_values(biomarkers_data).items():
         # Evaluate the individual biomarker
-        evaluation = evaluate_biomarker(biomarker_name, value_float, gender)
+        evaluation = _evaluate_compiled(biomarker_name, value_float, reference_table.get(biomarker_name))
 
         # Only add to results if there's no error
         if "error" not in evaluation:
@@ -127,19 +222,90 @@ def evaluate_biomarkers_and_group(
     """
     Evaluate multiple biomarkers from an object and group them by the biomarkers_groups.json file.
     """
-    # Load the biomarkers_groups.json file
-    with open("biomarkers_groups.json", "r") as f:
-        biomarkers_groups = json.load(f)
-
     # Evaluate the biomarkers
     bioMarkersData = evaluate_biomarkers_batch(biomarkers_data, gender)
 
-    # Group the biomarkers by the biomarkers_groups.json file
-    grouped_evaluations = {}
-    for group_name in biomarkers_groups:
-        grouped_evaluations[group_name] = []
-        for biomarker in biomarkers_groups[group_name]:
-            if biomarker in bioMarkersData:
-                grouped_evaluations[group_name].append(bioMarkersData[biomarker])
+    return group_biomarker_evaluations(bioMarkersData)
+
+
+@lru_cache(maxsize=None)
+def load_biomarker_groups() -> Dict[str, Tuple[str, ...]]:
+    """Load biomarkers_groups.json once per process, independent of the working directory."""
+    with open(BIOMARKER_GROUPS_PATH, "r") as f:
+        return {group_name: tuple(biomarkers) for group_name, biomarkers in json.load(f).items()}
+
+
+@lru_cache(maxsize=None)
+def get_biomarker_group_index() -> Dict[str, Tuple[Tuple[str, int], ...]]:
+    """Reverse index of biomarkers_groups.json: biomarker name -> ((group_name, position), ...)."""
+    group_index = {}
+    for group_name, biomarkers in load_biomarker_groups().items():
+        for position, biomarker in enumerate(biomarkers):
+            group_index[biomarker] = group_index.get(biomarker, ()) + ((group_name, position),)
+    return group_index
+
+
+def group_biomarker_evaluations(bioMarkersData: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+    """
+    Group already evaluated biomarkers (as returned by evaluate_biomarkers_batch)
+    by the biomarkers_groups.json file.
+    """
+    group_index = get_biomarker_group_index()
+
+    # Single pass over the evaluated biomarkers, remembering each one's position in its group
+    slots = {group_name: [] for group_name in load_biomarker_groups()}
+    for biomarker, evaluation in bioMarkersData.items():
+        for group_name, position in group_index.get(biomarker, ()):
+            slots[group_name].append((position, evaluation))
+
+    # Keep the order of biomarkers_groups.json within each group
+    return {
+        group_name: [evaluation for _, evaluation in sorted(entries, key=itemgetter(0))]
+        for group_name, entries in slots.items()
+    }
+
+
+def benchmark_evaluations(gender: str = "male", rounds: int = 50) -> Dict[str, float]:
+    """
+    Measure how many single-biomarker evaluations per second the compiled index sustains
+    compared to the previous path, which reloaded the JSON file and scanned it linearly
+    for every biomarker.
+
+    Run with: python -m engines.biomarker_engine
+    """
+    biomarkers = load_biomarker_data(gender)
+    samples = [(b["name"], b["optimal_range"][0][0] if b["optimal_range"] else 0.0) for b in biomarkers]
+    total = len(samples) * rounds
+
+    def file_scan_evaluate(biomarker_name: str, value: float) -> str:
+        reference = load_biomarker_data(gender)
+        biomarker_data = next((b for b in reference if b["name"] == biomarker_name), None)
+        for status in RANGE_PRECEDENCE:
+            if is_value_in_range(value, biomarker_data[f"{status}_range"]):
+                return status
+        return "unknown"
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for biomarker_name, value in samples:
+            file_scan_evaluate(biomarker_name, value)
+    file_scan_elapsed = time.perf_counter() - start
+
+    biomarker_reference_index.warm((gender,))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for biomarker_name, value in samples:
+            evaluate_biomarker(biomarker_name, value, gender)
+    indexed_elapsed = time.perf_counter() - start
+
+    return {
+        "evaluations": total,
+        "file_scan_evals_per_sec": total / file_scan_elapsed,
+        "indexed_evals_per_sec": total / indexed_elapsed,
+        "speedup": file_scan_elapsed / indexed_elapsed,
+    }
+
 
-    return grouped_evaluations
+if __name__ == "__main__":
+    for gender in ("male", "female"):
+        print(gender, benchmark_evaluations(gender))
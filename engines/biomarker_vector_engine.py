@@ -0,0 +1,118 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from engines.biomarker_engine import (
+    RANGE_PRECEDENCE,
+    CompiledBiomarker,
+    biomarker_reference_index,
+    extract_biomarker_values,
+)
+
+# Status codes are indexes into this tuple; "unknown" is used when no interval matches.
+STATUS_LABELS = RANGE_PRECEDENCE + ("unknown",)
+UNKNOWN_STATUS_CODE = len(RANGE_PRECEDENCE)
+
+
+class VectorizedBiomarkerClassifier:
+    """
+    Classifies many biomarker values at once against one compiled reference table.
+
+    The tagged intervals of every biomarker are packed into (markers x intervals) arrays,
+    padded with empty intervals, in the same precedence order the scalar engine checks them.
+    A value's status is the status of the first interval that contains it, so results are
+    identical to evaluate_biomarkers_batch.
+    """
+
+    def __init__(self, reference_table: Dict[str, CompiledBiomarker]):
+        self.reference_table = reference_table
+        self.names = list(reference_table)
+        self.positions = {name: position for position, name in enumerate(self.names)}
+
+        width = max((len(biomarker.intervals) for biomarker in reference_table.values()), default=0)
+        width = max(width, 1)
+        # Padding intervals have lower > upper so they never contain a value
+        self.lower = np.full((len(self.names), width), np.inf)
+        self.upper = np.full((len(self.names), width), -np.inf)
+        self.status_codes = np.full((len(self.names), width), UNKNOWN_STATUS_CODE, dtype=np.int8)
+
+        for row, biomarker in enumerate(reference_table.values()):
+            for column, (lower, upper, status) in enumerate(biomarker.intervals):
+                self.lower[row, column] = lower
+                self.upper[row, column] = upper
+                self.status_codes[row, column] = STATUS_LABELS.index(status)
+
+    def classify_matrix(self, values: np.ndarray) -> np.ndarray:
+        """
+        Classify a (reports x markers) float matrix laid out in self.names order.
+
+        Returns an int8 matrix of status codes (see STATUS_LABELS).
+        """
+        hits = (self.lower <= values[..., None]) & (values[..., None] <= self.upper)
+        first_hit = hits.argmax(axis=-1)
+        codes = self.status_codes[np.arange(len(self.names)), first_hit]
+        return np.where(hits.any(axis=-1), codes, UNKNOWN_STATUS_CODE).astype(np.int8)
+
+    def _pack(self, reports: List[Dict[str, float]]) -> np.ndarray:
+        """Lay out extracted report values as a value matrix; absent markers are NaN."""
+        values = np.full((len(reports), len(self.names)), np.nan)
+        for row, report in enumerate(reports):
+            for biomarker_name, value in report.items():
+                column = self.positions.get(biomarker_name)
+                if column is not None:
+                    values[row, column] = value
+        return values
+
+    def evaluate_many(self, reports: Iterable, chunk_size: int = 4096) -> List[Dict[str, Dict]]:
+        """
+        Evaluate many reports (BloodWorkResults models or mappings) in vectorized chunks.
+
+        Returns one evaluate_biomarkers_batch-shaped dict per report, in input order.
+        """
+        extracted = [extract_biomarker_values(report) for report in reports]
+        results = []
+        for start in range(0, len(extracted), chunk_size):
+            chunk = extracted[start : start + chunk_size]
+            codes = self.classify_matrix(self._pack(chunk)).tolist()
+
+            for report, report_codes in zip(chunk, codes):
+                evaluations = {}
+                # Keep the input key order, like the scalar engine does
+                for biomarker_name, value in report.items():
+                    column = self.positions.get(biomarker_name)
+                    if column is None:
+                        continue
+                    biomarker = self.reference_table[biomarker_name]
+                    evaluations[biomarker_name] = {
+                        "name": biomarker_name,
+                        "unit": biomarker.unit,
+                        "range_status": STATUS_LABELS[report_codes[column]],
+                        "title": biomarker.title,
+                        "value": value,
+                    }
+                results.append(evaluations)
+        return results
+
+
+_classifiers: Dict[str, Tuple[Dict[str, CompiledBiomarker], VectorizedBiomarkerClassifier]] = {}
+
+
+def get_vectorized_classifier(gender: str = "male") -> VectorizedBiomarkerClassifier:
+    """Return the classifier for a gender, rebuilding it when the reference index reloads."""
+    gender = gender.lower()
+    reference_table = biomarker_reference_index.get_table(gender)
+    cached = _classifiers.get(gender)
+    if cached is None or cached[0] is not reference_table:
+        cached = (reference_table, VectorizedBiomarkerClassifier(reference_table))
+        _classifiers[gender] = cached
+    return cached[1]
+
+
+def evaluate_biomarkers_vectorized(biomarkers_data, gender: str = "male") -> Dict[str, Dict]:
+    """Vectorized equivalent of evaluate_biomarkers_batch for a single report."""
+    return get_vectorized_classifier(gender).evaluate_many([biomarkers_data])[0]
+
+
+def evaluate_reports_vectorized(reports: Iterable, gender: str = "male") -> List[Dict[str, Dict]]:
+    """Vectorized equivalent of calling evaluate_biomarkers_batch on every report."""
+    return get_vectorized_classifier(gender).evaluate_many(reports)
@@ -1,15 +1,14 @@
 import json
-from pathlib import Path
 from typing import Any, Dict, List
 
+from engines.gene_panel_index import GENE_PANELS_PATH, get_gene_panel_index
 from models.patient_models import GeneResultsGrouped
 from modules.patients.mappers.gene_results_mapper import GeneResultsMapper
 
 
 def load_gene_panels_data() -> Dict[str, Any]:
     """Load gene panels configuration from genes-panels.json."""
-    file_path = Path(__file__).parent.parent / "genes-panels.json"
-    with open(file_path, "r") as f:
+    with open(GENE_PANELS_PATH, "r") as f:
         return json.load(f)
 
 
@@ -43,19 +42,17 @@ def get_gene_info_by_name_and_rs(gene_name: str, rs_id: str = None) -> Dict[str,
     Returns:
         Dict containing gene information including possible genotypes and risk levels
     """
-    panels_data = load_gene_panels_data()
+    match = get_gene_panel_index().get_gene(gene_name, rs_id)
+    if not match:
+        return None
 
-    for panel in panels_data["panels"]:
-        for gene in panel["genes"]:
-            if gene["name"] == gene_name and (not rs_id or gene.get("rs_id") == rs_id):
-                return {
-                    "gene_name": gene["name"],
-                    "rs_id": gene.get("rs_id"),
-                    "panel": panel["panel"],
-                    "genotypes": gene["genotypes"],
-                }
-
-    return None
+    panel_name, gene = match
+    return {
+        "gene_name": gene["name"],
+        "rs_id": gene.get("rs_id"),
+        "panel": panel_name,
+        "genotypes": list(gene["genotypes"]),
+    }
 
 
 def get_available_panels() -> List[str]:
@@ -65,8 +62,7 @@ def get_available_panels() -> List[str]:
     Returns:
         List of panel names
     """
-    panels_data = load_gene_panels_data()
-    return [panel["panel"] for panel in panels_data["panels"]]
+    return list(get_gene_panel_index().panel_names)
 
 
 def get_genes_in_panel(panel_name: str) -> List[Dict[str, Any]]:
@@ -79,10 +75,4 @@ def get_genes_in_panel(panel_name: str) -> List[Dict[str, Any]]:
     Returns:
         List of genes in the panel
     """
-    panels_data = load_gene_panels_data()
-
-    for panel in panels_data["panels"]:
-        if panel["panel"] == panel_name:
-            return panel["genes"]
-
-    return []
+    return list(get_gene_panel_index().genes_by_panel.get(panel_name, []))
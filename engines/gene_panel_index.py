@@ -0,0 +1,61 @@
+from functools import lru_cache
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+GENE_PANELS_PATH = Path(__file__).parent.parent / "genes-panels.json"
+
+DEFAULT_PANEL = "Unknown"
+DEFAULT_RISK_LEVEL = "normal"
+
+
+class GenePanelIndex:
+    """
+    Compiled lookup tables over genes-panels.json.
+
+    Every gene is indexed both under (name, rs_id) and under (name, None), so a lookup
+    without an rs_id matches any rs_id of that gene. When several entries match, the
+    first one in file order wins, exactly like the nested scans this replaces.
+    """
+
+    def __init__(self, panels_config: Dict[str, Any]):
+        self.panels_config = panels_config
+        self.panel_names: List[str] = []
+        self.genes_by_panel: Dict[str, List[Dict[str, Any]]] = {}
+        # (gene name, rs_id or None) -> (panel name, gene entry)
+        self.genes: Dict[Tuple[str, Optional[str]], Tuple[str, Dict[str, Any]]] = {}
+        # (gene name, rs_id or None, genotype) -> risk level
+        self.risk_levels: Dict[Tuple[str, Optional[str], str], str] = {}
+
+        for panel in panels_config["panels"]:
+            self.panel_names.append(panel["panel"])
+            self.genes_by_panel.setdefault(panel["panel"], panel["genes"])
+            for gene in panel["genes"]:
+                for rs_key in {gene.get("rs_id"), None}:
+                    self.genes.setdefault((gene["name"], rs_key), (panel["panel"], gene))
+                    for genotype_info in gene["genotypes"]:
+                        self.risk_levels.setdefault(
+                            (gene["name"], rs_key, genotype_info["genotype"]), genotype_info["risk_level"]
+                        )
+
+    def get_gene(self, gene_name: str, rs_id: str = None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return (panel name, gene entry) for the first matching gene, or None."""
+        return self.genes.get((gene_name, rs_id or None))
+
+    def get_panel(self, gene_name: str, rs_id: str = None) -> str:
+        match = self.get_gene(gene_name, rs_id)
+        return match[0] if match else DEFAULT_PANEL
+
+    def get_risk_level(self, gene_name: str, genotype: str, rs_id: str = None) -> str:
+        return self.risk_levels.get((gene_name, rs_id or None, genotype), DEFAULT_RISK_LEVEL)
+
+    def lookup(self, gene_name: str, rs_id: str, genotype: str) -> Tuple[str, str]:
+        """Return (panel, risk_level) for a gene result in one call."""
+        return self.get_panel(gene_name, rs_id), self.get_risk_level(gene_name, genotype, rs_id)
+
+
+@lru_cache(maxsize=None)
+def get_gene_panel_index() -> GenePanelIndex:
+    """Build the gene panel index once per process."""
+    with open(GENE_PANELS_PATH, "r") as f:
+        return GenePanelIndex(json.load(f))
@@ -1,4 +1,5 @@
-from typing import List
+from functools import partial
+from typing import Callable, List
 
 from female_report.short_report.generate_recommendation_page import (
     generate_recommendation_page,
@@ -19,13 +20,22 @@ from female_report.short_report.page_11 import page_11
 from female_report.short_report.page_12 import page_12
 from female_report.short_report.page_13 import page_13
 from models.patient_models import BioMarkerGroup, BloodWorkBioMarkerGroup
+from utils.report_rendering import cover_inputs, panel_recommendation_inputs
 
 
-def generate_female_short_report(
+def build_female_short_report_pages(
     report,
     blood_work_report: BloodWorkBioMarkerGroup,
     selectedBioMarkerGroups: List[BioMarkerGroup],
-):
+) -> List[Callable]:
+    """
+    Decide which pages the report contains and return them as render jobs, in order.
+
+    Each job is a picklable partial that returns the page's BytesIO buffer when called,
+    so the pages can be rendered in this process or in the report rendering pool. Jobs
+    only carry the inputs their page draws, which is what the page cache is keyed on.
+    """
+
     # Helper function to check if recommendations exist
     def has_recommendations(panel_name=None):
         if not report.get("recommendations"):
@@ -46,57 +56,57 @@ def generate_female_short_report(
         )
 
     # Create the pages dynamically based on the data presence
-    pages = [cover_page(report)]
+    pages = [partial(cover_page, cover_inputs(report))]
 
     # Lipid-related pages
     if ("lipids" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.lipids and len(blood_work_report.lipids) > 0:
-        pages.append(page_1(blood_work_report.lipids))
+        pages.append(partial(page_1, blood_work_report.lipids))
         if has_recommendations("lipids"):
-            pages.append(generate_recommendation_page(report, "lipids"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "lipids"), "lipids"))
 
     if ("glucose" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.glucose and len(blood_work_report.glucose) > 0:
-        pages.append(page_2(blood_work_report.glucose))
+        pages.append(partial(page_2, blood_work_report.glucose))
         if has_recommendations("glucose"):
-            pages.append(generate_recommendation_page(report, "glucose"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "glucose"), "glucose"))
 
     if ("renal" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.renal and len(blood_work_report.renal) > 0:
-        pages.append(page_3(blood_work_report.renal))
+        pages.append(partial(page_3, blood_work_report.renal))
         if has_recommendations("renal"):
-            pages.append(generate_recommendation_page(report, "renal"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "renal"), "renal"))
 
     if ("mineral" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.mineral and len(blood_work_report.mineral) > 0:
-        pages.append(page_4(blood_work_report.mineral))
+        pages.append(partial(page_4, blood_work_report.mineral))
         if has_recommendations("mineral"):
-            pages.append(generate_recommendation_page(report, "mineral"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "mineral"), "mineral"))
 
     if (
         ("inflammation_Markers" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups)
         and blood_work_report.inflammation_Markers and len(blood_work_report.inflammation_Markers) > 0
     ):
-        pages.append(page_5(blood_work_report.inflammation_Markers))
+        pages.append(partial(page_5, blood_work_report.inflammation_Markers))
         if has_recommendations("inflammation_Markers"):
-            pages.append(generate_recommendation_page(report, "inflammation_Markers"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "inflammation_Markers"), "inflammation_Markers"))
 
     if ("vitamin" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.vitamin and len(blood_work_report.vitamin) > 0:
-        pages.append(page_6(blood_work_report.vitamin))
+        pages.append(partial(page_6, blood_work_report.vitamin))
         if has_recommendations("vitamin"):
-            pages.append(generate_recommendation_page(report, "vitamin"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "vitamin"), "vitamin"))
 
     if ("electrolytes" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.electrolytes and len(blood_work_report.electrolytes) > 0:
-        pages.append(page_7(blood_work_report.electrolytes))
+        pages.append(partial(page_7, blood_work_report.electrolytes))
         if has_recommendations("electrolytes"):
-            pages.append(generate_recommendation_page(report, "electrolytes"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "electrolytes"), "electrolytes"))
 
     if ("liver_Enzymes" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.liver_Enzymes and len(blood_work_report.liver_Enzymes) > 0:
-        pages.append(page_8(blood_work_report.liver_Enzymes))
+        pages.append(partial(page_8, blood_work_report.liver_Enzymes))
         if has_recommendations("liver_Enzymes"):
-            pages.append(generate_recommendation_page(report, "liver_Enzymes"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "liver_Enzymes"), "liver_Enzymes"))
 
     if (
         ("thyroid_Functions" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups)
         and blood_work_report.thyroid_Functions and len(blood_work_report.thyroid_Functions) > 0
     ):
-        pages.append(page_9(blood_work_report.thyroid_Functions))
+        pages.append(partial(page_9, blood_work_report.thyroid_Functions))
 
         # Check if regular recommendations exist (lifestyle/diet/activity)
         has_regular = any(
@@ -105,15 +115,15 @@ def generate_female_short_report(
             for rec in report.get("recommendations", [])
         )
         if has_regular:
-            pages.append(generate_recommendation_page(report, "thyroid_Functions"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "thyroid_Functions"), "thyroid_Functions"))
 
     # Check supplements separately
     if has_supplement_recommendations("thyroid_Functions"):
-        pages.append(generate_supplements_page(report, "thyroid_Functions"))
+        pages.append(partial(generate_supplements_page, panel_recommendation_inputs(report, "thyroid_Functions"), "thyroid_Functions"))
 
     if ("hormone" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.hormone and len(blood_work_report.hormone) > 0:
         pages.extend(
-            [page_10(blood_work_report.hormone), page_11(blood_work_report.hormone)]
+            [partial(page_10, blood_work_report.hormone), partial(page_11, blood_work_report.hormone)]
         )
 
         # Check if regular recommendations exist
@@ -123,15 +133,23 @@ def generate_female_short_report(
             for rec in report.get("recommendations", [])
         )
         if has_regular:
-            pages.append(generate_recommendation_page(report, "hormone"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "hormone"), "hormone"))
 
         # Check supplements separately
         if has_supplement_recommendations("hormone"):
-            pages.append(generate_supplements_page(report, "hormone"))
+            pages.append(partial(generate_supplements_page, panel_recommendation_inputs(report, "hormone"), "hormone"))
 
     if ("cbc" in selectedBioMarkerGroups or "full" in selectedBioMarkerGroups) and blood_work_report.cbc and len(blood_work_report.cbc) > 0:
-        pages.extend([page_12(blood_work_report.cbc), page_13(blood_work_report.cbc)])
+        pages.extend([partial(page_12, blood_work_report.cbc), partial(page_13, blood_work_report.cbc)])
         if has_recommendations("cbc"):
-            pages.append(generate_recommendation_page(report, "cbc"))
+            pages.append(partial(generate_recommendation_page, panel_recommendation_inputs(report, "cbc"), "cbc"))
 
     return pages
+
+
+def generate_female_short_report(
+    report,
+    blood_work_report: BloodWorkBioMarkerGroup,
+    selectedBioMarkerGroups: List[BioMarkerGroup],
+):
+    return [render() for render in build_female_short_report_pages(report, blood_work_report, selectedBioMarkerGroups)]
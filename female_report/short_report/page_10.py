@@ -1,31 +1,15 @@
 import io
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "female_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "female_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "female_report/fonts/Roboto-Bold.ttf"))
-
 from typing import List
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_10(results: List[BioMarker]):
@@ -33,8 +17,8 @@ def page_10(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "female_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("female_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -61,8 +45,8 @@ def page_10(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s hormone results")
 
-    legend_image_path = "female_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("female_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -73,7 +57,7 @@ def page_10(results: List[BioMarker]):
     # FSH
     fsh = get_bio_marker_from_group(results, "follitropin")
     if fsh is not None:
-        fsh_bar = convert_png_to_white_bg("female_report/short_report/AOA_bar.png")
+        fsh_bar = get_white_bg_image("female_report/short_report/AOA_bar.png")
         c.drawImage(fsh_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -101,7 +85,7 @@ def page_10(results: List[BioMarker]):
     # LH
     lh = get_bio_marker_from_group(results, "lutropin")
     if lh is not None:
-        lh_bar = convert_png_to_white_bg("female_report/short_report/AOA_bar.png")
+        lh_bar = get_white_bg_image("female_report/short_report/AOA_bar.png")
         c.drawImage(lh_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -129,7 +113,7 @@ def page_10(results: List[BioMarker]):
     # Estradiol
     estradiol = get_bio_marker_from_group(results, "estradiol")
     if estradiol is not None:
-        estradiol_bar = convert_png_to_white_bg("female_report/short_report/AOA_bar.png")
+        estradiol_bar = get_white_bg_image("female_report/short_report/AOA_bar.png")
         c.drawImage(estradiol_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -157,7 +141,7 @@ def page_10(results: List[BioMarker]):
     # Progesterone
     progesterone = get_bio_marker_from_group(results, "progesterone")
     if progesterone is not None:
-        progesterone_bar = convert_png_to_white_bg("female_report/short_report/AO_bar.png")
+        progesterone_bar = get_white_bg_image("female_report/short_report/AO_bar.png")
         c.drawImage(progesterone_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -182,7 +166,7 @@ def page_10(results: List[BioMarker]):
     # Total Testosterone
     testosterone = get_bio_marker_from_group(results, "testosterone")
     if testosterone is not None:
-        testosterone_bar = convert_png_to_white_bg("female_report/short_report/NAOA_bar.png")
+        testosterone_bar = get_white_bg_image("female_report/short_report/NAOA_bar.png")
         c.drawImage(testosterone_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -213,7 +197,7 @@ def page_10(results: List[BioMarker]):
     # Free Testosterone
     testosteronefree = get_bio_marker_from_group(results, "testosteroneFree")
     if testosteronefree is not None:
-        testosteronefree_bar = convert_png_to_white_bg("female_report/short_report/NOA_bar.png")
+        testosteronefree_bar = get_white_bg_image("female_report/short_report/NOA_bar.png")
         c.drawImage(testosteronefree_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -1,31 +1,15 @@
 import io
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "female_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "female_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "female_report/fonts/Roboto-Bold.ttf"))
-
 from typing import List
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_11(results: List[BioMarker]):
@@ -33,8 +17,8 @@ def page_11(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "female_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("female_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -61,8 +45,8 @@ def page_11(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s hormone results")
 
-    legend_image_path = "female_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("female_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -73,7 +57,7 @@ def page_11(results: List[BioMarker]):
     # DHEA
     dhea = get_bio_marker_from_group(results, "dhea")
     if dhea is not None:
-        dhea_bar = convert_png_to_white_bg("female_report/short_report/ANOA_bar.png")
+        dhea_bar = get_white_bg_image("female_report/short_report/ANOA_bar.png")
         c.drawImage(dhea_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -104,7 +88,7 @@ def page_11(results: List[BioMarker]):
     # Prolactain
     prolactain = get_bio_marker_from_group(results, "prolactin")
     if prolactain is not None:
-        prolactain_bar = convert_png_to_white_bg("female_report/short_report/AOA_bar.png")
+        prolactain_bar = get_white_bg_image("female_report/short_report/AOA_bar.png")
         c.drawImage(prolactain_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -132,7 +116,7 @@ def page_11(results: List[BioMarker]):
     # Sex Hormone
     sexhormone = get_bio_marker_from_group(results, "sexHormoneBindGlobulin")
     if sexhormone is not None:
-        sexhormone_bar = convert_png_to_white_bg("female_report/short_report/ANOA_bar.png")
+        sexhormone_bar = get_white_bg_image("female_report/short_report/ANOA_bar.png")
         c.drawImage(sexhormone_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -163,7 +147,7 @@ def page_11(results: List[BioMarker]):
     # AM Cortisol
     cortisol = get_bio_marker_from_group(results, "cortisolAm")
     if cortisol is not None:
-        cortisol_bar = convert_png_to_white_bg("female_report/short_report/ANONA_bar.png")
+        cortisol_bar = get_white_bg_image("female_report/short_report/ANONA_bar.png")
         c.drawImage(cortisol_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -1,30 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "female_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "female_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "female_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_2(results: List[BioMarker]):
@@ -32,8 +16,8 @@ def page_2(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "female_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("female_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -60,8 +44,8 @@ def page_2(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s glucose results")
 
-    legend_image_path = "female_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("female_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -72,7 +56,7 @@ def page_2(results: List[BioMarker]):
     # Glucose
     glucose = get_bio_marker_from_group(results, "glucose")
     if glucose is not None:
-        glucose_bar = convert_png_to_white_bg("female_report/short_report/AONA_bar.png")
+        glucose_bar = get_white_bg_image("female_report/short_report/AONA_bar.png")
         c.drawImage(glucose_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -103,7 +87,7 @@ def page_2(results: List[BioMarker]):
     # HBA1C
     hba1c = get_bio_marker_from_group(results, "hbA1c")
     if hba1c is not None:
-        hba1c_bar = convert_png_to_white_bg("female_report/short_report/NONA_bar.png")
+        hba1c_bar = get_white_bg_image("female_report/short_report/NONA_bar.png")
         c.drawImage(hba1c_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -134,7 +118,7 @@ def page_2(results: List[BioMarker]):
     # Insulin
     insulin = get_bio_marker_from_group(results, "insulin")
     if insulin is not None:
-        insulin_bar = convert_png_to_white_bg("female_report/short_report/AONA_bar.png")
+        insulin_bar = get_white_bg_image("female_report/short_report/AONA_bar.png")
         c.drawImage(insulin_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
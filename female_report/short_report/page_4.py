@@ -1,34 +1,16 @@
 import io
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "female_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(
-    TTFont("Roboto-Regular", "female_report/fonts/Roboto-Regular.ttf")
-)
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "female_report/fonts/Roboto-Bold.ttf"))
-
 
 from typing import List
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_4(results: List[BioMarker]):
@@ -36,8 +18,8 @@ def page_4(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "female_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("female_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -64,9 +46,9 @@ def page_4(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s mineral results")
 
-    legend_image_path = "female_report/short_report/colors.jpg"
+    legend_image = get_report_image("female_report/short_report/colors.jpg")
     c.drawImage(
-        legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False
+        legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False
     )
 
     c.setStrokeColor("#adb5bd")
@@ -78,7 +60,7 @@ def page_4(results: List[BioMarker]):
     # Calcium
     calcium = get_bio_marker_from_group(results, "calcium")
     if calcium is not None:
-        calcium_bar = convert_png_to_white_bg(
+        calcium_bar = get_white_bg_image(
             "female_report/short_report/ANONA_bar.png"
         )
         c.drawImage(
@@ -116,7 +98,7 @@ def page_4(results: List[BioMarker]):
     # Magnesium Serum
     magnesiumS = get_bio_marker_from_group(results, "magnesium")
     if magnesiumS is not None:
-        magnesiumS_bar = convert_png_to_white_bg(
+        magnesiumS_bar = get_white_bg_image(
             "female_report/short_report/ANOA_bar.png"
         )
         c.drawImage(
@@ -158,7 +140,7 @@ def page_4(results: List[BioMarker]):
     # Magnesium RBC
     magnesiumR = get_bio_marker_from_group(results, "magnesiumR")
     if magnesiumR is not None:
-        magnesiumR_bar = convert_png_to_white_bg(
+        magnesiumR_bar = get_white_bg_image(
             "female_report/short_report/ANOA_bar.png"
         )
         c.drawImage(
@@ -195,7 +177,7 @@ def page_4(results: List[BioMarker]):
     # Zinc
     zinc = get_bio_marker_from_group(results, "zinc")
     if zinc is not None:
-        zinc_bar = convert_png_to_white_bg("female_report/short_report/ANOA_bar.png")
+        zinc_bar = get_white_bg_image("female_report/short_report/ANOA_bar.png")
         c.drawImage(
             zinc_bar, 70, y_postion, width=480, height=35, preserveAspectRatio=False
         )
@@ -228,7 +210,7 @@ def page_4(results: List[BioMarker]):
     # Ferritin
     ferritin = get_bio_marker_from_group(results, "ferritin")
     if ferritin is not None:
-        ferritin_bar = convert_png_to_white_bg(
+        ferritin_bar = get_white_bg_image(
             "female_report/short_report/ANONA_bar.png"
         )
         c.drawImage(
@@ -266,7 +248,7 @@ def page_4(results: List[BioMarker]):
     # Selenium
     selenium = get_bio_marker_from_group(results, "seleniumPlasma")
     if selenium is not None:
-        selenium_bar = convert_png_to_white_bg(
+        selenium_bar = get_white_bg_image(
             "female_report/short_report/ANOA_bar.png"
         )
         c.drawImage(
@@ -1,30 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "female_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "female_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "female_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_8(results: List[BioMarker]):
@@ -32,8 +16,8 @@ def page_8(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "female_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("female_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -60,8 +44,8 @@ def page_8(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s liver results")
 
-    legend_image_path = "female_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("female_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -72,7 +56,7 @@ def page_8(results: List[BioMarker]):
     # ALP
     alp = get_bio_marker_from_group(results, "alkalinePhosphate")
     if alp is not None:
-        alp_bar = convert_png_to_white_bg("female_report/short_report/ANONA_bar.png")
+        alp_bar = get_white_bg_image("female_report/short_report/ANONA_bar.png")
         c.drawImage(alp_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -106,7 +90,7 @@ def page_8(results: List[BioMarker]):
     # ALT
     alt = get_bio_marker_from_group(results, "alanineTransaminase")
     if alt is not None:
-        alt_bar = convert_png_to_white_bg("female_report/short_report/OA_bar.png")
+        alt_bar = get_white_bg_image("female_report/short_report/OA_bar.png")
         c.drawImage(alt_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -131,7 +115,7 @@ def page_8(results: List[BioMarker]):
     # AST
     ast = get_bio_marker_from_group(results, "aspartateTransaminase")
     if ast is not None:
-        ast_bar = convert_png_to_white_bg("female_report/short_report/NONA_bar.png")
+        ast_bar = get_white_bg_image("female_report/short_report/NONA_bar.png")
         c.drawImage(ast_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -162,7 +146,7 @@ def page_8(results: List[BioMarker]):
     # GGT
     ggt = get_bio_marker_from_group(results, "gammaGlutamylTransferase")
     if ggt is not None:
-        ggt_bar = convert_png_to_white_bg("female_report/short_report/NONA_bar.png")
+        ggt_bar = get_white_bg_image("female_report/short_report/NONA_bar.png")
         c.drawImage(ggt_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -193,7 +177,7 @@ def page_8(results: List[BioMarker]):
     # Total Bilirubin
     bilirubin = get_bio_marker_from_group(results, "totalBilirubin")
     if bilirubin is not None:
-        bilirubin_bar = convert_png_to_white_bg("female_report/short_report/NONA_bar.png")
+        bilirubin_bar = get_white_bg_image("female_report/short_report/NONA_bar.png")
         c.drawImage(bilirubin_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -224,7 +208,7 @@ def page_8(results: List[BioMarker]):
     # Albumin
     albumin = get_bio_marker_from_group(results, "albumin")
     if albumin is not None:
-        albumin_bar = convert_png_to_white_bg("female_report/short_report/ANOA_bar.png")
+        albumin_bar = get_white_bg_image("female_report/short_report/ANOA_bar.png")
         c.drawImage(albumin_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -0,0 +1,108 @@
+"""
+Backfill the report catalogue with the report PDFs uploaded before it existed.
+
+Lists the report bucket once, then streams patients in pages and catalogues every short
+report blob matching one of the patient's blood work report dates, plus the patient's
+gene report. Entries are keyed by blob name, so the job is safe to re-run.
+
+Usage:
+    python -m jobs.backfill_report_catalogue [--bucket NAME] [--page-size 200] [--dry-run]
+"""
+
+import argparse
+import asyncio
+from bisect import bisect_left
+import time
+from typing import Any, Dict, List
+
+from config.cloud_storage import REPORTS_BUCKET_NAME, get_bucket
+from queries.patient_queries import get_patients_page
+from queries.report_catalogue_queries import add_reports_to_catalogue_batch, build_report_catalogue_entry
+
+
+def list_report_blob_names(bucket_name: str) -> List[str]:
+    """Every report PDF in the bucket, sorted so prefixes can be matched with bisect."""
+    return sorted(blob.name for blob in get_bucket(bucket_name).list_blobs() if blob.name.endswith("_report_.pdf"))
+
+
+def blob_names_with_prefix(blob_names: List[str], prefix: str) -> List[str]:
+    matches = []
+    for blob_name in blob_names[bisect_left(blob_names, prefix) :]:
+        if not blob_name.startswith(prefix):
+            break
+        matches.append(blob_name)
+    return matches
+
+
+def patient_catalogue_entries(patient: Dict[str, Any], blob_names: List[str]) -> List[Dict[str, Any]]:
+    """Catalogue entries for the report blobs of one patient, named like the upload handlers name them."""
+    patient_prefix = f"{patient.get('firstName', '')}_{patient.get('lastName', '')}_{patient.get('id', '')}_"
+    entries = []
+
+    report_dates = {report.get("reportDate") for report in patient.get("bloodWorkReports") or []}
+    for report_date in sorted(date for date in report_dates if date):
+        for blob_name in blob_names_with_prefix(blob_names, f"{patient_prefix}{report_date}_"):
+            entries.append(build_report_catalogue_entry(blob_name, patient["id"], report_date, "short"))
+
+    gene_blob_name = f"{patient_prefix}gene_report_.pdf"
+    if blob_names_with_prefix(blob_names, gene_blob_name):
+        entries.append(build_report_catalogue_entry(gene_blob_name, patient["id"], None, "gene"))
+    return entries
+
+
+async def backfill_report_catalogue(
+    bucket_name: str = REPORTS_BUCKET_NAME,
+    page_size: int = 200,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    started_at = time.perf_counter()
+    blob_names = await asyncio.to_thread(list_report_blob_names, bucket_name)
+    print(f"Found {len(blob_names)} report blobs in {(time.perf_counter() - started_at):.1f}s")
+
+    summary = {"blobs": len(blob_names), "patients": 0, "catalogued": 0}
+    last_patient_id = None
+    while True:
+        patient_docs = await get_patients_page(page_size, last_patient_id)
+        if not patient_docs:
+            break
+
+        entries = []
+        for patient_doc in patient_docs:
+            patient = patient_doc.to_dict() or {}
+            patient.setdefault("id", patient_doc.id)
+            entries.extend(patient_catalogue_entries(patient, blob_names))
+
+        if entries and not dry_run:
+            await add_reports_to_catalogue_batch(entries)
+
+        summary["patients"] += len(patient_docs)
+        summary["catalogued"] += len(entries)
+        last_patient_id = patient_docs[-1].id
+        print(f"Catalogued {summary['catalogued']} reports for {summary['patients']} patients")
+
+        if len(patient_docs) < page_size:
+            break
+
+    summary["elapsed_seconds"] = time.perf_counter() - started_at
+    return summary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backfill the report catalogue from the report bucket.")
+    parser.add_argument("--bucket", default=REPORTS_BUCKET_NAME, help="Bucket the reports are listed from")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--dry-run", action="store_true", help="Match reports without writing to Firestore")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    try:
+        summary = await backfill_report_catalogue(args.bucket, args.page_size, args.dry_run)
+        print(f"Finished backfilling the report catalogue: {summary}")
+    except Exception as e:
+        print(f"Error backfilling the report catalogue: {str(e)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
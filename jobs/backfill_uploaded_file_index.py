@@ -0,0 +1,84 @@
+"""
+Backfill the uploaded file index from the file hashes stored on patient reports.
+
+Duplicate upload checks read one uploaded_files document instead of scanning the patient,
+so reports uploaded before the index existed must be indexed once. Streams patients in
+pages and writes the index entries in batched commits. Entries are keyed by patient,
+report type and file hash, so the job is safe to re-run. Until it has run, keep
+UPLOADED_FILE_INDEX_FALLBACK on so those reports are still found on the patient.
+
+Usage:
+    python -m jobs.backfill_uploaded_file_index [--page-size 200] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+from queries.patient_queries import REPORT_FIELDS, get_patients_page, set_uploaded_files_batch
+
+# Firestore allows at most 500 writes per batch
+MAX_BATCH_SIZE = 500
+
+
+def patient_uploaded_files(patient_id: str, patient: Dict[str, Any]) -> List[Tuple]:
+    """Index entries for every report of one patient that was stored with its file hash."""
+    entries = []
+    for report_type, field in REPORT_FIELDS.items():
+        for report in patient.get(field) or []:
+            if report.get("fileHash"):
+                entries.append(
+                    (patient_id, patient.get("doctor_id"), report_type, report["fileHash"], report.get("fileName"))
+                )
+    return entries
+
+
+async def backfill_uploaded_file_index(page_size: int = 200, dry_run: bool = False) -> Dict[str, Any]:
+    started_at = time.perf_counter()
+    summary = {"patients": 0, "indexed": 0}
+    last_patient_id = None
+    while True:
+        patient_docs = await get_patients_page(page_size, last_patient_id)
+        if not patient_docs:
+            break
+
+        entries = []
+        for patient_doc in patient_docs:
+            patient = patient_doc.to_dict() or {}
+            entries.extend(patient_uploaded_files(patient.get("id") or patient_doc.id, patient))
+
+        if not dry_run:
+            for start in range(0, len(entries), MAX_BATCH_SIZE):
+                await set_uploaded_files_batch(entries[start : start + MAX_BATCH_SIZE])
+
+        summary["patients"] += len(patient_docs)
+        summary["indexed"] += len(entries)
+        last_patient_id = patient_docs[-1].id
+        print(f"Indexed {summary['indexed']} uploaded files for {summary['patients']} patients")
+
+        if len(patient_docs) < page_size:
+            break
+
+    summary["elapsed_seconds"] = time.perf_counter() - started_at
+    return summary
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backfill the uploaded file index from stored report file hashes.")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--dry-run", action="store_true", help="Count the files without writing to Firestore")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    try:
+        summary = await backfill_uploaded_file_index(args.page_size, args.dry_run)
+        print(f"Finished backfilling the uploaded file index: {summary}")
+    except Exception as e:
+        print(f"Error backfilling the uploaded file index: {str(e)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+Backfill range_status on stored blood work reports after the reference ranges change.
+
+Streams patients in pages, re-evaluates every stored bloodWorkBioMarkerGroup from its
+raw values against the current cleanedBioMarkers_<gender>.json files and writes the
+changed reports back with one batched commit per page. Progress is checkpointed to a
+JSON file after every page, so an interrupted run continues where it stopped.
+
+Usage:
+    python -m jobs.reevaluate_blood_work_reports [--page-size 200] [--dry-run] [--restart]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from engines.biomarker_engine import group_biomarker_evaluations
+from engines.biomarker_vector_engine import evaluate_reports_vectorized
+from queries.patient_queries import get_patients_page, update_blood_work_reports_batch
+
+DEFAULT_CHECKPOINT_PATH = "reevaluate_blood_work_reports.checkpoint.json"
+# Firestore allows at most 500 writes per batch
+MAX_PAGE_SIZE = 500
+
+
+def report_gender(report: Dict[str, Any]) -> str:
+    """Same sex -> reference file rule as PatientService.add_patient_blood_work_report."""
+    return "male" if str(report.get("sex")).strip().upper().startswith("M") else "female"
+
+
+def extract_raw_values(blood_work_group: Optional[Dict[str, List[Dict]]]) -> Dict[str, float]:
+    """Flatten a stored bloodWorkBioMarkerGroup back into biomarker name -> value."""
+    values = {}
+    for biomarkers in (blood_work_group or {}).values():
+        for biomarker in biomarkers or []:
+            if biomarker.get("name") and biomarker.get("value") is not None:
+                values[biomarker["name"]] = biomarker["value"]
+    return values
+
+
+def reevaluate_patient_reports(blood_work_reports: List[Dict[str, Any]]) -> int:
+    """
+    Re-evaluate the reports of one patient in place.
+
+    Returns the number of reports whose bloodWorkBioMarkerGroup changed.
+    """
+    by_gender: Dict[str, List[int]] = {}
+    for position, report in enumerate(blood_work_reports):
+        by_gender.setdefault(report_gender(report), []).append(position)
+
+    changed = 0
+    for gender, positions in by_gender.items():
+        raw_values = [
+            extract_raw_values(blood_work_reports[position].get("bloodWorkBioMarkerGroup")) for position in positions
+        ]
+        evaluations = evaluate_reports_vectorized(raw_values, gender)
+
+        for position, evaluated in zip(positions, evaluations):
+            regrouped = group_biomarker_evaluations(evaluated)
+            if regrouped != blood_work_reports[position].get("bloodWorkBioMarkerGroup"):
+                blood_work_reports[position]["bloodWorkBioMarkerGroup"] = regrouped
+                changed += 1
+    return changed
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"last_patient_id": None, "patients": 0, "reports": 0, "updated_reports": 0, "conflicts": 0}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+async def reevaluate_blood_work_reports(
+    page_size: int = 200,
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+    dry_run: bool = False,
+    restart: bool = False,
+) -> Dict[str, Any]:
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint["last_patient_id"]:
+        print(f"Resuming after patient {checkpoint['last_patient_id']} ({checkpoint['patients']} patients done)")
+
+    started_at = time.perf_counter()
+    run_patients = 0
+    while True:
+        patient_docs = await get_patients_page(page_size, checkpoint["last_patient_id"])
+        if not patient_docs:
+            break
+
+        updates = []
+        changed_by_patient = {}
+        for patient_doc in patient_docs:
+            blood_work_reports = (patient_doc.to_dict() or {}).get("bloodWorkReports") or []
+            checkpoint["reports"] += len(blood_work_reports)
+            changed = reevaluate_patient_reports(blood_work_reports) if blood_work_reports else 0
+            if changed:
+                updates.append((patient_doc, blood_work_reports))
+                changed_by_patient[patient_doc.id] = changed
+
+        if updates and not dry_run:
+            try:
+                await update_blood_work_reports_batch(updates)
+            except Exception as e:
+                # Some patient was modified while this page was processed. Retry one by one so
+                # only the conflicting patients are skipped instead of overwriting newer data.
+                print(f"Batch commit failed, retrying patients individually: {str(e)}")
+                committed = []
+                for update in updates:
+                    try:
+                        await update_blood_work_reports_batch([update])
+                        committed.append(update)
+                    except Exception as e:
+                        print(f"Skipped patient {update[0].id}, re-run with --restart to retry it: {str(e)}")
+                        checkpoint["conflicts"] += 1
+                updates = committed
+
+        run_patients += len(patient_docs)
+        checkpoint["patients"] += len(patient_docs)
+        checkpoint["updated_reports"] += sum(changed_by_patient[patient_doc.id] for patient_doc, _ in updates)
+        checkpoint["last_patient_id"] = patient_docs[-1].id
+        if not dry_run:
+            save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"Checkpoint {checkpoint['last_patient_id']}: {checkpoint['patients']} patients, "
+            f"{checkpoint['reports']} reports, {len(updates)} patients updated in this page, "
+            f"{run_patients / max(elapsed, 1e-9):.1f} patients/s"
+        )
+
+        if len(patient_docs) < page_size:
+            break
+
+    checkpoint["elapsed_seconds"] = time.perf_counter() - started_at
+    return checkpoint
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-evaluate stored blood work reports against current reference ranges.")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate and report without writing to Firestore")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    try:
+        summary = await reevaluate_blood_work_reports(args.page_size, args.checkpoint, args.dry_run, args.restart)
+        print(f"Finished re-evaluating blood work reports: {summary}")
+    except Exception as e:
+        print(f"Error re-evaluating blood work reports: {str(e)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,14 +2,19 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
+from engines.biomarker_engine import biomarker_reference_index, get_biomarker_group_index
+from engines.gene_panel_index import get_gene_panel_index
 from modules.ai_knowledge.ai_knowledge_routes import ai_knowledge_router
 from modules.fullscript.fullscript_routes import fullscript_router
 from modules.medical_form.medical_form_routes import medical_form_router
+from modules.metrics.metrics_routes import metrics_router
 from modules.patients.patient_routes import patients_router
 from modules.recommendation.recommendation_routes import recommendation_router
 from routes.doctor_route import doctor_router
 from routes.patient_route import patient_router
 from utils.api_response import handle_generic_exception, handle_http_exception
+from utils.rendered_report_cache import get_report_template_version
+from utils.report_rendering import shutdown_render_executor
 from utils.validation_errors import handle_validation_error
 
 origins = ["*"]
@@ -23,6 +28,7 @@ app.include_router(recommendation_router)
 app.include_router(fullscript_router)
 app.include_router(medical_form_router)
 app.include_router(ai_knowledge_router)
+app.include_router(metrics_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +39,20 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def warm_reference_data():
+    """Compile reference data once at startup instead of on the first upload"""
+    biomarker_reference_index.warm()
+    get_biomarker_group_index()
+    get_gene_panel_index()
+    get_report_template_version()
+
+
+@app.on_event("shutdown")
+async def stop_render_executor():
+    shutdown_render_executor()
+
+
 # Global exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -1,3 +1,6 @@
+from functools import partial
+from typing import Callable, List
+
 from male_report.gene_report.page_0_g import cover_page
 from male_report.gene_report.page_1_g import page_1_g
 from male_report.gene_report.page_2_g import page_2_g
@@ -11,21 +14,92 @@ from male_report.gene_report.page_9_g import page_9_g
 from male_report.gene_report.page_10_g import page_10_g
 from male_report.gene_report.page_11_g import page_11_g
 from male_report.gene_report.page_12_g import page_12_g
+from male_report.gene_report.parse_gene_data import GeneResultIndex, get_gene_data
+
+GENE_PAGES = [
+    page_1_g,
+    page_2_g,
+    page_3_g,
+    page_4_g,
+    page_5_g,
+    page_6_g,
+    page_7_g,
+    page_8_g,
+    page_9_g,
+    page_10_g,
+    page_11_g,
+    page_12_g,
+]
+
+
+def build_gene_report_pages(gene_report, gene_index: GeneResultIndex = None) -> List[Callable]:
+    """Return the gene report pages as picklable render jobs, in order."""
+    # Index the gene results once and share it between all pages
+    gene_index = gene_index or GeneResultIndex(gene_report)
+    return [partial(cover_page, gene_report)] + [partial(page, gene_report, gene_index) for page in GENE_PAGES]
+
+
+def generate_gene_report_pages(gene_report, gene_index: GeneResultIndex = None):
+    return [render() for render in build_gene_report_pages(gene_report, gene_index)]
+
+
+class _ScanningGeneAccessor:
+    """Previous lookup path: scan every panel via get_gene_data on each call."""
+
+    def __init__(self, results):
+        self.results = results
 
+    def get(self, gene_name, rs_id=None, field="genotype"):
+        return get_gene_data(self.results, gene_name, rs_id, field)
 
-def generate_gene_report_pages(gene_report):
-    return [
-        cover_page(gene_report),
-        page_1_g(gene_report),
-        page_2_g(gene_report),
-        page_3_g(gene_report),
-        page_4_g(gene_report),
-        page_5_g(gene_report),
-        page_6_g(gene_report),
-        page_7_g(gene_report),
-        page_8_g(gene_report),
-        page_9_g(gene_report),
-        page_10_g(gene_report),
-        page_11_g(gene_report),
-        page_12_g(gene_report),
+
+def benchmark_gene_report(rounds: int = 20):
+    """
+    Compare gene lookups and full generate_gene_report_pages renders using the
+    GeneResultIndex against the previous get_gene_data scans, on a synthetic
+    report with every gene from genes-panels.json.
+
+    Run from the repository root with: python -m male_report.gene_report.generate_gene_report
+    """
+    import time
+
+    from engines.gene_panel_index import get_gene_panel_index
+
+    gene_report = {"firstName": "Bench", "lastName": "Mark", "geneResultsGrouped": {}}
+    for panel_name, genes in get_gene_panel_index().genes_by_panel.items():
+        gene_report["geneResultsGrouped"][panel_name] = [
+            {"name": gene["name"], "rs_id": gene.get("rs_id"), "genotype": gene["genotypes"][0]["genotype"]}
+            for gene in genes
+        ]
+    lookups = [
+        (gene["name"], gene["rs_id"])
+        for genes in gene_report["geneResultsGrouped"].values()
+        for gene in genes
     ]
+
+    def time_lookups(accessor_factory):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            accessor = accessor_factory(gene_report)
+            for gene_name, rs_id in lookups:
+                accessor.get(gene_name, rs_id)
+        return time.perf_counter() - start
+
+    def time_renders(accessor_factory):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            generate_gene_report_pages(gene_report, accessor_factory(gene_report))
+        return time.perf_counter() - start
+
+    scan_lookups, index_lookups = time_lookups(_ScanningGeneAccessor), time_lookups(GeneResultIndex)
+    scan_renders, index_renders = time_renders(_ScanningGeneAccessor), time_renders(GeneResultIndex)
+    return {
+        "lookup_speedup": scan_lookups / index_lookups,
+        "scan_render_ms": scan_renders / rounds * 1000,
+        "indexed_render_ms": index_renders / rounds * 1000,
+        "render_speedup": scan_renders / index_renders,
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_gene_report())
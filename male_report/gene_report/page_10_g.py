@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_10_g(results):
+def page_10_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_10_g(results):
     c.drawText(text_object)
 
     # Gene Results: MTHFR_rs1801133
-    MTHFR_rs1801133 = get_gene_data(results, "MTHFR", "rs1801133")
+    MTHFR_rs1801133 = gene_index.get("MTHFR", "rs1801133")
     # print(MTHFR_rs1801133)
 
     if MTHFR_rs1801133 == "AA":
@@ -164,7 +165,7 @@ def page_10_g(results):
     c.drawText(text_object)
 
     # Gene Results: MTHFR_rs1801131
-    MTHFR_rs1801131 = get_gene_data(results, "MTHFR", "rs1801131")
+    MTHFR_rs1801131 = gene_index.get("MTHFR", "rs1801131")
     # print(MTHFR_rs1801131)
 
     if MTHFR_rs1801131 == "CC":
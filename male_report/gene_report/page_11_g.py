@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_11_g(results):
+def page_11_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_11_g(results):
     c.drawText(text_object)
 
     # Gene Results: SOD2
-    SOD2 = get_gene_data(results, "SOD2")
+    SOD2 = gene_index.get("SOD2")
     # print(SOD2)
 
     if SOD2 == "AA":
@@ -164,7 +165,7 @@ def page_11_g(results):
     c.drawText(text_object)
 
     # Gene Results: GPx
-    GPx = get_gene_data(results, "GPx")
+    GPx = gene_index.get("GPx")
     # print(GPx)
 
     if GPx == "TT":
@@ -271,7 +272,7 @@ def page_11_g(results):
     c.drawText(text_object)
 
     # Gene Results: FOXO3
-    FOXO3 = get_gene_data(results, "FOXO3")
+    FOXO3 = gene_index.get("FOXO3")
     # print(FOXO3)
 
     if FOXO3 == "TT":
@@ -378,7 +379,7 @@ def page_11_g(results):
     c.drawText(text_object)
 
     # Gene Results: SIRT1
-    SIRT1 = get_gene_data(results, "SIRT1")
+    SIRT1 = gene_index.get("SIRT1")
     # print(SIRT1)
 
     if SIRT1 == "GG":
@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_12_g(results):
+def page_12_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_12_g(results):
     c.drawText(text_object)
 
     # Gene Results: HTR2A
-    HTR2A = get_gene_data(results, "HTR2A")
+    HTR2A = gene_index.get("HTR2A")
     # print(HTR2A)
 
     if HTR2A == "GG":
@@ -164,7 +165,7 @@ def page_12_g(results):
     c.drawText(text_object)
 
     # Gene Results: UGT2B17
-    UGT2B17 = get_gene_data(results, "UGT2B17")
+    UGT2B17 = gene_index.get("UGT2B17")
     # print(UGT2B17)
 
     if UGT2B17 == "0":
@@ -271,7 +272,7 @@ def page_12_g(results):
     c.drawText(text_object)
 
     # Gene Results: CYP3A4
-    CYP3A4 = get_gene_data(results, "CYP3A4")
+    CYP3A4 = gene_index.get("CYP3A4")
     # print(CYP3A4)
 
     if CYP3A4 == "GG":
@@ -378,7 +379,7 @@ def page_12_g(results):
     c.drawText(text_object)
 
     # Gene Results: MAOA
-    MAOA = get_gene_data(results, "MAOA")
+    MAOA = gene_index.get("MAOA")
     # print(MAOA)
 
     if MAOA == "TT":
@@ -1,26 +1,16 @@
 import io
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
+from utils.report_assets import get_white_bg_image
 
 yellow = "male_report/gene_report/yellow.png"
 purple = "male_report/gene_report/purple.png"
 
 
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
-
-
-def page_1_g(results):
+def page_1_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -72,13 +62,13 @@ def page_1_g(results):
     c.drawText(text_object)
 
     # Gene Results: CYP2R1
-    CYP2R1 = get_gene_data(results, "CYP2R1")
+    CYP2R1 = gene_index.get("CYP2R1")
     # print(CYP2R1)
 
     if CYP2R1 == "AG" or CYP2R1 == "GG":
         # For Backgroud Rectangle
         c.drawImage(
-            convert_png_to_white_bg(yellow),
+            get_white_bg_image(yellow),
             80,
             600,
             width=35,
@@ -110,7 +100,7 @@ def page_1_g(results):
     elif CYP2R1 == "AA":
         # For Backgroud Rectangle
         c.drawImage(
-            convert_png_to_white_bg(purple),
+            get_white_bg_image(purple),
             80,
             600,
             width=35,
@@ -161,13 +151,13 @@ def page_1_g(results):
     c.drawText(text_object)
 
     # Gene Results: VDR
-    VDR = get_gene_data(results, "VDR")
+    VDR = gene_index.get("VDR")
     # print(VDR)
 
     if VDR == "CT" or VDR == "TT":
         # For Backgroud Rectangle
         c.drawImage(
-            convert_png_to_white_bg(yellow),
+            get_white_bg_image(yellow),
             80,
             465,
             width=35,
@@ -199,7 +189,7 @@ def page_1_g(results):
     elif VDR == "CC":
         # For Backgroud Rectangle
         c.drawImage(
-            convert_png_to_white_bg(purple),
+            get_white_bg_image(purple),
             80,
             465,
             width=35,
@@ -2,13 +2,15 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
+from utils.report_assets import get_white_bg_image
 
-yellow = "male_report/gene_report/yellow_white_bg.png"
-purple = "male_report/gene_report/purple_white_bg.png"
+yellow = "male_report/gene_report/yellow.png"
+purple = "male_report/gene_report/purple.png"
 
 
-def page_2_g(results):
+def page_2_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -60,12 +62,12 @@ def page_2_g(results):
     c.drawText(text_object)
 
     # Gene Results: TCF7L2
-    TCF7L2_rs7903146 = get_gene_data(results, "TCF7L2", "rs7903146")
+    TCF7L2_rs7903146 = gene_index.get("TCF7L2", "rs7903146")
     # print(TCF7L2)
 
     if TCF7L2_rs7903146 == "CT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 600, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 600, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -90,7 +92,7 @@ def page_2_g(results):
 
     elif TCF7L2_rs7903146 == "TT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 600, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 600, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -115,7 +117,7 @@ def page_2_g(results):
 
     elif TCF7L2_rs7903146 == "CC":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 600, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 600, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -161,12 +163,12 @@ def page_2_g(results):
     c.drawText(text_object)
 
     # Gene Results: TCF7L2_rs12255372
-    TCF7L2_rs12255372 = get_gene_data(results, "TCF7L2", "rs12255372")
+    TCF7L2_rs12255372 = gene_index.get("TCF7L2", "rs12255372")
     # print(TCF7L2_rs12255372)
 
     if TCF7L2_rs12255372 == "GT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 445, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 445, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -191,7 +193,7 @@ def page_2_g(results):
 
     elif TCF7L2_rs12255372 == "TT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 445, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 445, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -216,7 +218,7 @@ def page_2_g(results):
 
     elif TCF7L2_rs12255372 == "GG":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 445, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 445, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -262,12 +264,12 @@ def page_2_g(results):
     c.drawText(text_object)
 
     # Gene Results: MTNR1B
-    MTNR1B = get_gene_data(results, "MTNR1B")
+    MTNR1B = gene_index.get("MTNR1B")
     # print(MTNR1B)
 
     if MTNR1B == "CG" or MTNR1B == "GG":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 293, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 293, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -292,7 +294,7 @@ def page_2_g(results):
 
     elif MTNR1B == "CC":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 293, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 293, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -2,13 +2,15 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
+from utils.report_assets import get_white_bg_image
 
-yellow = "male_report/gene_report/yellow_white_bg.png"
-purple = "male_report/gene_report/purple_white_bg.png"
+yellow = "male_report/gene_report/yellow.png"
+purple = "male_report/gene_report/purple.png"
 
 
-def page_3_g(results):
+def page_3_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -60,12 +62,12 @@ def page_3_g(results):
     c.drawText(text_object)
 
     # Gene Results: COMT
-    COMT = get_gene_data(results, "COMT")
+    COMT = gene_index.get("COMT")
     # print(COMT)
 
     if COMT == "TT":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 600, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 600, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -90,7 +92,7 @@ def page_3_g(results):
 
     elif COMT == "CT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 600, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 600, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -115,7 +117,7 @@ def page_3_g(results):
 
     elif COMT == "CC":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 600, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 600, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -161,12 +163,12 @@ def page_3_g(results):
     c.drawText(text_object)
 
     # Gene Results: CYP1A1
-    CYP1A1 = get_gene_data(results, "CYP1A1")
+    CYP1A1 = gene_index.get("CYP1A1")
     # print(CYP1A1)
 
     if CYP1A1 == "CC":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 445, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 445, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -192,7 +194,7 @@ def page_3_g(results):
 
     elif CYP1A1 == "CT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 445, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 445, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -217,7 +219,7 @@ def page_3_g(results):
 
     elif CYP1A1 == "TT":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 445, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 445, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -263,12 +265,12 @@ def page_3_g(results):
     c.drawText(text_object)
 
     # Gene Results: CYP1B1
-    CYP1B1 = get_gene_data(results, "CYP1B1")
+    CYP1B1 = gene_index.get("CYP1B1")
     # print(CYP1B1)
 
     if CYP1B1 == "CC":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 293, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 293, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -293,7 +295,7 @@ def page_3_g(results):
 
     elif CYP1B1 == "CG":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 293, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 293, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -318,7 +320,7 @@ def page_3_g(results):
 
     elif CYP1B1 == "GG":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 293, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 293, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -364,12 +366,12 @@ def page_3_g(results):
     c.drawText(text_object)
 
     # Gene Results: UGT2B15
-    UGT2B15 = get_gene_data(results, "UGT2B15")
+    UGT2B15 = gene_index.get("UGT2B15")
     # print(UGT2B15)
 
     if UGT2B15 == "TT":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 155, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 155, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -394,7 +396,7 @@ def page_3_g(results):
 
     elif UGT2B15 == "TG":
         # For Backgroud Rectangle
-        c.drawImage(purple, 80, 155, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(purple), 80, 155, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
@@ -419,7 +421,7 @@ def page_3_g(results):
 
     elif UGT2B15 == "GG":
         # For Backgroud Rectangle
-        c.drawImage(yellow, 80, 155, width=35, height=35, preserveAspectRatio=False)
+        c.drawImage(get_white_bg_image(yellow), 80, 155, width=35, height=35, preserveAspectRatio=False)
 
         # Results AC, GG or AG
         c.setFillColor("white")
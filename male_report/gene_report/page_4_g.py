@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_4_g(results):
+def page_4_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_4_g(results):
     c.drawText(text_object)
 
     # Gene Results: GSTP1
-    GSTP1 = get_gene_data(results, "GSTP1")
+    GSTP1 = gene_index.get("GSTP1")
     # print(GSTP1)
 
     if GSTP1 == "AG":
@@ -164,7 +165,7 @@ def page_4_g(results):
     c.drawText(text_object)
 
     # Gene Results: GSTM1
-    GSTM1 = get_gene_data(results, "GSTM1")
+    GSTM1 = gene_index.get("GSTM1")
     # print(GSTM1)
 
     if GSTM1 == "0":
@@ -271,7 +272,7 @@ def page_4_g(results):
     c.drawText(text_object)
 
     # Gene Results: CYP17A1
-    CYP17A1 = get_gene_data(results, "CYP17A1")
+    CYP17A1 = gene_index.get("CYP17A1")
     # print(CYP17A1)
 
     if CYP17A1 == "CC":
@@ -378,7 +379,7 @@ def page_4_g(results):
     c.drawText(text_object)
 
     # Gene Results: SRD5A2
-    SRD5A2 = get_gene_data(results, "SRD5A2")
+    SRD5A2 = gene_index.get("SRD5A2")
     # print(SRD5A2)
 
     if SRD5A2 == "CC":
@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_5_g(results):
+def page_5_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_5_g(results):
     c.drawText(text_object)
 
     # Gene Results: DIO2
-    DIO2 = get_gene_data(results, "DIO2")
+    DIO2 = gene_index.get("DIO2")
     # print(DIO2)
 
     if DIO2 == "CC":
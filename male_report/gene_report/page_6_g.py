@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_6_g(results):
+def page_6_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_6_g(results):
     c.drawText(text_object)
 
     # Gene Results: PSRC1
-    PSRC1 = get_gene_data(results, "PSRC1")
+    PSRC1 = gene_index.get("PSRC1")
     # print(PSRC1)
 
     if PSRC1 == "AA":
@@ -164,7 +165,7 @@ def page_6_g(results):
     c.drawText(text_object)
 
     # Gene Results: SLCO1B1
-    SLCO1B1 = get_gene_data(results, "SLCO1B1")
+    SLCO1B1 = gene_index.get("SLCO1B1")
     # print(SLCO1B1)
 
     if SLCO1B1 == "CC":
@@ -271,7 +272,7 @@ def page_6_g(results):
     c.drawText(text_object)
 
     # Gene Results: APOE_rs7412
-    APOE_rs7412 = get_gene_data(results, "APOE", "rs7412")
+    APOE_rs7412 = gene_index.get("APOE", "rs7412")
     # print(APOE_rs7412)
 
     if APOE_rs7412 == "CC":
@@ -378,7 +379,7 @@ def page_6_g(results):
     c.drawText(text_object)
 
     # Gene Results: APOE_rs429358
-    APOE_rs429358 = get_gene_data(results, "APOE", "rs429358")
+    APOE_rs429358 = gene_index.get("APOE", "rs429358")
     # print(APOE_rs429358)
 
     if APOE_rs429358 == "TT":
@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_7_g(results):
+def page_7_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_7_g(results):
     c.drawText(text_object)
 
     # Gene Results: MLXIPL
-    MLXIPL = get_gene_data(results, "MLXIPL")
+    MLXIPL = gene_index.get("MLXIPL")
     # print(MLXIPL)
 
     if MLXIPL == "CC":
@@ -190,7 +191,7 @@ def page_7_g(results):
     c.drawText(text_object)
 
     # Gene Results: 9P21_rs10757278
-    P21_rs10757278 = get_gene_data(results, "NineP21", "rs10757278")
+    P21_rs10757278 = gene_index.get("NineP21", "rs10757278")
     # print(9P21_rs10757278)
 
     if P21_rs10757278 == "CC":
@@ -297,7 +298,7 @@ def page_7_g(results):
     c.drawText(text_object)
 
     # Gene Results: PCSK9
-    PCSK9 = get_gene_data(results, "PCSK9")
+    PCSK9 = gene_index.get("PCSK9")
     # print(PCSK9)
 
     if PCSK9 == "GG":
@@ -404,7 +405,7 @@ def page_7_g(results):
     c.drawText(text_object)
 
     # Gene Results: P21_rs10757274
-    P21_rs10757274 = get_gene_data(results, "NineP21", "rs10757274")
+    P21_rs10757274 = gene_index.get("NineP21", "rs10757274")
     # print(P21_rs10757274)
 
     if P21_rs10757274 == "GG":
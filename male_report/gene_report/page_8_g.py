@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_8_g(results):
+def page_8_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_8_g(results):
     c.drawText(text_object)
 
     # Gene Results: P21_rs4977574
-    P21_rs4977574 = get_gene_data(results, "9P21", "rs4977574")
+    P21_rs4977574 = gene_index.get("9P21", "rs4977574")
     # print(P21_rs4977574)
 
     if P21_rs4977574 == "GG":
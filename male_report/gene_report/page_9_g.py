@@ -2,10 +2,11 @@ import io
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from male_report.gene_report.parse_gene_data import get_gene_data
+from male_report.gene_report.parse_gene_data import GeneResultIndex
 
 
-def page_9_g(results):
+def page_9_g(results, gene_index: GeneResultIndex = None):
+    gene_index = gene_index or GeneResultIndex(results)
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     # with open("male_report/results_g.json", "r") as file:
@@ -57,7 +58,7 @@ def page_9_g(results):
     c.drawText(text_object)
 
     # Gene Results: TMPRSS2
-    TMPRSS2 = get_gene_data(results, "TMPRSS2")
+    TMPRSS2 = gene_index.get("TMPRSS2")
     # print(TMPRSS2)
 
     if TMPRSS2 == "GG":
@@ -164,7 +165,7 @@ def page_9_g(results):
     c.drawText(text_object)
 
     # Gene Results: CDKN2A
-    CDKN2A = get_gene_data(results, "CDKN2A")
+    CDKN2A = gene_index.get("CDKN2A")
     # print(CDKN2A)
 
     if CDKN2A == "CC":
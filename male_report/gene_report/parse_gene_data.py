@@ -18,3 +18,34 @@ def get_gene_data(results, gene_name, rs_id=None, field="genotype"):
                     matches.append(gene[field] if field else gene)
 
     return matches[0] if len(matches) == 1 else matches
+
+
+class GeneResultIndex:
+    """
+    Indexed view of a report's geneResultsGrouped, keyed by gene name and by (name, rs_id).
+
+    Built once per report and passed to every gene page, so each lookup is a dict access
+    instead of a scan over every panel. get() returns the same values as get_gene_data.
+    """
+
+    def __init__(self, results):
+        self.by_name = {}
+        self.by_name_and_rs_id = {}
+        for panel_genes in (results.get("geneResultsGrouped") or {}).values():
+            for gene in panel_genes or []:
+                self.by_name.setdefault(gene["name"], []).append(gene)
+                self.by_name_and_rs_id.setdefault((gene["name"], gene.get("rs_id")), []).append(gene)
+
+    def get(self, gene_name, rs_id=None, field="genotype"):
+        """Same matching rules and return shape as get_gene_data."""
+        if rs_id is not None:
+            genes = self.by_name_and_rs_id.get((gene_name, rs_id), [])
+        else:
+            genes = self.by_name.get(gene_name, [])
+
+        matches = [gene[field] if field else gene for gene in genes]
+        return matches[0] if len(matches) == 1 else matches
+
+    def as_render_key(self):
+        """The indexed genes by name, sorted, so equal results give equal page render keys."""
+        return dict(sorted(self.by_name.items()))
@@ -1,16 +1,11 @@
 import io
 
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-# Font registration (should be done only once)
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "male_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(
-    TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf")
-)
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "male_report/fonts/Roboto-Bold.ttf"))
+from utils.report_assets import get_report_image, register_report_fonts
+
+register_report_fonts()
 
 
 def format_panel_name(panel_name):
@@ -29,8 +24,8 @@ def generate_supplements_page(data, panel_name):
     c = canvas.Canvas(buffer, pagesize=letter)
 
     # Background setup
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     # White rectangle for content area
     c.setFillColor("white")
@@ -90,7 +85,7 @@ def generate_supplements_page(data, panel_name):
                 c.showPage()
                 y_position = 750
                 c.drawImage(
-                    bg_image_path,
+                    bg_image,
                     0,
                     0,
                     width=612,
@@ -125,8 +120,8 @@ def generate_recommendation_page(data, panel_name):
     c = canvas.Canvas(buffer, pagesize=letter)
 
     # Background setup
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     # White rectangle for content area
     c.setFillColor("white")
@@ -223,7 +218,7 @@ def generate_recommendation_page(data, panel_name):
                         c.showPage()
                         y_position = 750
                         c.drawImage(
-                            bg_image_path,
+                            bg_image,
                             0,
                             0,
                             width=612,
@@ -1,12 +1,11 @@
 import io
 
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf"))
+from utils.report_assets import get_report_image, register_report_fonts
+
+register_report_fonts()
 
 
 def cover_page(results):
@@ -14,8 +13,8 @@ def cover_page(results):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "male_report/short_report/cover.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/cover.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     full_name = f"{results.get('firstName', '')} {results.get('lastName', '')}"
 
@@ -1,32 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "male_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(
-    TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf")
-)
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "male_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_1(results: List[BioMarker]):
@@ -36,8 +18,8 @@ def page_1(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -64,9 +46,9 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient's lipid results")
 
-    legend_image_path = "male_report/short_report/colors.jpg"
+    legend_image = get_report_image("male_report/short_report/colors.jpg")
     c.drawImage(
-        legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False
+        legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False
     )
 
     c.setStrokeColor("#adb5bd")
@@ -78,7 +60,7 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     # Cholesterol
     cholesterol = get_bio_marker_from_group(results, "cholesterol")
     if cholesterol is not None:
-        cholesterol_bar = convert_png_to_white_bg(
+        cholesterol_bar = get_white_bg_image(
             "male_report/short_report/NOA_bar.png"
         )
         c.drawImage(
@@ -117,7 +99,7 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     # LDL Cholesterol
     ldl_cholesterol = get_bio_marker_from_group(results, "ldlCholesterol")
     if ldl_cholesterol is not None:
-        ldl_bar = convert_png_to_white_bg("male_report/short_report/OA_bar.png")
+        ldl_bar = get_white_bg_image("male_report/short_report/OA_bar.png")
         c.drawImage(
             ldl_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False
         )
@@ -148,7 +130,7 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     # HDL Cholesterol
     hdl_cholesterol = get_bio_marker_from_group(results, "hdlCholesterol")
     if hdl_cholesterol is not None:
-        hdl_bar = convert_png_to_white_bg("male_report/short_report/ANO_bar.png")
+        hdl_bar = get_white_bg_image("male_report/short_report/ANO_bar.png")
         c.drawImage(
             hdl_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False
         )
@@ -182,7 +164,7 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     # non-HDL Cholesterol
     non_hdl = get_bio_marker_from_group(results, "nonHdlCholesterol")
     if non_hdl is not None:
-        nonhdl_bar = convert_png_to_white_bg("male_report/short_report/ONA_bar.png")
+        nonhdl_bar = get_white_bg_image("male_report/short_report/ONA_bar.png")
         c.drawImage(
             nonhdl_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False
         )
@@ -212,7 +194,7 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     # Triglycerides
     triglycerides = get_bio_marker_from_group(results, "triglyceride")
     if triglycerides is not None:
-        triglycerides_bar = convert_png_to_white_bg(
+        triglycerides_bar = get_white_bg_image(
             "male_report/short_report/NONA_bar.png"
         )
         c.drawImage(
@@ -256,7 +238,7 @@ assess the risk of cardiovascular diseases and guide treatment to manage lipid i
     # Cholesterol to HDL Ratio
     choHDL = get_bio_marker_from_group(results, "cholesterolToHdlRatio")
     if choHDL is not None:
-        cholHDL_bar = convert_png_to_white_bg("male_report/short_report/ONA_bar.png")
+        cholHDL_bar = get_white_bg_image("male_report/short_report/ONA_bar.png")
         c.drawImage(
             cholHDL_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False
         )
@@ -1,30 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "male_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "male_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_10(results: List[BioMarker]):
@@ -32,8 +16,8 @@ def page_10(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -60,8 +44,8 @@ def page_10(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s hormone results")
 
-    legend_image_path = "male_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("male_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -72,7 +56,7 @@ def page_10(results: List[BioMarker]):
     # FSH
     fsh = get_bio_marker_from_group(results, "follitropin")
     if fsh is not None:
-        fsh_bar = convert_png_to_white_bg("male_report/short_report/AOA_bar.png")
+        fsh_bar = get_white_bg_image("male_report/short_report/AOA_bar.png")
         c.drawImage(fsh_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -100,7 +84,7 @@ def page_10(results: List[BioMarker]):
     # LH
     lh = get_bio_marker_from_group(results, "lutropin")
     if lh is not None:
-        lh_bar = convert_png_to_white_bg("male_report/short_report/AOA_bar.png")
+        lh_bar = get_white_bg_image("male_report/short_report/AOA_bar.png")
         c.drawImage(lh_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -128,7 +112,7 @@ def page_10(results: List[BioMarker]):
     # Estradiol
     estradiol = get_bio_marker_from_group(results, "estradiol")
     if estradiol is not None:
-        estradiol_bar = convert_png_to_white_bg("male_report/short_report/ONA_bar.png")
+        estradiol_bar = get_white_bg_image("male_report/short_report/ONA_bar.png")
         c.drawImage(estradiol_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -156,7 +140,7 @@ def page_10(results: List[BioMarker]):
     # Progesterone
     progesterone = get_bio_marker_from_group(results, "progesterone")
     if progesterone is not None:
-        progesterone_bar = convert_png_to_white_bg("male_report/short_report/OA_bar.png")
+        progesterone_bar = get_white_bg_image("male_report/short_report/OA_bar.png")
         c.drawImage(progesterone_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -182,7 +166,7 @@ def page_10(results: List[BioMarker]):
 
     testosterone = get_bio_marker_from_group(results, "testosterone")
     if testosterone is not None:
-        testosterone_bar = convert_png_to_white_bg("male_report/short_report/ANOA_bar.png")
+        testosterone_bar = get_white_bg_image("male_report/short_report/ANOA_bar.png")
         c.drawImage(testosterone_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -213,7 +197,7 @@ def page_10(results: List[BioMarker]):
     # Free Testosterone
     testosteronefree = get_bio_marker_from_group(results, "testosteroneFree")
     if testosteronefree is not None:
-        testosteronefree_bar = convert_png_to_white_bg("male_report/short_report/ANAO_bar.png")
+        testosteronefree_bar = get_white_bg_image("male_report/short_report/ANAO_bar.png")
         c.drawImage(testosteronefree_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
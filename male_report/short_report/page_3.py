@@ -1,30 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "male_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "male_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_3(results: List[BioMarker]):
@@ -32,8 +16,8 @@ def page_3(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -60,9 +44,9 @@ def page_3(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s renal results")
 
-    legend_image_path = "male_report/short_report/colors.jpg"
+    legend_image = get_report_image("male_report/short_report/colors.jpg")
     c.drawImage(
-        legend_image_path,
+        legend_image,
         340,
         520,
         width=200,
@@ -79,7 +63,7 @@ def page_3(results: List[BioMarker]):
     # Creatinine
     creatinine = get_bio_marker_from_group(results, "creatinine")
     if creatinine is not None:
-        creatinine_bar = convert_png_to_white_bg("male_report/short_report/AOA_bar.png")
+        creatinine_bar = get_white_bg_image("male_report/short_report/AOA_bar.png")
         c.drawImage(
             creatinine_bar,
             70,
@@ -114,7 +98,7 @@ def page_3(results: List[BioMarker]):
     # eFGR
     egfr = get_bio_marker_from_group(results, "eGFR")
     if egfr is not None:
-        efgr_bar = convert_png_to_white_bg("male_report/short_report/ANO_bar.png")
+        efgr_bar = get_white_bg_image("male_report/short_report/ANO_bar.png")
         c.drawImage(
             efgr_bar,
             70,
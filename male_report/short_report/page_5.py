@@ -1,30 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "male_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "male_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_5(results: List[BioMarker]):
@@ -32,8 +16,8 @@ def page_5(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -60,8 +44,8 @@ def page_5(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s inflamation results")
 
-    legend_image_path = "male_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("male_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -72,7 +56,7 @@ def page_5(results: List[BioMarker]):
     # ESR
     esr = get_bio_marker_from_group(results, "sedimentationRate")
     if esr is not None:
-        esr_bar = convert_png_to_white_bg("male_report/short_report/ONA_bar.png")
+        esr_bar = get_white_bg_image("male_report/short_report/ONA_bar.png")
         c.drawImage(esr_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -100,7 +84,7 @@ def page_5(results: List[BioMarker]):
     # hs-CRP
     hs_CRP = get_bio_marker_from_group(results, "cReactiveProtein")
     if hs_CRP is not None:
-        hs_CRP_bar = convert_png_to_white_bg("male_report/short_report/ANO_bar.png")
+        hs_CRP_bar = get_white_bg_image("male_report/short_report/ANO_bar.png")
         c.drawImage(hs_CRP_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -128,7 +112,7 @@ def page_5(results: List[BioMarker]):
     # Fibrinogen quantitative
     fibrinogen = get_bio_marker_from_group(results, "fibrinogen")
     if fibrinogen is not None:
-        fibrinogen_bar = convert_png_to_white_bg("male_report/short_report/NONA_bar.png")
+        fibrinogen_bar = get_white_bg_image("male_report/short_report/NONA_bar.png")
         c.drawImage(fibrinogen_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -159,7 +143,7 @@ def page_5(results: List[BioMarker]):
     # Creatine Kinase
     creatine = get_bio_marker_from_group(results, "creatineKinase")
     if creatine is not None:
-        creatine_bar = convert_png_to_white_bg("male_report/short_report/ANONA_bar.png")
+        creatine_bar = get_white_bg_image("male_report/short_report/ANONA_bar.png")
         c.drawImage(creatine_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -193,7 +177,7 @@ def page_5(results: List[BioMarker]):
     # Uric Acid
     uric_acid = get_bio_marker_from_group(results, "uricAcid")
     if uric_acid is not None:
-        uric_acid_bar = convert_png_to_white_bg("male_report/short_report/AONA_bar.png")
+        uric_acid_bar = get_white_bg_image("male_report/short_report/AONA_bar.png")
         c.drawImage(uric_acid_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -1,30 +1,14 @@
 import io
 from typing import List
 
-from PIL import Image
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 from models.patient_models import BioMarker
 from utils.biomarker_helpers import get_bio_marker_from_group
+from utils.report_assets import get_report_image, get_white_bg_image, register_report_fonts
 
-# Font registration
-pdfmetrics.registerFont(TTFont("Roboto-Thin", "male_report/fonts/Roboto-Thin.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Regular", "male_report/fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "male_report/fonts/Roboto-Bold.ttf"))
-
-
-def convert_png_to_white_bg(image_path):
-    img = Image.open(image_path)
-    # Create a new image with a white background
-    new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
-    new_img.paste(img, (0, 0), img)
-    # Save it as a new PNG
-    new_image_path = image_path.replace(".png", "_white_bg.png")
-    new_img.convert("RGB").save(new_image_path, "PNG")
-    return new_image_path
+register_report_fonts()
 
 
 def page_9(results: List[BioMarker]):
@@ -32,8 +16,8 @@ def page_9(results: List[BioMarker]):
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
 
-    bg_image_path = "male_report/short_report/bg_new.jpg"
-    c.drawImage(bg_image_path, 0, 0, width=612, height=800, preserveAspectRatio=False)
+    bg_image = get_report_image("male_report/short_report/bg_new.jpg")
+    c.drawImage(bg_image, 0, 0, width=612, height=800, preserveAspectRatio=False)
 
     c.setFillColor("#BF7BD3")
     c.setFont("Roboto-Bold", 25)
@@ -60,8 +44,8 @@ def page_9(results: List[BioMarker]):
     c.setFont("Roboto-Regular", 15)
     c.drawString(70, 520, "Patient’s thyroid results")
 
-    legend_image_path = "male_report/short_report/colors.jpg"
-    c.drawImage(legend_image_path, 340, 520, width=200, height=15, preserveAspectRatio=False)
+    legend_image = get_report_image("male_report/short_report/colors.jpg")
+    c.drawImage(legend_image, 340, 520, width=200, height=15, preserveAspectRatio=False)
 
     c.setStrokeColor("#adb5bd")
     c.setLineWidth(0.2)
@@ -72,7 +56,7 @@ def page_9(results: List[BioMarker]):
     # TSH
     tsh = get_bio_marker_from_group(results, "thyroidStimulatingHormone")
     if tsh is not None:
-        tsh_bar = convert_png_to_white_bg("male_report/short_report/AONA_bar.png")
+        tsh_bar = get_white_bg_image("male_report/short_report/AONA_bar.png")
         c.drawImage(tsh_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -103,7 +87,7 @@ def page_9(results: List[BioMarker]):
     # Free T4
     freet4 = get_bio_marker_from_group(results, "freeT4")
     if freet4 is not None:
-        freet4_bar = convert_png_to_white_bg("male_report/short_report/ANOA_bar.png")
+        freet4_bar = get_white_bg_image("male_report/short_report/ANOA_bar.png")
         c.drawImage(freet4_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -134,7 +118,7 @@ def page_9(results: List[BioMarker]):
     # Free T3
     freet3 = get_bio_marker_from_group(results, "freeT3")
     if freet3 is not None:
-        freet3_bar = convert_png_to_white_bg("male_report/short_report/ANOA_bar.png")
+        freet3_bar = get_white_bg_image("male_report/short_report/ANOA_bar.png")
         c.drawImage(freet3_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -165,7 +149,7 @@ def page_9(results: List[BioMarker]):
     # Reverse T3
     reverset3 = get_bio_marker_from_group(results, "reverseT3")
     if reverset3 is not None:
-        reverset3_bar = convert_png_to_white_bg("male_report/short_report/ANONA_bar.png")
+        reverset3_bar = get_white_bg_image("male_report/short_report/ANONA_bar.png")
         c.drawImage(reverset3_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -199,7 +183,7 @@ def page_9(results: List[BioMarker]):
     # anti-TPO
     tpo = get_bio_marker_from_group(results, "thyroidPeroxidaseAntibody")
     if tpo is not None:
-        tpo_bar = convert_png_to_white_bg("male_report/short_report/OA_bar.png")
+        tpo_bar = get_white_bg_image("male_report/short_report/OA_bar.png")
         c.drawImage(tpo_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
@@ -224,7 +208,7 @@ def page_9(results: List[BioMarker]):
     # anti-TG
     tg = get_bio_marker_from_group(results, "thyroglobulinAntibodies")
     if tg is not None:
-        tg_bar = convert_png_to_white_bg("male_report/short_report/OA_bar.png")
+        tg_bar = get_white_bg_image("male_report/short_report/OA_bar.png")
         c.drawImage(tg_bar, 70, y_position, width=480, height=35, preserveAspectRatio=False)
         c.setFillColor("#4b4b4b")
         c.setFont("Roboto-Regular", 11)
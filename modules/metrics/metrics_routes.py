@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+
+from auth.token import get_current_doctor_id
+from ai.gemini_client import gemini_limiter
+from config.cloud_storage import storage_metrics
+from utils.api_response import APIResponse, success_response
+from utils.extraction_cache import extraction_cache_stats, extraction_source_stats
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@metrics_router.get("/storage", response_model=APIResponse)
+async def get_storage_metrics(doctor_id=Depends(get_current_doctor_id)):
+    """Connection reuse and per-call latency of the shared storage client on this instance"""
+    return success_response(data=storage_metrics.as_dict(), message="Storage metrics fetched successfully")
+
+
+@metrics_router.get("/extraction", response_model=APIResponse)
+async def get_extraction_metrics(doctor_id=Depends(get_current_doctor_id)):
+    """Gemini call latency and timeouts, extraction cache hits and uploads read without an LLM, on this instance"""
+    return success_response(
+        data={
+            "calls": gemini_limiter.as_dict(),
+            "cache": extraction_cache_stats.as_dict(),
+            "sources": extraction_source_stats.as_dict(),
+        },
+        message="Extraction metrics fetched successfully",
+    )
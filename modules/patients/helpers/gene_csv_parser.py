@@ -0,0 +1,191 @@
+import csv
+import io
+import re
+from typing import Dict, List, Optional, Tuple
+
+from engines.gene_panel_index import get_gene_panel_index
+from models.patient_models import GeneResults
+from modules.patients.mappers.gene_results_mapper import GENE_MAPPINGS, GeneResultsMapper
+
+# Share of the report genes a file must contain before its local parse is trusted
+MIN_MATCHED_FRACTION = 0.5
+
+# Header names of the long layout, one row per gene result (compared lowercase, alphanumerics only)
+GENE_COLUMNS = {"gene", "genename", "genesymbol", "symbol"}
+RS_COLUMNS = {"rsid", "rs", "rsnumber", "snp", "snpid", "variant", "variantid", "markerid"}
+GENOTYPE_COLUMNS = {"genotype", "result", "results", "call", "genotypecall", "genotyperesult", "alleles"}
+
+# Cell values accepted as genotypes: allele pairs, copy numbers and insertion/deletion calls
+GENOTYPE_PATTERN = re.compile(
+    r"^(?:[ACGT]{1,2}|[ACGT]/[ACGT]|[012]|[ID]{1,2}|[ID]/[ID]|ins|del|ins/del)$", re.IGNORECASE
+)
+
+_RS_PATTERN = re.compile(r"^rs\d+$", re.IGNORECASE)
+_GENOTYPE_SEPARATORS = re.compile(r"[\s/]+")
+_SPLIT_PATTERN = re.compile(r"[\s_\-()/:]+")
+
+
+class GeneKeyIndex:
+    """Resolves the gene and rs_id written in a file to the response keys of GeneResultsMapper."""
+
+    def __init__(self):
+        self.genes_by_key: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.by_gene_and_rs: Dict[Tuple[str, Optional[str]], str] = {}
+        self.by_gene: Dict[str, List[str]] = {}
+        self.by_rs: Dict[str, List[str]] = {}
+        for gene_name, rs_id in GENE_MAPPINGS:
+            key = GeneResultsMapper.get_gene_response_key(gene_name, rs_id)
+            self.genes_by_key[key] = (gene_name, rs_id)
+            gene = gene_name.upper()
+            self.by_gene_and_rs[(gene, rs_id)] = key
+            self.by_gene.setdefault(gene, []).append(key)
+            if rs_id:
+                self.by_rs.setdefault(rs_id, []).append(key)
+
+    def resolve(self, gene: Optional[str], rs_id: Optional[str]) -> List[str]:
+        gene = gene.strip().upper() if gene else None
+        rs_id = rs_id.strip().lower() if rs_id else None
+        if gene in self.by_gene:
+            if (gene, rs_id) in self.by_gene_and_rs:
+                return [self.by_gene_and_rs[(gene, rs_id)]]
+            if (gene, None) in self.by_gene_and_rs:
+                # Genes reported without an rs_id match whatever rs_id the file gives
+                return [self.by_gene_and_rs[(gene, None)]]
+            # Without an rs_id, only a gene reported for a single rs_id is unambiguous
+            keys = self.by_gene[gene]
+            return keys if not rs_id and len(keys) == 1 else []
+        if rs_id:
+            return self.by_rs.get(rs_id, [])
+        return []
+
+    def resolve_label(self, label: str) -> List[str]:
+        """Resolve a column label such as "CYP2R1", "TCF7L2_rs7903146", "APOE (rs7412)" or "rs4680"."""
+        tokens = [token for token in _SPLIT_PATTERN.split(label.strip()) if token]
+        rs_ids = [token for token in tokens if _RS_PATTERN.match(token)]
+        genes = [token for token in tokens if not _RS_PATTERN.match(token)]
+        if len(rs_ids) > 1 or len(genes) > 1:
+            return []
+        return self.resolve(genes[0] if genes else None, rs_ids[0] if rs_ids else None)
+
+    def to_panel_genotype(self, key: str, genotype: str) -> Optional[str]:
+        """
+        The genotype spelled as genes-panels.json spells it for the gene of a response key:
+        uppercase, without "/" or spaces, alleles in the panel's order ("c/t" and "TC" give
+        "CT"). Returns None when the gene's panel entry has no such genotype, since the risk
+        lookup would then silently fall back to the default. Genes outside the panels are
+        only normalised.
+        """
+        genotype = _GENOTYPE_SEPARATORS.sub("", genotype).upper()
+        gene_name, rs_id = self.genes_by_key[key]
+        match = get_gene_panel_index().get_gene(gene_name, rs_id)
+        if match is None:
+            return genotype
+        panel_genotypes = {genotype_info["genotype"] for genotype_info in match[1]["genotypes"]}
+        for candidate in (genotype, genotype[::-1]):
+            if candidate in panel_genotypes:
+                return candidate
+        return None
+
+
+_key_index: Optional[GeneKeyIndex] = None
+
+
+def get_gene_key_index() -> GeneKeyIndex:
+    global _key_index
+    if _key_index is None:
+        _key_index = GeneKeyIndex()
+    return _key_index
+
+
+def _normalize_header(cell: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", cell.lower())
+
+
+def _get_cell(row: List[str], column: Optional[int]) -> Optional[str]:
+    return row[column] if column is not None and column < len(row) else None
+
+
+def _read_rows(file_content: bytes) -> List[List[str]]:
+    try:
+        text = file_content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = file_content.decode("latin-1")
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+    rows = [[cell.strip() for cell in row] for row in csv.reader(io.StringIO(text), dialect)]
+    return [row for row in rows if any(row)]
+
+
+def _parse_long_layout(rows: List[List[str]], key_index: GeneKeyIndex) -> Optional[Dict[str, str]]:
+    """One row per result, under a header with a gene and/or rs_id column and a genotype column."""
+    for header_position, header in enumerate(rows):
+        columns = [_normalize_header(cell) for cell in header]
+        gene_column = next((i for i, column in enumerate(columns) if column in GENE_COLUMNS), None)
+        rs_column = next((i for i, column in enumerate(columns) if column in RS_COLUMNS), None)
+        genotype_column = next((i for i, column in enumerate(columns) if column in GENOTYPE_COLUMNS), None)
+        if genotype_column is None or (gene_column is None and rs_column is None):
+            continue
+
+        results = {}
+        for row in rows[header_position + 1 :]:
+            genotype = _get_cell(row, genotype_column)
+            keys = key_index.resolve(_get_cell(row, gene_column), _get_cell(row, rs_column))
+            if not keys or not genotype:
+                continue
+            if not GENOTYPE_PATTERN.match(genotype):
+                return None
+            for key in keys:
+                panel_genotype = key_index.to_panel_genotype(key, genotype)
+                if panel_genotype is None:
+                    return None
+                results.setdefault(key, panel_genotype)
+        return results
+    return None
+
+
+def _parse_wide_layout(rows: List[List[str]], key_index: GeneKeyIndex) -> Optional[Dict[str, str]]:
+    """A header row of gene labels with the genotypes in the row below it."""
+    for header_position, header in enumerate(rows[:-1]):
+        column_keys = [key_index.resolve_label(cell) for cell in header]
+        if sum(1 for keys in column_keys if keys) < len(header) / 2:
+            continue
+
+        results = {}
+        values = rows[header_position + 1]
+        for keys, genotype in zip(column_keys, values):
+            if not keys or not genotype:
+                continue
+            if not GENOTYPE_PATTERN.match(genotype):
+                return None
+            for key in keys:
+                panel_genotype = key_index.to_panel_genotype(key, genotype)
+                if panel_genotype is None:
+                    return None
+                results.setdefault(key, panel_genotype)
+        return results
+    return None
+
+
+def parse_gene_results_csv(file_content: bytes) -> Optional[Dict[str, str]]:
+    """
+    Read the genotypes of a gene results CSV without calling Gemini.
+
+    Recognizes one-result-per-row files (gene / rs_id / genotype columns) and one-row files
+    with a column per gene, and returns the genotypes keyed like GeneResultsMapper expects.
+    Genotypes are stored as genes-panels.json spells them. Returns None for any other
+    layout, for a genotype the gene's panel does not list, or when too few report genes
+    are found for the result to be trusted, so the caller can fall back to Gemini.
+    """
+    try:
+        rows = _read_rows(file_content)
+    except csv.Error:
+        return None
+
+    key_index = get_gene_key_index()
+    for parse_layout in (_parse_long_layout, _parse_wide_layout):
+        results = parse_layout(rows, key_index)
+        if results is not None and len(results) >= len(GENE_MAPPINGS) * MIN_MATCHED_FRACTION:
+            return GeneResults(**results).model_dump()
+    return None
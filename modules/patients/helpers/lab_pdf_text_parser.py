@@ -0,0 +1,338 @@
+from datetime import date, datetime
+import io
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pypdf import PdfReader, PdfWriter
+
+# Biomarkers a text layer must yield, with a number and a unit, before its parse is trusted
+MIN_TEXT_BIOMARKERS = 8
+
+# Pages with less text than this may be scanned, so page selection is not attempted
+MIN_PAGE_TEXT_CHARS = 40
+
+# Lab report names of each analyte of the ai/gemini_pdf.py prompt, lowercase with single
+# spaces and without punctuation. A result line must name exactly one of them.
+ANALYTE_NAMES = {
+    "cholesterol": ["cholesterol", "total cholesterol", "cholesterol total"],
+    "triglycerides": ["triglycerides", "triglyceride"],
+    "hdl_cholesterol": ["hdl cholesterol", "hdl", "hdl c", "cholesterol hdl"],
+    "ldl_cholesterol": ["ldl cholesterol", "ldl", "ldl c", "cholesterol ldl", "ldl cholesterol calculated"],
+    "non_hdl_cholesterol": ["non hdl cholesterol", "non hdl", "non hdl c", "cholesterol non hdl"],
+    "cholesterol_to_hdl_ratio": [
+        "cholesterol hdl ratio",
+        "total cholesterol hdl ratio",
+        "chol hdl ratio",
+        "tc hdl ratio",
+    ],
+    "hemoglobin_a1c_hba1c": ["hemoglobin a1c", "haemoglobin a1c", "hba1c", "a1c", "glycated hemoglobin"],
+    "Creatinine": ["creatinine"],
+    "Glomerular_Filtration_Rate_eGFR": ["egfr", "estimated gfr", "glomerular filtration rate", "egfr ckd epi"],
+    "Sodium": ["sodium"],
+    "Potassium": ["potassium"],
+    "Phosphorus": ["phosphorus", "phosphate"],
+    "Total_Bilirubin": ["total bilirubin", "bilirubin total", "bilirubin"],
+    "Calcium": ["calcium", "calcium total"],
+    "Albumin": ["albumin"],
+    "Sedimentation_rate_ESR": ["esr", "sedimentation rate", "erythrocyte sedimentation rate"],
+    "Vitamin_D_25_Hydroxy": ["vitamin d 25 hydroxy", "25 hydroxy vitamin d", "vitamin d", "25 oh vitamin d"],
+    "Vitamin_B12": ["vitamin b12", "b12", "cobalamin"],
+    "Ferritin": ["ferritin"],
+    "Progesterone": ["progesterone"],
+    "Prolactin_Total": ["prolactin", "prolactin total"],
+    "Sex_Hormone_Bind_Globulin": ["sex hormone binding globulin", "shbg"],
+    "Reverse_T3": ["reverse t3", "rt3"],
+    "Free_Triiodothyrodnine_T3": ["free t3", "free triiodothyronine", "ft3", "free triiodothyronine t3"],
+    "Free_Thyroxine_T4": ["free t4", "free thyroxine", "ft4", "free thyroxine t4"],
+    "Testosterone_Free": ["free testosterone", "testosterone free"],
+    "Follitropin_FSH": ["fsh", "follitropin", "follicle stimulating hormone"],
+    "Lutropin_LH": ["lh", "lutropin", "luteinizing hormone"],
+    "Testosterone": ["testosterone", "testosterone total", "total testosterone"],
+    "Magnesium": ["magnesium"],
+    "Zinc": ["zinc"],
+    "Vitamin_A": ["vitamin a", "retinol"],
+    "Cortisol_am": ["cortisol am", "am cortisol", "cortisol morning", "cortisol"],
+    "DHEA": ["dhea", "dhea s", "dhea sulfate", "dheas"],
+    "Estradiol": ["estradiol", "oestradiol"],
+    "Alkaline_Phosphate_ALP": ["alkaline phosphatase", "alp"],
+    "Alanine_Transaminase_ALT": ["alt", "alanine aminotransferase", "alanine transaminase"],
+    "Aspartate_Transaminase_AST": ["ast", "aspartate aminotransferase", "aspartate transaminase"],
+    "Gamma_Glutamyl_Transferase_GGT": ["ggt", "gamma gt", "gamma glutamyl transferase", "gamma glutamyltransferase"],
+    "Thyroid_Stimulating_Hormone_TSH": ["tsh", "thyroid stimulating hormone"],
+    "Thyroid_Peroxidase_Antibody_TPO": ["anti tpo", "tpo antibodies", "thyroid peroxidase antibodies"],
+    "Thyroglobulin_Antibodies_Anti_TG": ["anti tg", "thyroglobulin antibodies", "anti thyroglobulin"],
+    "Selenium_plasma": ["selenium", "selenium plasma"],
+    "C_Reactive_Protien": ["crp", "c reactive protein", "hs crp", "high sensitivity crp"],
+    "Insulin": ["insulin", "insulin fasting"],
+    "Glucose": ["glucose", "glucose fasting", "fasting glucose"],
+    "Fibrinogen": ["fibrinogen"],
+    "Uric_Acid": ["uric acid", "urate"],
+    "Hemoglobin": ["hemoglobin", "haemoglobin", "hgb"],
+    "Hematocrit": ["hematocrit", "haematocrit", "hct"],
+    "WBC": ["wbc", "white blood cells", "white blood cell count"],
+    "RBC": ["rbc", "red blood cells", "red blood cell count"],
+    "MCV": ["mcv"],
+    "Neutrophils": ["neutrophils"],
+    "Lymphocytes": ["lymphocytes"],
+    "Monocytes": ["monocytes"],
+    "Eosinophils": ["eosinophils"],
+    "Basophils": ["basophils"],
+    "MCH": ["mch"],
+    "MCHC": ["mchc"],
+    "RDW": ["rdw"],
+    "Platelet_Count": ["platelets", "platelet count"],
+    "Total_PSA": ["psa", "total psa", "psa total", "prostate specific antigen"],
+}
+
+# Analytes reported without a unit
+UNITLESS_ANALYTES = {"cholesterol_to_hdl_ratio"}
+
+# A standalone result number, an optional H/L flag and the token after it, which may be the unit
+_VALUE_PATTERN = re.compile(r"(?<![\w.\-/])(?P<number>[<>]?\s?\d+(?:\.\d+)?)(?=\s|$)\s*(?:[HL]\s+)?(?P<unit>\S+)?")
+_UNIT_PATTERN = re.compile(r"^(?:%|[a-zA-Z\dµμ][\w.^*µμ]*(?:/[\w.^*µμ]+)*)$")
+_NOT_UNITS = {"h", "l", "high", "low", "normal", "ref", "range"}
+
+# Year-first dates, or dates that end with the year
+_DATE_VALUE = r"\d{4}-(?:\d{1,2}|[A-Za-z]{3})-\d{1,2}|[A-Za-z0-9 ,\-]+?\d{4}"
+
+_FIELD_PATTERNS = {
+    # Anchored so that labels such as "Ordering Physician Name:" do not match
+    "patient": re.compile(
+        r"(?:^\s*(?:patient name|patient|name)|(?:^|\s{2,})(?:patient name|patient))\s*:\s*"
+        r"(?P<value>[A-Za-z][A-Za-z ,.'\-]+?)"
+        r"\s*(?:$|\s{2,}|\b(?:dob|sex|age|date|gender)\b)",
+        re.IGNORECASE | re.MULTILINE,
+    ),
+    "sex": re.compile(r"\b(?:sex|gender)\s*:\s*(?P<value>male|female|m|f)\b", re.IGNORECASE),
+    "age": re.compile(r"\bage\s*:\s*(?P<value>\d{1,3})\b", re.IGNORECASE),
+    "collection_date": re.compile(
+        rf"\b(?:collection date|date collected|collected|collection)\s*:\s*(?P<value>{_DATE_VALUE})\b", re.IGNORECASE
+    ),
+    "date_of_birth": re.compile(rf"\b(?:date of birth|dob|birth date)\s*:\s*(?P<value>{_DATE_VALUE})\b", re.IGNORECASE),
+}
+
+# Date formats that cannot be misread; 01/02/2024 style dates are left to Gemini
+_DATE_FORMATS = ("%Y-%m-%d", "%Y-%b-%d", "%d-%b-%Y", "%d %b %Y", "%b %d, %Y", "%B %d, %Y", "%d %B %Y")
+
+# Titles that mark a name as the physician's rather than the patient's
+_PHYSICIAN_TITLES = {"dr", "doctor", "physician", "md", "prof"}
+
+_analyte_lookup: Optional[Dict[str, str]] = None
+
+
+def get_analyte_lookup() -> Dict[str, str]:
+    """Normalized lab report name -> prompt entity key."""
+    global _analyte_lookup
+    if _analyte_lookup is None:
+        _analyte_lookup = {name: key for key, names in ANALYTE_NAMES.items() for name in names}
+    return _analyte_lookup
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name.lower()).split())
+
+
+def _parse_date(value: str) -> Optional[date]:
+    value = " ".join(value.replace(",", ", ").split()).replace(" ,", ",")
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def extract_pdf_page_texts(file_content: bytes) -> List[str]:
+    """Text layer of each page of a PDF; empty strings for scanned pages."""
+    reader = PdfReader(io.BytesIO(file_content))
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def find_line_analytes(line: str) -> List[str]:
+    """
+    Prompt analytes a line names anywhere, whether or not a value follows on the same line.
+
+    At each word the longest analyte name wins and its words are consumed, so "HDL
+    Cholesterol" names only hdl_cholesterol, not cholesterol as well.
+    """
+    analyte_lookup = get_analyte_lookup()
+    words = _normalize_name(line).split()
+    analytes = []
+    start = 0
+    while start < len(words):
+        for length in range(min(len(words) - start, 5), 0, -1):
+            key = analyte_lookup.get(" ".join(words[start : start + length]))
+            if key is not None:
+                analytes.append(key)
+                start += length
+                break
+        else:
+            start += 1
+    return analytes
+
+
+def count_analyte_mentions(lines: List[str]) -> int:
+    """Lines that name a prompt analyte anywhere, whether or not a value follows on the same line."""
+    return sum(1 for line in lines if find_line_analytes(line))
+
+
+def select_result_page_groups(
+    file_content: bytes, page_texts: List[str], pages_per_group: int
+) -> Optional[Tuple[List[int], List[bytes]]]:
+    """
+    Split a lab PDF into sub-documents holding only its result pages, at most
+    pages_per_group pages each. Returns the kept page positions and the sub-documents.
+
+    Only pages that name no analyte and carry none of the patient fields, such as cover
+    letters and legal pages, are dropped: a wrongly dropped page loses results silently,
+    while a wrongly kept one only costs tokens. Returns
+    None when the whole file should be sent as it is: a page may be scanned, no page looks
+    like a result page, or every page is kept and fits in one group.
+    """
+    if any(len(text.strip()) < MIN_PAGE_TEXT_CHARS for text in page_texts):
+        return None
+
+    selected = [
+        position
+        for position, text in enumerate(page_texts)
+        if count_analyte_mentions(text.splitlines())
+        or any(pattern.search(text) for pattern in _FIELD_PATTERNS.values())
+    ]
+    if not selected or (len(selected) == len(page_texts) and len(selected) <= pages_per_group):
+        return None
+
+    reader = PdfReader(io.BytesIO(file_content))
+    groups = []
+    for start in range(0, len(selected), pages_per_group):
+        writer = PdfWriter()
+        for position in selected[start : start + pages_per_group]:
+            writer.add_page(reader.pages[position])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        groups.append(buffer.getvalue())
+    return selected, groups
+
+
+def is_missing_result(value: Any) -> bool:
+    """Whether an extracted value is empty: None, a blank string, or a result without a number."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, dict):
+        if "number" in value:
+            return is_missing_result(value["number"])
+        return all(is_missing_result(item) for item in value.values())
+    return False
+
+
+def merge_page_group_results(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the extractions of a PDF's page groups, in page order. The first group that
+    reports a value wins; a group that answers an entity with an empty value does not
+    hide a later group's real one.
+    """
+    merged: Dict[str, Any] = {}
+    for response in responses:
+        for key, value in response.items():
+            if key not in merged or (is_missing_result(merged[key]) and not is_missing_result(value)):
+                merged[key] = value
+    return merged
+
+
+def match_result_lines(lines: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Results of the lines that name a prompt analyte followed by a number and a unit.
+
+    An analyte found twice with different values is dropped, since the text alone cannot
+    tell which one the report means.
+    """
+    analyte_lookup = get_analyte_lookup()
+    results: Dict[str, Dict[str, str]] = {}
+    conflicting = set()
+    for line in lines:
+        line = line.strip()
+        for match in _VALUE_PATTERN.finditer(line):
+            key = analyte_lookup.get(_normalize_name(line[: match.start()]))
+            if key is None:
+                continue
+            unit = match.group("unit") or ""
+            if unit.lower() in _NOT_UNITS or not _UNIT_PATTERN.match(unit) or not re.search(r"[a-zA-Zµμ%]", unit):
+                unit = ""
+            if not unit and key not in UNITLESS_ANALYTES:
+                break
+            result = {"number": match.group("number").replace(" ", ""), "unit": unit or None}
+            if key in results and results[key] != result:
+                conflicting.add(key)
+            results.setdefault(key, result)
+            break
+    for key in conflicting:
+        del results[key]
+    return results
+
+
+def match_patient_name(text: str) -> Optional[str]:
+    """
+    The patient name of the text, or None unless exactly one plausible name is found.
+
+    The name decides whether an upload is rejected as another patient's report, so a
+    name given differently in two places, or one that looks like the physician's, is
+    left to Gemini rather than trusted.
+    """
+    names = {}
+    for match in _FIELD_PATTERNS["patient"].finditer(text):
+        value = match.group("value").strip()
+        names.setdefault(_normalize_name(value), value)
+    if len(names) != 1:
+        return None
+    normalized, value = next(iter(names.items()))
+    words = normalized.split()
+    if len(words) < 2 or words[0] in _PHYSICIAN_TITLES or words[-1] in _PHYSICIAN_TITLES:
+        return None
+    return value
+
+
+def match_patient_fields(text: str) -> Dict[str, Optional[str]]:
+    fields = {"patient": match_patient_name(text)}
+    for field, pattern in _FIELD_PATTERNS.items():
+        if field == "patient":
+            continue
+        match = pattern.search(text)
+        fields[field] = match.group("value").strip() if match else None
+
+    for field in ("collection_date", "date_of_birth"):
+        parsed = _parse_date(fields[field]) if fields[field] else None
+        fields[field] = parsed.isoformat() if parsed else None
+
+    if not fields["age"] and fields["date_of_birth"] and fields["collection_date"]:
+        born, collected = date.fromisoformat(fields["date_of_birth"]), date.fromisoformat(fields["collection_date"])
+        fields["age"] = str(collected.year - born.year - ((collected.month, collected.day) < (born.month, born.day)))
+    return fields
+
+
+def parse_lab_pdf_text(page_texts: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Read a lab results PDF from its text layer (see extract_pdf_page_texts) without calling Gemini.
+
+    Returns the entities of the ai/gemini_pdf.py prompt, in the same shape as the Gemini
+    extraction, when the patient's name, sex and collection date and at least
+    MIN_TEXT_BIOMARKERS results with units are found, and every analyte the text names
+    has a parsed value. Returns None for scanned or unfamiliar documents, or when some
+    result lines are laid out in a way the parser does not read, so the caller can fall
+    back to Gemini instead of storing a partial report.
+    """
+    text = "\n".join(page_texts)
+    if not text.strip():
+        return None
+
+    lines = text.splitlines()
+    results = match_result_lines(lines)
+    if len(results) < MIN_TEXT_BIOMARKERS:
+        return None
+    if any(key not in results for line in lines for key in find_line_analytes(line)):
+        return None
+
+    fields = match_patient_fields(text)
+    if not fields["patient"] or not fields["sex"] or not fields["collection_date"] or not fields["age"]:
+        return None
+    return {**fields, **results}
@@ -1,15 +1,18 @@
-import json
+import asyncio
+from typing import List
 
 from fastapi import APIRouter, Depends, File, UploadFile
 
-from ai.gemini_csv import gemini_csv_extractor
-from ai.gemini_pdf import gemini_pdf_extractor
 from auth.token import get_current_doctor_id
+from config.env_config import settings
 from models.doctor_models import DoctorId
 from models.patient_models import GenerateReport
 from modules.patients.patient_service import PatientService
+from modules.patients.utils.file_utils import calculate_file_hash
 from utils.api_response import APIResponse, error_response, success_response
 from utils.helpers import serialize_firestore_data
+from utils.rendered_report_cache import rendered_report_cache_stats
+from utils.report_rendering import page_cache
 from queries.patient_queries import get_patient_by_id
 
 patients_router = APIRouter(prefix="/patients", tags=["patients"])
@@ -32,15 +35,11 @@ async def upload_report(
         print("uploading lab results for patient:....", patient_id)
         file_content = await file.read()
 
-        raw_response = gemini_pdf_extractor(file_content)
-        # print("raw_response:....", raw_response)
+        # Hash first, so a duplicate is rejected and a re-upload reuses its extraction without calling Gemini
+        file_hash = calculate_file_hash(file_content)
+        await patient_service.check_new_blood_work_file(patient_id, doctor_id.id, file_hash)
+        response = await patient_service.extract_blood_work_results(file_content, file_hash)
 
-        # Remove the triple backticks and "json" if they exist
-        if raw_response.startswith("```json") and raw_response.endswith("```"):
-            raw_response = raw_response[7:-3].strip()
-
-        # Parse the JSON response
-        response = json.loads(raw_response)
         # Process and store lab results using the service with file content and name for duplicate detection
         # Fetch patient info to get the full name
         patient = await get_patient_by_id(patient_id)
@@ -83,10 +82,65 @@ async def upload_report(
                 status_code=409,
             )
         return error_response(message=str(e), status_code=400)
+    except asyncio.TimeoutError:
+        return error_response(message="Extracting the file results timed out. Please try again.", status_code=504)
     except Exception as e:
         return error_response(message=f"Error processing file: {str(e)}", status_code=500)
 
 
+@patients_router.post("/upload/{patient_id}/blood_work/batch", response_model=APIResponse)
+async def upload_reports_batch(
+    patient_id: str,
+    files: List[UploadFile] = File(...),
+    doctor_id: DoctorId = Depends(get_current_doctor_id),
+    force_upload: bool = False,
+):
+    """
+    Upload many lab result PDFs for a patient at once.
+    Files already uploaded for the patient, or repeated in the batch, are skipped; the others
+    are extracted concurrently and all new reports are stored in a single update.
+    Returns the updated patient and the outcome of every file.
+    """
+    try:
+        print(f"uploading {len(files)} lab results for patient:....", patient_id)
+        if not files:
+            return error_response(message="No files were uploaded", status_code=400)
+        if len(files) > settings.BLOOD_WORK_BATCH_MAX_FILES:
+            return error_response(
+                message=f"At most {settings.BLOOD_WORK_BATCH_MAX_FILES} files can be uploaded at once", status_code=400
+            )
+
+        # Fetch the patient before any extraction, so an unknown patient costs no Gemini calls
+        patient = await get_patient_by_id(patient_id)
+        if not patient:
+            return error_response(message="Patient not found", status_code=404)
+        patient_full_name = f"{patient.firstName} {patient.lastName}"
+
+        file_contents = await asyncio.gather(*(file.read() for file in files))
+        result = await patient_service.add_patient_blood_work_reports_batch(
+            patient_id=patient_id,
+            doctor_id=doctor_id.id,
+            files=[(file.filename, file_content) for file, file_content in zip(files, file_contents)],
+            patient_full_name=patient_full_name,
+            force_upload=force_upload,
+        )
+
+        uploaded = sum(1 for file_result in result["files"] if file_result["status"] == "uploaded")
+        updated_patient = result["patient"]
+        final_response = {
+            "patient": serialize_firestore_data(updated_patient.safe_dump()) if updated_patient else None,
+            "files": result["files"],
+        }
+        return success_response(
+            data=final_response, message=f"{uploaded} of {len(files)} blood work reports uploaded", status_code=200
+        )
+
+    except ValueError as e:
+        return error_response(message=str(e), status_code=400)
+    except Exception as e:
+        return error_response(message=f"Error processing files: {str(e)}", status_code=500)
+
+
 @patients_router.post("/upload/{patient_id}/gene_results", response_model=APIResponse)
 async def upload_gene_results(
     patient_id: str,
@@ -102,15 +156,9 @@ async def upload_gene_results(
         print("uploading gene results for patient:....", patient_id)
         file_content = await file.read()
 
-        raw_response = gemini_csv_extractor(file_content)
-        print("raw gene response:....", raw_response)
-
-        # Remove the triple backticks and "json" if they exist
-        if raw_response.startswith("```json") and raw_response.endswith("```"):
-            raw_response = raw_response[7:-3].strip()
-
-        # Parse the JSON response
-        response = json.loads(raw_response)
+        file_hash = calculate_file_hash(file_content)
+        await patient_service.check_new_gene_results_file(patient_id, doctor_id.id, file_hash)
+        response = await patient_service.extract_gene_results(file_content, file_hash)
 
         # Process and store gene results using the service with file content and name for duplicate detection
         updated_patient = await patient_service.add_patient_gene_results_report(
@@ -134,6 +182,8 @@ async def upload_gene_results(
                 status_code=409,
             )
         return error_response(message=str(e), status_code=400)
+    except asyncio.TimeoutError:
+        return error_response(message="Extracting the file results timed out. Please try again.", status_code=504)
     except Exception as e:
         return error_response(message=f"Error processing file: {str(e)}", status_code=500)
 
@@ -152,3 +202,17 @@ async def generate_pdf_report(
         return success_response(message="Report generated successfully", status_code=200)
     except Exception as e:
         return error_response(message=f"Error generating report: {str(e)}", status_code=500)
+
+
+@patients_router.get("/generate_report/cache_stats", response_model=APIResponse)
+async def get_report_cache_stats(
+    doctor_id: DoctorId = Depends(get_current_doctor_id),
+):
+    """
+    Hit and miss counters of the rendered report and page caches for this server instance.
+    """
+    return success_response(
+        data={"reports": rendered_report_cache_stats.as_dict(), "pages": page_cache.as_dict()},
+        message="Report cache stats fetched successfully",
+        status_code=200,
+    )
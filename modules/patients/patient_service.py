@@ -1,30 +1,60 @@
-import io
-from typing import Any, Dict
+import asyncio
+from typing import Any, Dict, List, Tuple
 
-from PyPDF2 import PdfMerger
-
-from config.cloud_storage import upload_blob
+from ai.gemini_csv import PROMPT_VERSION as CSV_PROMPT_VERSION, gemini_csv_extractor_async
+from ai.gemini_client import validate_json_response
+from ai.gemini_pdf import (
+    PROMPT_VERSION as PDF_PROMPT_VERSION,
+    RESPONSE_SCHEMA as PDF_RESPONSE_SCHEMA,
+    gemini_pdf_extractor_async,
+    normalize_lab_numbers,
+)
+from config.cloud_storage import get_blob_generation_async, upload_blob_async
+from config.env_config import settings
 from engines.biomarker_engine import evaluate_biomarkers_and_group
 from female_report.short_report.generate_female_short_report import (
-    generate_female_short_report,
+    build_female_short_report_pages,
 )
 from male_report.short_report.generate_male_short_report import (
-    generate_male_short_report,
+    build_male_short_report_pages,
 )
 from models.patient_models import Patient
 from modules.patients.helpers.date_helpers import parse_collection_date
+from modules.patients.helpers.gene_csv_parser import parse_gene_results_csv
+from modules.patients.helpers.lab_pdf_text_parser import (
+    extract_pdf_page_texts,
+    merge_page_group_results,
+    parse_lab_pdf_text,
+    select_result_page_groups,
+)
 from modules.patients.mappers import bloodwork_results_mapper
 from modules.patients.mappers.bloodwork_results_mapper import BloodworkResultsMapper
 from modules.patients.mappers.gene_results_mapper import GeneResultsMapper
 from modules.patients.utils.file_utils import calculate_file_hash
+from utils.extraction_cache import extraction_cache_stats, extraction_source_stats
 from utils.helpers import is_name_match
+from utils.rendered_report_cache import (
+    get_report_render_key,
+    get_report_template_version,
+    is_rendered_report_current,
+    rendered_report_cache_stats,
+)
+from utils.report_rendering import merge_pdf_buffers, page_cache, render_pages
+from queries.extraction_queries import get_cached_extraction, set_cached_extraction
 from queries.patient_queries import (
+    BLOOD_WORK_FILE,
+    DUPLICATE_FILE_MESSAGE,
+    add_blood_work_report_dicts_to_patient,
     add_blood_work_reports_to_patient,
     add_gene_result_reports_to_patient,
+    build_blood_work_report_dict,
     check_duplicate_blood_work_file_hash,
     check_duplicate_gene_result_file_hash,
     get_patient_latest_blood_work_report,
+    get_uploaded_file_hashes,
 )
+from queries.rendered_report_queries import get_rendered_report, set_rendered_report
+from queries.report_catalogue_queries import add_report_to_catalogue
 
 
 class PatientService:
@@ -32,18 +62,120 @@ class PatientService:
         self.bloodwork_mapper = BloodworkResultsMapper()
         self.gene_mapper = GeneResultsMapper()
 
-    async def add_patient_blood_work_report(
-        self, patient_id: str, doctor_id: str, raw_response: Dict[str, Any], file_content: bytes, file_name: str, patient_full_name: str, force_upload: bool = False
-    ) -> Any:
-        # Calculate file hash for duplicate detection
-        file_hash = calculate_file_hash(file_content)
+    async def _extract_with_cache(
+        self, file_type: str, extractor_name: str, extractor, prompt_version: str, file_content: bytes, file_hash: str
+    ) -> Dict[str, Any]:
+        """
+        Run a Gemini extractor on a file, reusing the stored result when the same file was
+        already extracted with the same prompt version.
+        """
+        try:
+            cached = await get_cached_extraction(file_hash, prompt_version)
+        except Exception as e:
+            print(f"Error reading extraction cache: {str(e)}")
+            cached = None
+        extraction_cache_stats.record(hit=cached is not None)
+        if cached is not None:
+            print(f"Reusing the {extractor_name} extraction of file {file_hash[:12]}.")
+            extraction_source_stats.record(file_type, "cache")
+            return cached
+
+        response = await extractor(file_content)
+        extraction_source_stats.record(file_type, "gemini")
+
+        try:
+            await set_cached_extraction(file_hash, prompt_version, extractor_name, response)
+        except Exception as e:
+            print(f"Error writing extraction cache: {str(e)}")
+        return response
+
+    async def _extract_lab_pdf_with_gemini(self, file_content: bytes, page_texts: List[str]) -> Dict[str, Any]:
+        """
+        Send only the result pages of a lab PDF to Gemini, in parallel calls of at most
+        GEMINI_PDF_PAGES_PER_CALL pages, and merge the results in page order.
+        """
+        selection = await asyncio.to_thread(
+            select_result_page_groups, file_content, page_texts, settings.GEMINI_PDF_PAGES_PER_CALL
+        )
+        if selection is None:
+            extraction_source_stats.record_pages(len(page_texts), len(page_texts))
+            return await gemini_pdf_extractor_async(file_content)
+
+        selected_pages, page_groups = selection
+        extraction_source_stats.record_pages(len(page_texts), len(selected_pages))
+        print(f"Sending {len(selected_pages)} of {len(page_texts)} pages to Gemini in {len(page_groups)} calls.")
+        responses = await asyncio.gather(*(gemini_pdf_extractor_async(group) for group in page_groups))
+        return merge_page_group_results(responses)
+
+    async def extract_blood_work_results(self, file_content: bytes, file_hash: str) -> Dict[str, Any]:
+        """
+        Extract the lab results of a blood work PDF, reading them from its text layer when it
+        has one that names enough results, and calling Gemini only for the others.
+        """
+        try:
+            page_texts = await asyncio.to_thread(extract_pdf_page_texts, file_content)
+        except Exception as e:
+            print(f"Error reading PDF text layer: {str(e)}")
+            page_texts = []
 
-        # Check for duplicate file
+        response = parse_lab_pdf_text(page_texts)
+        if response is not None:
+            try:
+                response = normalize_lab_numbers(validate_json_response(response, PDF_RESPONSE_SCHEMA))
+            except ValueError as e:
+                print(f"Discarding the text layer results of file {file_hash[:12]}: {str(e)}")
+                response = None
+        if response is not None:
+            print(f"Read blood work file {file_hash[:12]} from its text layer without Gemini.")
+            extraction_source_stats.record("blood_work", "local")
+            return response
 
-        is_duplicate = await check_duplicate_blood_work_file_hash(patient_id, doctor_id, file_hash)
-        if is_duplicate:
-            raise ValueError("This file has already been uploaded for this patient.")
-    
+        return await self._extract_with_cache(
+            "blood_work",
+            "gemini_pdf",
+            lambda content: self._extract_lab_pdf_with_gemini(content, page_texts),
+            PDF_PROMPT_VERSION,
+            file_content,
+            file_hash,
+        )
+
+    async def extract_gene_results(self, file_content: bytes, file_hash: str) -> Dict[str, Any]:
+        """
+        Extract the genotypes of a gene results CSV, reading known lab layouts locally and
+        calling Gemini only for the others.
+        """
+        response = parse_gene_results_csv(file_content)
+        if response is not None:
+            print(f"Read gene results file {file_hash[:12]} without Gemini.")
+            extraction_source_stats.record("gene_results", "local")
+            return response
+
+        return await self._extract_with_cache(
+            "gene_results", "gemini_csv", gemini_csv_extractor_async, CSV_PROMPT_VERSION, file_content, file_hash
+        )
+
+    async def check_new_blood_work_file(self, patient_id: str, doctor_id: str, file_hash: str) -> None:
+        """Reject a blood work file the patient already has, before paying for its extraction."""
+        if await check_duplicate_blood_work_file_hash(patient_id, doctor_id, file_hash):
+            raise ValueError(DUPLICATE_FILE_MESSAGE)
+
+    async def check_new_gene_results_file(self, patient_id: str, doctor_id: str, file_hash: str) -> None:
+        """Reject a gene results file the patient already has, before paying for its extraction."""
+        if await check_duplicate_gene_result_file_hash(patient_id, doctor_id, file_hash):
+            raise ValueError(DUPLICATE_FILE_MESSAGE)
+
+    def build_blood_work_report(
+        self,
+        raw_response: Dict[str, Any],
+        file_hash: str,
+        file_name: str,
+        patient_full_name: str,
+        force_upload: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Map, name-check and evaluate an extracted lab report. Returns the report as stored on
+        the patient, or a name_mismatch error when the report names someone else.
+        """
         # Map raw response to blood work report model
         blood_work = self.bloodwork_mapper.map_to_bloodwork_results(raw_response)
 
@@ -71,21 +203,129 @@ class PatientService:
         parsed_collection_date = parse_collection_date(blood_work.collectionDate) if blood_work.collectionDate else None
         parsed_dateOfBirth = parse_collection_date(dateOfBirth) if dateOfBirth else None
 
+        return build_blood_work_report_dict(
+            sex, age, parsed_dateOfBirth, parsed_collection_date, grouped_results, file_hash, file_name
+        )
+
+    async def add_patient_blood_work_report(
+        self, patient_id: str, doctor_id: str, raw_response: Dict[str, Any], file_content: bytes, file_name: str, patient_full_name: str, force_upload: bool = False
+    ) -> Any:
+        # Calculate file hash for duplicate detection
+        file_hash = calculate_file_hash(file_content)
+
+        # Check again for a duplicate file uploaded while this one was being extracted
+        await self.check_new_blood_work_file(patient_id, doctor_id, file_hash)
+
+        report = self.build_blood_work_report(raw_response, file_hash, file_name, patient_full_name, force_upload)
+        if report.get("error_type") == "name_mismatch":
+            return report
+
         # Store blood work report with file hash and name
         updated_patient = await add_blood_work_reports_to_patient(
             patient_id,
             doctor_id,
-            sex,
-            age,
-            parsed_dateOfBirth,
-            parsed_collection_date,
-            grouped_results,
+            report["sex"],
+            report["age"],
+            report["dateOfBirth"],
+            report["reportDate"],
+            report["bloodWorkBioMarkerGroup"],
             file_hash,
             file_name,
         )
 
         return updated_patient
 
+    async def add_patient_blood_work_reports_batch(
+        self,
+        patient_id: str,
+        doctor_id: str,
+        files: List[Tuple[str, bytes]],
+        patient_full_name: str,
+        force_upload: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Extract many lab PDFs of one patient and store every new report in a single write.
+
+        files is a list of (file_name, file_content) pairs. Files repeated within the batch or
+        already uploaded for the patient are skipped before extraction, the others are
+        extracted BLOOD_WORK_BATCH_CONCURRENCY at a time (Gemini calls stay bound by the
+        shared limiter), and a file that fails or names someone else does not stop the rest.
+        Returns the updated patient (None when nothing was added) and a status per file.
+        """
+        file_hashes = [calculate_file_hash(file_content) for _, file_content in files]
+        results = [
+            {"fileName": file_name, "fileHash": file_hash} for (file_name, _), file_hash in zip(files, file_hashes)
+        ]
+
+        # Keep the first file of each content hash
+        first_positions: Dict[str, int] = {}
+        for position, file_hash in enumerate(file_hashes):
+            if file_hash in first_positions:
+                results[position].update(
+                    status="duplicate", message=f"Same file as '{files[first_positions[file_hash]][0]}' in this batch."
+                )
+            else:
+                first_positions[file_hash] = position
+
+        uploaded_hashes = await get_uploaded_file_hashes(patient_id, doctor_id, BLOOD_WORK_FILE, list(first_positions))
+        pending = []
+        for file_hash, position in first_positions.items():
+            if file_hash in uploaded_hashes:
+                results[position].update(status="duplicate", message=DUPLICATE_FILE_MESSAGE)
+            else:
+                pending.append(position)
+
+        semaphore = asyncio.Semaphore(settings.BLOOD_WORK_BATCH_CONCURRENCY)
+        reports: Dict[int, Dict[str, Any]] = {}
+
+        async def process_file(position: int) -> None:
+            file_name, file_content = files[position]
+            async with semaphore:
+                try:
+                    raw_response = await self.extract_blood_work_results(file_content, file_hashes[position])
+                    report = self.build_blood_work_report(
+                        raw_response, file_hashes[position], file_name, patient_full_name, force_upload
+                    )
+                except asyncio.TimeoutError:
+                    results[position].update(status="error", message="Extracting the file results timed out.")
+                    return
+                except Exception as e:
+                    print(f"Error processing batch file {file_name}: {str(e)}")
+                    results[position].update(status="error", message=f"Error processing file: {str(e)}")
+                    return
+
+            if report.get("error_type") == "name_mismatch":
+                results[position].update(
+                    status="name_mismatch", message=report["message"], extracted_name=report["extracted_name"]
+                )
+                return
+            reports[position] = report
+            results[position].update(status="uploaded", message="Blood work report uploaded and processed successfully")
+
+        await asyncio.gather(*(process_file(position) for position in pending))
+
+        updated_patient = None
+        if reports:
+            # Reports are appended in the order the files were given
+            positions = sorted(reports)
+            try:
+                updated_patient, added_reports = await add_blood_work_report_dicts_to_patient(
+                    patient_id, doctor_id, [reports[position] for position in positions]
+                )
+            except Exception as e:
+                # Report the failed save per file instead of losing every file's outcome
+                print(f"Error saving batch blood work reports: {str(e)}")
+                for position in positions:
+                    results[position].update(status="error", message=f"Error saving report: {str(e)}")
+                return {"patient": None, "files": results}
+
+            added_hashes = {report["fileHash"] for report in added_reports}
+            for position in positions:
+                if file_hashes[position] not in added_hashes:
+                    # Uploaded by another request while this batch was being extracted
+                    results[position].update(status="duplicate", message=DUPLICATE_FILE_MESSAGE)
+        return {"patient": updated_patient, "files": results}
+
     async def add_patient_gene_results_report(
         self,
         patient_id: str,
@@ -98,10 +338,8 @@ class PatientService:
         # Calculate file hash for duplicate detection
         file_hash = calculate_file_hash(file_content)
 
-        # Check for duplicate file
-        is_duplicate = await check_duplicate_gene_result_file_hash(patient_id, doctor_id, file_hash)
-        if is_duplicate:
-            raise ValueError("This file has already been uploaded for this patient.")
+        # Check again for a duplicate file uploaded while this one was being extracted
+        await self.check_new_gene_results_file(patient_id, doctor_id, file_hash)
 
         gene_result_report = self.gene_mapper.map_to_gene_result_report(raw_response, collection_date)
 
@@ -122,16 +360,35 @@ class PatientService:
 
         sex_value = latest_blood_work_report.sex
 
+        report_date = getattr(latest_blood_work_report, 'reportDate', '')
+        bio_marker_str = '_'.join(request_data.get('selectedBioMarkerGroups', []))
+        filename = f"{request_data.get('firstName', '')}_{request_data.get('lastName', '')}_{request_data.get('id', '')}_{report_date}_{bio_marker_str}_report_.pdf"
+
+        # Skip rendering and uploading when the blob already holds a PDF built from the same inputs
+        render_key = get_report_render_key(request_data, latest_blood_work_report.bloodWorkBioMarkerGroup)
+        try:
+            cache_entry, blob_generation = await asyncio.gather(
+                get_rendered_report(filename), get_blob_generation_async(filename)
+            )
+        except Exception as e:
+            print(f"Error reading rendered report cache: {str(e)}")
+            cache_entry, blob_generation = None, None
+        if is_rendered_report_current(cache_entry, render_key, blob_generation):
+            rendered_report_cache_stats.record(hit=True)
+            print(f"Report {filename} is unchanged, reusing the uploaded PDF.")
+            return filename
+        rendered_report_cache_stats.record(hit=False)
+
         selectedBioMarkerGroups = request_data["selectedBioMarkerGroups"]
-        # Generate report buffers based on patient sex
+        # Pick the report pages based on patient sex
         if sex_value in ["f", "female"]:
-            buffers = generate_female_short_report(
+            pages = build_female_short_report_pages(
                 request_data,
                 latest_blood_work_report.bloodWorkBioMarkerGroup,
                 selectedBioMarkerGroups,
             )
         elif sex_value in ["m", "male"]:
-            buffers = generate_male_short_report(
+            pages = build_male_short_report_pages(
                 request_data,
                 latest_blood_work_report.bloodWorkBioMarkerGroup,
                 selectedBioMarkerGroups,
@@ -139,21 +396,26 @@ class PatientService:
         else:
             raise ValueError(f"Unsupported sex value: {sex_value}")
 
-        # Merge all page buffers
-        merger = PdfMerger()
-        for buffer in buffers:
-            merger.append(buffer)
-
-        final_buffer = io.BytesIO()
-        merger.write(final_buffer)
-        merger.close()
+        # Render the pages whose inputs changed in the rendering pool, then merge off the event loop
+        buffers = await render_pages(pages, cache=page_cache)
+        final_buffer = await asyncio.to_thread(merge_pdf_buffers, buffers)
 
         # Upload the merged PDF
-        final_buffer.seek(0)
-        report_date = getattr(latest_blood_work_report, 'reportDate', '')
-        bio_marker_str = '_'.join(request_data.get('selectedBioMarkerGroups', []))
-        filename = f"{request_data.get('firstName', '')}_{request_data.get('lastName', '')}_{request_data.get('id', '')}_{report_date}_{bio_marker_str}_report_.pdf"
-        
-        upload_blob(final_buffer, filename)
+        generation = await upload_blob_async(final_buffer, filename)
+
+        try:
+            # A concurrent request may have uploaded a different PDF under the same name since;
+            # only record the render key if the blob is still the object uploaded here
+            if await get_blob_generation_async(filename) == generation:
+                await set_rendered_report(filename, render_key, get_report_template_version(), generation)
+            else:
+                print(f"Report {filename} was overwritten during upload, not caching it.")
+        except Exception as e:
+            print(f"Error writing rendered report cache: {str(e)}")
+
+        try:
+            await add_report_to_catalogue(filename, patient_id, report_date)
+        except Exception as e:
+            print(f"Error writing report catalogue: {str(e)}")
 
         return filename
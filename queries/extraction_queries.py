@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from config.config import extractions_collection
+from utils.extraction_cache import get_extraction_doc_id
+
+
+async def get_cached_extraction(file_hash: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+    """Fetch the extraction stored for a file and prompt version. Returns None if not found."""
+    doc = await extractions_collection.document(get_extraction_doc_id(file_hash, prompt_version)).get()
+    if doc.exists:
+        return doc.to_dict().get("result")
+    return None
+
+
+async def set_cached_extraction(file_hash: str, prompt_version: str, extractor: str, result: Dict[str, Any]):
+    """Store the parsed extraction of a file, keyed by its content hash and the prompt version."""
+    data = {
+        "fileHash": file_hash,
+        "promptVersion": prompt_version,
+        "extractor": extractor,
+        "result": result,
+        "extractedAt": datetime.now(timezone.utc),
+    }
+    await extractions_collection.document(get_extraction_doc_id(file_hash, prompt_version)).set(data)
+    return data
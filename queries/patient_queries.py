@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from google.api_core.exceptions import FailedPrecondition
 from google.cloud.firestore import FieldFilter
 
-from config.config import patients_collection
+from config.config import db, patients_collection, uploaded_files_collection
+from config.env_config import settings
 from models.patient_models import (
     BloodWorkReport,
     GeneResultReport,
@@ -16,6 +18,17 @@ from models.patient_models import (
 
 patient_ref = patients_collection
 
+# Report types of the uploaded file index
+BLOOD_WORK_FILE = "blood_work"
+GENE_RESULTS_FILE = "gene_results"
+# Error raised for a report file the patient already has; routes answer it with 409
+DUPLICATE_FILE_MESSAGE = "This file has already been uploaded for this patient."
+# Patient field holding the reports of each type
+REPORT_FIELDS = {BLOOD_WORK_FILE: "bloodWorkReports", GENE_RESULTS_FILE: "geneResultReports"}
+
+# Attempts at a conditional append before giving up on a patient that keeps changing
+MAX_APPEND_ATTEMPTS = 3
+
 
 async def insert_patient(patient: PatientCreate, doctor_id: str) -> Patient:
     patient_data = patient.model_dump()
@@ -118,9 +131,7 @@ async def add_gene_results_to_patient(
     raise ValueError("Patient not found")
 
 
-async def add_blood_work_reports_to_patient(
-    patient_id: str,
-    doctor_id: str,
+def build_blood_work_report_dict(
     sex,
     age,
     dateOfBirth,
@@ -128,82 +139,128 @@ async def add_blood_work_reports_to_patient(
     blood_work_report,
     file_hash: str = None,
     file_name: str = None,
-) -> Patient:
-    query = patients_collection.where("id", "==", patient_id).where("doctor_id", "==", doctor_id)
-    patient_refs = query.stream()
-    async for patient_ref in patient_refs:
-        patient_ref = patient_ref.reference
-        patient_data = await patient_ref.get()
-        patient_dict = patient_data.to_dict()
+) -> dict:
+    """A blood work report as stored in the patient's bloodWorkReports."""
+    return {
+        "sex": sex,
+        "age": age,
+        "createdAt": datetime.now(),
+        "reportDate": reportDate,
+        "dateOfBirth": dateOfBirth,
+        "bloodWorkBioMarkerGroup": blood_work_report,
+        "fileHash": file_hash,
+        "fileName": file_name,
+    }
 
-        # Get existing blood work reports or initialize an empty list
-        existing_blood_work_reports = patient_dict.get("bloodWorkReports", [])
-        if existing_blood_work_reports is None:
-            existing_blood_work_reports = []
-
-        # Append new blood work reports
-        # Convert the report to a dictionary and ensure it follows the BloodWorkReport structure
-
-        report_dict = {
-            "sex": sex,
-            "age": age,
-            "createdAt": datetime.now(),
-            "reportDate": reportDate,
-            "dateOfBirth": dateOfBirth,
-            "bloodWorkBioMarkerGroup": blood_work_report,
-            "fileHash": file_hash,
-            "fileName": file_name,
-        }
-        existing_blood_work_reports.append(report_dict)
 
-        # Update the patient document with the new blood work reports
-        await patient_ref.update({"bloodWorkReports": existing_blood_work_reports})
+async def append_reports_to_patient(
+    patient_id: str, doctor_id: str, report_type: str, report_dicts: list
+) -> Tuple[Patient, list]:
+    """
+    Append reports of one type to a patient with one read and one batched write.
 
-        # Fetch the updated patient document
-        updated_doc = await patient_ref.get()
-        updated_doc_dict = updated_doc.to_dict()
-        updated_patient = Patient(**updated_doc_dict)
-        return updated_patient
+    The file hash of every report is indexed in the same commit as the patient update.
+    Reports whose file the patient already has, in the uploaded file index or among the
+    stored reports, are dropped. The write only applies if the patient has not changed
+    since it was read; when it has (an edit or another upload in the meantime), the
+    patient is read again and the append retried, so a report is never lost while its
+    index entry stays behind.
 
-    raise ValueError("Patient Not found")
+    Returns the updated patient and the reports that were added.
+    """
+    field = REPORT_FIELDS[report_type]
+    query = patients_collection.where("id", "==", patient_id).where("doctor_id", "==", doctor_id)
+    file_hashes = [report_dict["fileHash"] for report_dict in report_dicts if report_dict.get("fileHash")]
+    for _ in range(MAX_APPEND_ATTEMPTS):
+        patient_doc = None
+        async for doc in query.limit(1).stream():
+            patient_doc = doc
+        if patient_doc is None:
+            raise ValueError("Patient Not found")
+
+        existing_reports = (patient_doc.to_dict() or {}).get(field) or []
+        uploaded_hashes = await get_indexed_file_hashes(patient_id, doctor_id, report_type, file_hashes)
+        uploaded_hashes.update(report.get("fileHash") for report in existing_reports if report.get("fileHash"))
+        new_reports = [
+            report_dict for report_dict in report_dicts if report_dict.get("fileHash") not in uploaded_hashes
+        ]
+        if not new_reports:
+            return Patient(**patient_doc.to_dict()), []
+
+        batch = db.batch()
+        batch.update(
+            patient_doc.reference,
+            {field: existing_reports + new_reports},
+            option=db.write_option(last_update_time=patient_doc.update_time),
+        )
+        for report_dict in new_reports:
+            if report_dict.get("fileHash"):
+                set_uploaded_file(
+                    batch, patient_id, doctor_id, report_type, report_dict["fileHash"], report_dict.get("fileName")
+                )
+        try:
+            await batch.commit()
+        except FailedPrecondition:
+            print(f"Patient {patient_id} changed while appending {field}, retrying")
+            continue
+
+        updated_doc = await patient_doc.reference.get()
+        return Patient(**updated_doc.to_dict()), new_reports
+
+    raise ValueError("The patient kept changing while the reports were being saved. Please try again.")
 
 
-async def add_gene_result_reports_to_patient(
+async def add_blood_work_reports_to_patient(
     patient_id: str,
     doctor_id: str,
-    gene_result_report: GeneResultReport,
+    sex,
+    age,
+    dateOfBirth,
+    reportDate,
+    blood_work_report,
     file_hash: str = None,
     file_name: str = None,
 ) -> Patient:
-    query = patients_collection.where("id", "==", patient_id).where("doctor_id", "==", doctor_id)
-    patient_refs = query.stream()
-    async for patient_ref in patient_refs:
-        patient_ref = patient_ref.reference
-        patient_data = await patient_ref.get()
-        patient_dict = patient_data.to_dict()
-
-        # Get existing gene result reports or initialize an empty list
-        existing_gene_result_reports = patient_dict.get("geneResultReports", [])
-        if existing_gene_result_reports is None:
-            existing_gene_result_reports = []
-
-        # Append new gene result report
-        # Convert the report to a dictionary and add file hash and name
-        report_dict = gene_result_report.model_dump()
-        report_dict["fileHash"] = file_hash
-        report_dict["fileName"] = file_name
-        existing_gene_result_reports.append(report_dict)
+    # Convert the report to a dictionary and ensure it follows the BloodWorkReport structure
+    report_dict = build_blood_work_report_dict(
+        sex, age, dateOfBirth, reportDate, blood_work_report, file_hash, file_name
+    )
+    updated_patient, added_reports = await append_reports_to_patient(
+        patient_id, doctor_id, BLOOD_WORK_FILE, [report_dict]
+    )
+    if not added_reports:
+        raise ValueError(DUPLICATE_FILE_MESSAGE)
+    return updated_patient
+
+
+async def add_blood_work_report_dicts_to_patient(
+    patient_id: str, doctor_id: str, report_dicts: list
+) -> Tuple[Patient, list]:
+    """
+    Append many blood work reports, built with build_blood_work_report_dict, to a patient
+    in a single write. Returns the updated patient and the reports that were added;
+    files uploaded meanwhile are left out.
+    """
+    return await append_reports_to_patient(patient_id, doctor_id, BLOOD_WORK_FILE, report_dicts)
 
-        # Update the patient document with the new gene result reports
-        await patient_ref.update({"geneResultReports": existing_gene_result_reports})
 
-        # Fetch the updated patient document
-        updated_doc = await patient_ref.get()
-        updated_doc_dict = updated_doc.to_dict()
-        updated_patient = Patient(**updated_doc_dict)
-        return updated_patient
-
-    raise ValueError("Patient not found")
+async def add_gene_result_reports_to_patient(
+    patient_id: str,
+    doctor_id: str,
+    gene_result_report: GeneResultReport,
+    file_hash: str = None,
+    file_name: str = None,
+) -> Patient:
+    # Convert the report to a dictionary and add file hash and name
+    report_dict = gene_result_report.model_dump()
+    report_dict["fileHash"] = file_hash
+    report_dict["fileName"] = file_name
+    updated_patient, added_reports = await append_reports_to_patient(
+        patient_id, doctor_id, GENE_RESULTS_FILE, [report_dict]
+    )
+    if not added_reports:
+        raise ValueError(DUPLICATE_FILE_MESSAGE)
+    return updated_patient
 
 
 # Starting of the patient loging stream and patient control stream
@@ -483,36 +540,128 @@ async def clear_patient_refresh_token(patient_id: str) -> bool:
         return False
 
 
-async def check_duplicate_blood_work_file_hash(patient_id: str, doctor_id: str, file_hash: str) -> bool:
+def get_uploaded_file_doc_id(patient_id: str, report_type: str, file_hash: str) -> str:
+    """Document id of an uploaded file index entry, so a duplicate check is a single read."""
+    return f"{patient_id}_{report_type}_{file_hash}"
+
+
+def set_uploaded_file(batch, patient_id: str, doctor_id: str, report_type: str, file_hash: str, file_name: str = None):
+    """Add the index entry of an uploaded report file to a write batch."""
+    batch.set(
+        uploaded_files_collection.document(get_uploaded_file_doc_id(patient_id, report_type, file_hash)),
+        {
+            "patientId": patient_id,
+            "doctorId": doctor_id,
+            "reportType": report_type,
+            "fileHash": file_hash,
+            "fileName": file_name,
+            "uploadedAt": datetime.now(),
+        },
+    )
+
+
+async def get_patient_report_file_hashes(patient_id: str, doctor_id: str, report_type: str) -> set:
+    """File hashes stored on the patient's reports of one type, for files the index may not know."""
     query = patients_collection.where("id", "==", patient_id).where("doctor_id", "==", doctor_id)
-    patient_refs = query.stream()
+    async for patient_doc in query.limit(1).stream():
+        reports = (patient_doc.to_dict() or {}).get(REPORT_FIELDS[report_type]) or []
+        return {report["fileHash"] for report in reports if report.get("fileHash")}
+    return set()
 
-    async for patient_ref in patient_refs:
-        patient_data = patient_ref.to_dict()
 
-        # Safely get bloodWorkReports list
-        blood_work_reports = patient_data.get("bloodWorkReports", []) or []
+async def check_duplicate_file_hash(patient_id: str, doctor_id: str, report_type: str, file_hash: str) -> bool:
+    """
+    Whether the patient already has a report of this type uploaded from the same file.
 
-        for report in blood_work_reports:
-            if report.get("fileHash") == file_hash:
-                return True
+    A single index read; while UPLOADED_FILE_INDEX_FALLBACK is on, a file missing from
+    the index is also looked for on the patient, since reports uploaded before the index
+    existed are only indexed by jobs.backfill_uploaded_file_index.
+    """
+    doc = await uploaded_files_collection.document(get_uploaded_file_doc_id(patient_id, report_type, file_hash)).get()
+    if doc.exists:
+        return doc.to_dict().get("doctorId") == doctor_id
+    if not settings.UPLOADED_FILE_INDEX_FALLBACK:
+        return False
+    return file_hash in await get_patient_report_file_hashes(patient_id, doctor_id, report_type)
 
-    return False
+
+async def check_duplicate_blood_work_file_hash(patient_id: str, doctor_id: str, file_hash: str) -> bool:
+    return await check_duplicate_file_hash(patient_id, doctor_id, BLOOD_WORK_FILE, file_hash)
 
 
 async def check_duplicate_gene_result_file_hash(patient_id: str, doctor_id: str, file_hash: str) -> bool:
-    query = patients_collection.where("id", "==", patient_id).where("doctor_id", "==", doctor_id)
-    patient_refs = query.stream()
+    return await check_duplicate_file_hash(patient_id, doctor_id, GENE_RESULTS_FILE, file_hash)
 
-    async for patient_ref in patient_refs:
-        patient_data = patient_ref.to_dict()
-        gene_result_reports = patient_data.get("geneResultReports", []) or []
 
-        for report in gene_result_reports:
-            if report.get("fileHash") == file_hash:
-                return True
+async def get_indexed_file_hashes(patient_id: str, doctor_id: str, report_type: str, file_hashes: list) -> set:
+    """The file hashes among file_hashes the uploaded file index has for the patient, in one read."""
+    refs = [
+        uploaded_files_collection.document(get_uploaded_file_doc_id(patient_id, report_type, file_hash))
+        for file_hash in file_hashes
+    ]
+    indexed = set()
+    if not refs:
+        return indexed
+    async for doc in db.get_all(refs):
+        if doc.exists and doc.to_dict().get("doctorId") == doctor_id:
+            indexed.add(doc.to_dict().get("fileHash"))
+    return indexed
 
-    return False
+
+async def get_uploaded_file_hashes(patient_id: str, doctor_id: str, report_type: str, file_hashes: list) -> set:
+    """
+    The file hashes among file_hashes the patient already has a report of this type for,
+    with the same UPLOADED_FILE_INDEX_FALLBACK as check_duplicate_file_hash.
+    """
+    uploaded = await get_indexed_file_hashes(patient_id, doctor_id, report_type, file_hashes)
+    if settings.UPLOADED_FILE_INDEX_FALLBACK and len(uploaded) < len(set(file_hashes)):
+        uploaded |= set(file_hashes) & await get_patient_report_file_hashes(patient_id, doctor_id, report_type)
+    return uploaded
+
+
+async def set_uploaded_files_batch(entries: list) -> None:
+    """
+    Index many uploaded report files in a single batched commit.
+
+    entries is a list of (patient_id, doctor_id, report_type, file_hash, file_name) tuples.
+    """
+    batch = db.batch()
+    for entry in entries:
+        set_uploaded_file(batch, *entry)
+    await batch.commit()
+
+
+async def get_patients_page(page_size: int, start_after_id: Optional[str] = None) -> list:
+    """
+    Fetch one page of patient document snapshots ordered by document id.
+    Pass the id of the last document of the previous page to continue from it.
+    """
+    query = patients_collection.order_by("__name__").limit(page_size)
+    if start_after_id:
+        last_doc = await patients_collection.document(start_after_id).get()
+        if last_doc.exists:
+            query = query.start_after(last_doc)
+        else:
+            query = query.where("__name__", ">", patients_collection.document(start_after_id))
+    return [doc async for doc in query.stream()]
+
+
+async def update_blood_work_reports_batch(updates: list) -> None:
+    """
+    Write bloodWorkReports for many patients in a single batched commit.
+
+    updates is a list of (patient_snapshot, blood_work_reports) pairs. Each write is
+    conditioned on the document not having changed since the snapshot was read, so a
+    concurrent upload makes the commit fail instead of being overwritten.
+    """
+    batch = db.batch()
+    for patient_doc, blood_work_reports in updates:
+        batch.update(
+            patient_doc.reference,
+            {"bloodWorkReports": blood_work_reports},
+            option=db.write_option(last_update_time=patient_doc.update_time),
+        )
+    await batch.commit()
 
 
 # Medical Form Queries
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+from config.config import rendered_reports_collection
+from utils.rendered_report_cache import get_rendered_report_doc_id
+
+
+async def get_rendered_report(blob_name: str):
+    """
+    Fetch the cache entry for a report blob. Returns None if not found.
+
+    Entries are stored per blob rather than per render key: report blob names are not
+    unique per content, so the entry must always describe what the blob holds right now.
+    """
+    doc = await rendered_reports_collection.document(get_rendered_report_doc_id(blob_name)).get()
+    if doc.exists:
+        return doc.to_dict()
+    return None
+
+
+async def set_rendered_report(blob_name: str, render_key: str, template_version: str, generation: int):
+    """Record the render key of the PDF that was just uploaded as the given generation of a report blob."""
+    data = {
+        "blobName": blob_name,
+        "renderKey": render_key,
+        "generation": generation,
+        "templateVersion": template_version,
+        "renderedAt": datetime.now(timezone.utc),
+    }
+    await rendered_reports_collection.document(get_rendered_report_doc_id(blob_name)).set(data)
+    return data
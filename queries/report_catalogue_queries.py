@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from config.config import db, report_catalogue_collection
+
+# Firestore allows at most 500 writes per batch
+MAX_BATCH_SIZE = 500
+
+
+def get_report_catalogue_doc_id(blob_name: str) -> str:
+    """Firestore document id for the catalogue entry of a report blob."""
+    return hashlib.sha256(blob_name.encode("utf-8")).hexdigest()
+
+
+def build_report_catalogue_entry(
+    blob_name: str, patient_id: str, report_date: Optional[str], report_type: str
+) -> Dict[str, Any]:
+    return {
+        "blobName": blob_name,
+        "patientId": patient_id,
+        "reportDate": report_date,
+        "reportType": report_type,
+        "uploadedAt": datetime.now(timezone.utc),
+    }
+
+
+async def add_report_to_catalogue(
+    blob_name: str, patient_id: str, report_date: Optional[str] = None, report_type: str = "short"
+):
+    """
+    Record an uploaded report blob in the catalogue.
+
+    Entries are keyed by blob name, so uploading the same report again only refreshes
+    its entry.
+    """
+    data = build_report_catalogue_entry(blob_name, patient_id, report_date, report_type)
+    await report_catalogue_collection.document(get_report_catalogue_doc_id(blob_name)).set(data)
+    return data
+
+
+async def add_reports_to_catalogue_batch(entries: List[Dict[str, Any]]) -> None:
+    """Write many catalogue entries, in batched commits of at most MAX_BATCH_SIZE."""
+    for start in range(0, len(entries), MAX_BATCH_SIZE):
+        batch = db.batch()
+        for entry in entries[start : start + MAX_BATCH_SIZE]:
+            batch.set(report_catalogue_collection.document(get_report_catalogue_doc_id(entry["blobName"])), entry)
+        await batch.commit()
+
+
+async def get_patient_catalogued_reports(patient_id: str) -> List[Dict[str, Any]]:
+    """Fetch every catalogued report of a patient with a single indexed query."""
+    query = report_catalogue_collection.where("patientId", "==", patient_id)
+    return [doc.to_dict() async for doc in query.stream()]
@@ -1,5 +1,5 @@
-from typing import List
-import io
+from typing import List, Optional
+import asyncio
 import os
 
 from dotenv import (
@@ -9,15 +9,7 @@ from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
-)
-from fastapi.responses import (
-    StreamingResponse,
-)
-from google.cloud import (
-    storage,
-)
-from PyPDF2 import (
-    PdfMerger,
+    Request,
 )
 
 from ai.rag import (
@@ -40,7 +32,9 @@ from auth.token_patient import (
     decode_patient_password_token_ignore_exp,
 )
 from config.cloud_storage import (
-    upload_blob,
+    REPORTS_BUCKET_NAME,
+    get_bucket,
+    upload_blob_async,
 )
 from config.env_config import settings
 from email_sending.sendgrid_patient import (
@@ -50,7 +44,7 @@ from email_sending.sendgrid_patient import (
     sendgrid_email,
 )
 from male_report.gene_report.generate_gene_report import (
-    generate_gene_report_pages,
+    build_gene_report_pages,
 )
 from models.credentials_models import (
     Credentials,
@@ -95,6 +89,7 @@ from queries.patient_queries import (
     verify_patient_otp,
     update_patient_show_report
 )
+from queries.report_catalogue_queries import add_report_to_catalogue, get_patient_catalogued_reports
 from utils.api_response import APIResponse, error_response, success_response
 from utils.helpers import serialize_firestore_data
 from utils.otp_utils import (
@@ -102,6 +97,8 @@ from utils.otp_utils import (
     get_otp_expiration_time,
     is_otp_valid,
 )
+from utils.report_downloads import send_report_pdf
+from utils.report_rendering import merge_pdf_buffers, render_pages
 
 load_dotenv()
 
@@ -283,30 +280,25 @@ async def generate_gene_pdf_report(
     doctor_id: DoctorId = Depends(get_current_doctor_id),
 ):
     try:
-        merger = PdfMerger()
         report = report_data.model_dump()
         print(
             "report is:",
             report,
         )
 
-        buffers = generate_gene_report_pages(report)
-        # merge all page buffers
-        for (
-            i,
-            buffer,
-        ) in enumerate(buffers):
-            merger.append(buffer)
-
-        final_buffer = io.BytesIO()
-        merger.write(final_buffer)
-        merger.close
-
-        final_buffer.seek(0)
-        upload_blob(
-            final_buffer,
-            f"{report.get('firstName', '')}_{report.get('lastName', '')}_{report.get('id', '')}_gene_report_.pdf",
+        # Render pages in the rendering pool, then merge them off the event loop
+        buffers = await render_pages(build_gene_report_pages(report))
+        final_buffer = await asyncio.to_thread(merge_pdf_buffers, buffers)
+
+        blob_name = (
+            f"{report.get('firstName', '')}_{report.get('lastName', '')}_{report.get('id', '')}_gene_report_.pdf"
         )
+        await upload_blob_async(final_buffer, blob_name)
+
+        try:
+            await add_report_to_catalogue(blob_name, report.get("id", ""), report_type="gene")
+        except Exception as e:
+            print(f"Error writing report catalogue: {str(e)}")
 
         return success_response(message="Gene report generated successfully", status_code=200)
     except Exception as e:
@@ -319,31 +311,19 @@ async def generate_gene_pdf_report(
     response_model=None,
 )
 async def get_patient_gene_pdf_report(
+    request: Request,
     patient_id: str,
     first_name: str,
     last_name: str,
     doctor_id: str = Depends(get_current_doctor_id),
+    download: Optional[str] = None,
 ):
-    storage_client = storage.Client()
-    bucket_name = "my_test_bucket_for_fastapi"
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(f"{first_name}_{last_name}_{patient_id}_gene_report_.pdf")  # Ensure filename matches storage
-
-    if not blob.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Report not found",
-        )
-
-    pdf_buffer = io.BytesIO()
-    blob.download_to_file(pdf_buffer)
-
-    pdf_buffer.seek(0)
-
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={first_name}_{last_name}_{patient_id}_gene_report_.pdf"},
+    bucket = get_bucket(REPORTS_BUCKET_NAME)
+    return await send_report_pdf(
+        bucket,
+        f"{first_name}_{last_name}_{patient_id}_gene_report_.pdf",
+        request,
+        mode=download,
     )
 
 
@@ -353,34 +333,23 @@ async def get_patient_gene_pdf_report(
     response_model=None,
 )
 async def get_patient_pdf_report(
+    request: Request,
     patient_id: str,
     first_name: str,
     last_name: str,
     doctor_id: str = Depends(get_current_doctor_id),
+    download: Optional[str] = None,
 ):
-    storage_client = storage.Client()
-    bucket_name = "my_test_bucket_for_fastapi"
-    bucket = storage_client.bucket(bucket_name)
+    bucket = get_bucket(REPORTS_BUCKET_NAME)
     latest_blood_work_report = await get_patient_latest_blood_work_report(patient_id)
     report_date = getattr(latest_blood_work_report, 'reportDate', '')
     filename = f"{first_name}_{last_name}_{patient_id}_{report_date}_full_report_.pdf"
-    blob = bucket.blob(filename)  # Ensure filename matches storage
-
-    if not blob.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Report not found",
-        )
-
-    pdf_buffer = io.BytesIO()
-    blob.download_to_file(pdf_buffer)
-
-    pdf_buffer.seek(0)
-
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={first_name}_{last_name}_{patient_id}_report_.pdf"},
+    return await send_report_pdf(
+        bucket,
+        filename,
+        request,
+        f"{first_name}_{last_name}_{patient_id}_report_.pdf",
+        mode=download,
     )
 
 @patient_router.get(
@@ -388,30 +357,13 @@ async def get_patient_pdf_report(
     response_model=None,
 )
 async def get_patient_pdf_report(
+    request: Request,
     file_name: str,
+    download: Optional[str] = None,
 ):
     print(file_name)
-    storage_client = storage.Client()
-    bucket_name = "my_test_bucket_for_fastapi"
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(file_name)  # Ensure filename matches storage
-
-    if not blob.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Report not found",
-        )
-
-    pdf_buffer = io.BytesIO()
-    blob.download_to_file(pdf_buffer)
-
-    pdf_buffer.seek(0)
-
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={file_name}"},
-    )
+    bucket = get_bucket(REPORTS_BUCKET_NAME)
+    return await send_report_pdf(bucket, file_name, request, mode=download)
 
 
 
@@ -423,16 +375,18 @@ async def get_all_reports_grouped(
 ):
     """
     Receives patient_id, first_name, last_name as GET params. Returns all report files grouped by reportDate.
+
+    Files come from the report catalogue written at upload time, with one query per request
+    instead of one storage listing per report date.
     """
     try:
-        storage_client = storage.Client()
-        bucket_name = "my_test_bucket_for_fastapi"
-        bucket = storage_client.bucket(bucket_name)
-
         if not patient_id or not first_name or not last_name:
             raise HTTPException(status_code=400, detail="Missing patient_id, first_name, or last_name")
 
-        patient = await get_patient_self(patient_id)
+        patient, catalogued_reports = await asyncio.gather(
+            get_patient_self(patient_id),
+            get_patient_catalogued_reports(patient_id),
+        )
         print(patient)
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
@@ -441,20 +395,21 @@ async def get_all_reports_grouped(
         if hasattr(patient, "bloodWorkReports"):
             blood_work_reports = patient.bloodWorkReports or []
 
-        # Collect all unique report dates
+        # Catalogued files by report date, matching what the per-date storage prefix used to list
+        files_by_date = {}
+        for entry in catalogued_reports:
+            report_date = entry.get("reportDate")
+            if report_date and entry["blobName"].startswith(f"{first_name}_{last_name}_{patient_id}_{report_date}_"):
+                files_by_date.setdefault(report_date, []).append(entry["blobName"])
+
         date_to_files = {}
         for report in blood_work_reports:
             report_date = report.get("reportDate") or (hasattr(report, "reportDate") and getattr(report, "reportDate"))
-            if not report_date:
+            if not report_date or report_date in date_to_files:
                 continue
-            # List all blobs that start with the pattern
-            prefix = f"{first_name}_{last_name}_{patient_id}_{report_date}_"
-            blobs = bucket.list_blobs(prefix=prefix)
-            files = [blob.name for blob in blobs]
+            files = sorted(files_by_date.get(report_date, []))
             if files:
-                if report_date not in date_to_files:
-                    date_to_files[report_date] = {"files": []}
-                date_to_files[report_date]["files"].extend(files)
+                date_to_files[report_date] = {"files": files}
 
         return success_response(
             data=date_to_files,
@@ -610,30 +565,18 @@ async def get_patient_by_id_self(
     response_model=None,
 )
 async def get_patient_pdf_self_report(
+    request: Request,
     first_name: str,
     last_name: str,
     patient_id: PatientId = Depends(get_current_patient_id),
+    download: Optional[str] = None,
 ):
-    storage_client = storage.Client()
-    bucket_name = "my_test_bucket_for_fastapi"
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(f"{first_name}_{last_name}_{patient_id.id}_report_.pdf")  # Ensure filename matches storage
-
-    if not blob.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Report not found",
-        )
-
-    pdf_buffer = io.BytesIO()
-    blob.download_to_file(pdf_buffer)
-
-    pdf_buffer.seek(0)
-
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={first_name}_{last_name}_{patient_id.id}_report_.pdf"},
+    bucket = get_bucket(REPORTS_BUCKET_NAME)
+    return await send_report_pdf(
+        bucket,
+        f"{first_name}_{last_name}_{patient_id.id}_report_.pdf",
+        request,
+        mode=download,
     )
 
 
@@ -643,32 +586,18 @@ async def get_patient_pdf_self_report(
     response_model=None,
 )
 async def get_patient_pdf_self_gene_report(
+    request: Request,
     first_name: str,
     last_name: str,
     patient_id: PatientId = Depends(get_current_patient_id),
+    download: Optional[str] = None,
 ):
-    storage_client = storage.Client()
-    bucket_name = "my_test_bucket_for_fastapi"
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(f"{first_name}_{last_name}_{patient_id.id}_gene_report_.pdf")  # Ensure filename matches storage
-
-    if not blob.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Report not found",
-        )
-
-    pdf_buffer = io.BytesIO()
-    blob.download_to_file(pdf_buffer)
-
-    pdf_buffer.seek(0)
-
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={first_name}_{last_name}_{patient_id.id}_gene_report_.pdf"
-        },
+    bucket = get_bucket(REPORTS_BUCKET_NAME)
+    return await send_report_pdf(
+        bucket,
+        f"{first_name}_{last_name}_{patient_id.id}_gene_report_.pdf",
+        request,
+        mode=download,
     )
 
 
@@ -0,0 +1,28 @@
+import sys
+import types
+
+import pytest
+
+from tests.fakes import FakeFirestore
+
+try:
+    import config.config  # noqa: F401
+except RuntimeError:
+    # No Firestore credentials here: the queries import their collections from a fake
+    # client, and the firestore fixture swaps in a fresh one per test
+    fake_config = types.ModuleType("config.config")
+    fake_config.db = FakeFirestore()
+    fake_config.__getattr__ = fake_config.db.collection
+    sys.modules["config.config"] = fake_config
+
+@pytest.fixture
+def firestore(monkeypatch):
+    """A fresh in-memory Firestore, installed in the patient queries."""
+    import queries.patient_queries as patient_queries
+
+    db = FakeFirestore()
+    monkeypatch.setattr(patient_queries, "db", db)
+    monkeypatch.setattr(patient_queries, "patients_collection", db.collection("patients"))
+    monkeypatch.setattr(patient_queries, "patient_ref", db.collection("patients"))
+    monkeypatch.setattr(patient_queries, "uploaded_files_collection", db.collection("uploaded_files"))
+    return db
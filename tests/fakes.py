@@ -0,0 +1,130 @@
+"""In-memory stand-ins for the parts of the Firestore async client the queries use."""
+
+import copy
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.api_core.exceptions import FailedPrecondition
+
+_versions = itertools.count(1)
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocumentReference", data: Optional[Dict[str, Any]], update_time: Optional[int]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self.update_time = update_time
+        self._data = copy.deepcopy(data)
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+
+class FakeDocumentReference:
+    def __init__(self, collection: "FakeCollection", doc_id: str):
+        self.collection = collection
+        self.id = doc_id
+
+    async def get(self) -> FakeSnapshot:
+        return self.collection.snapshot(self.id)
+
+    async def set(self, data: Dict[str, Any]) -> None:
+        self.collection.write(self.id, copy.deepcopy(data))
+
+    async def update(self, data: Dict[str, Any]) -> None:
+        self.collection.write(self.id, {**self.collection.docs[self.id], **copy.deepcopy(data)})
+
+
+class FakeQuery:
+    def __init__(self, collection: "FakeCollection", filters: Tuple = (), limit: Optional[int] = None):
+        self.collection = collection
+        self.filters = filters
+        self._limit = limit
+
+    def where(self, field: str, op: str, value: Any) -> "FakeQuery":
+        assert op == "==", "only equality filters are faked"
+        return FakeQuery(self.collection, self.filters + ((field, value),), self._limit)
+
+    def limit(self, count: int) -> "FakeQuery":
+        return FakeQuery(self.collection, self.filters, count)
+
+    async def stream(self):
+        matches = [
+            doc_id
+            for doc_id, data in self.collection.docs.items()
+            if all(data.get(field) == value for field, value in self.filters)
+        ]
+        for doc_id in matches[: self._limit]:
+            yield self.collection.snapshot(doc_id)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, name: str):
+        super().__init__(self)
+        self.name = name
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.update_times: Dict[str, int] = {}
+
+    def document(self, doc_id: str) -> FakeDocumentReference:
+        return FakeDocumentReference(self, doc_id)
+
+    def snapshot(self, doc_id: str) -> FakeSnapshot:
+        return FakeSnapshot(self.document(doc_id), self.docs.get(doc_id), self.update_times.get(doc_id))
+
+    def write(self, doc_id: str, data: Dict[str, Any]) -> None:
+        self.docs[doc_id] = data
+        self.update_times[doc_id] = next(_versions)
+
+
+class FakeWriteOption:
+    def __init__(self, last_update_time: int):
+        self.last_update_time = last_update_time
+
+
+class FakeBatch:
+    def __init__(self, db: "FakeFirestore"):
+        self.db = db
+        self.writes: List[Tuple[str, FakeDocumentReference, Dict[str, Any], Optional[FakeWriteOption]]] = []
+
+    def set(self, reference: FakeDocumentReference, data: Dict[str, Any]) -> None:
+        self.writes.append(("set", reference, data, None))
+
+    def update(self, reference: FakeDocumentReference, data: Dict[str, Any], option=None) -> None:
+        self.writes.append(("update", reference, data, option))
+
+    async def commit(self) -> None:
+        await self.db.before_commit(self)
+        # All writes apply, or none do
+        for _, reference, _, option in self.writes:
+            current = reference.collection.update_times.get(reference.id)
+            if option is not None and option.last_update_time != current:
+                raise FailedPrecondition("the document was updated since it was read")
+        for kind, reference, data, _ in self.writes:
+            if kind == "set":
+                await reference.set(data)
+            else:
+                await reference.update(data)
+        self.db.commits += 1
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.collections: Dict[str, FakeCollection] = {}
+        self.commits = 0
+
+    def collection(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection(name))
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+    def write_option(self, last_update_time: int) -> FakeWriteOption:
+        return FakeWriteOption(last_update_time)
+
+    async def get_all(self, references: List[FakeDocumentReference]):
+        for reference in references:
+            yield await reference.get()
+
+    async def before_commit(self, batch: FakeBatch) -> None:
+        """Tests override this to simulate a concurrent writer."""
@@ -0,0 +1,89 @@
+from modules.patients.helpers.lab_pdf_text_parser import (
+    find_line_analytes,
+    merge_page_group_results,
+    parse_lab_pdf_text,
+)
+
+HEADER = """Patient: DOE, JOHN       Sex: M
+Date of Birth: 12-Mar-1985   Collection Date: 2024-05-02
+Test Result Flag Units Reference Range"""
+
+SIMPLE_RESULTS = """Sodium 140 mmol/L 135-145
+Potassium 4.2 mmol/L 3.5-5.0
+Creatinine 71 umol/L 50-100
+Calcium 2.35 mmol/L 2.10-2.55
+Albumin 44 g/L 35-50
+Magnesium 0.85 mmol/L 0.65-1.05
+Ferritin 120 ug/L 30-400
+Zinc 14.1 umol/L 11-23"""
+
+# Results in a "Name (reference range) value unit" layout the line parser does not read
+RANGE_FIRST_RESULTS = """Cholesterol (2.00-5.19) 6.8 mmol/L
+LDL Cholesterol (<3.50) 4.9 mmol/L
+Glucose, Fasting (3.6-6.0) 9.4 mmol/L
+Hemoglobin A1C (<6.0) 7.1 %
+TSH (0.32-4.00) 6.2 mU/L
+Prostate Specific Antigen (<4.0) 6.8 ug/L"""
+
+
+def test_parses_a_report_whose_result_lines_all_parse():
+    response = parse_lab_pdf_text([f"{HEADER}\n{SIMPLE_RESULTS}"])
+
+    assert response["patient"] == "DOE, JOHN"
+    assert response["collection_date"] == "2024-05-02"
+    assert response["age"] == "39"
+    assert response["Sodium"] == {"number": "140", "unit": "mmol/L"}
+    assert response["Zinc"] == {"number": "14.1", "unit": "umol/L"}
+
+
+def test_falls_back_when_a_named_analyte_has_no_parsed_value():
+    # Enough simple lines parse, but the abnormal results in the other layout would be lost
+    assert parse_lab_pdf_text([f"{HEADER}\n{SIMPLE_RESULTS}\n{RANGE_FIRST_RESULTS}"]) is None
+
+
+def test_falls_back_when_a_named_analyte_is_on_another_page():
+    assert parse_lab_pdf_text([f"{HEADER}\n{SIMPLE_RESULTS}", "Tumour markers\nPSA (<4.0) 6.8 ug/L"]) is None
+
+
+def test_falls_back_when_an_analyte_has_conflicting_values():
+    assert parse_lab_pdf_text([f"{HEADER}\n{SIMPLE_RESULTS}\nSodium 152 mmol/L"]) is None
+
+
+def test_line_analytes_take_the_longest_name():
+    assert find_line_analytes("HDL Cholesterol 1.55 mmol/L") == ["hdl_cholesterol"]
+    assert find_line_analytes("Cholesterol/HDL Ratio 3.5") == ["cholesterol_to_hdl_ratio"]
+    assert find_line_analytes("Glucose, Fasting (3.6-6.0) 9.4 mmol/L") == ["Glucose"]
+    assert find_line_analytes("Terms of service apply everywhere.") == []
+
+
+def test_merge_keeps_the_first_reported_value():
+    merged = merge_page_group_results(
+        [
+            {"sex": "M", "Sodium": {"number": "140", "unit": "mmol/L"}},
+            {"sex": "F", "Sodium": {"number": "152", "unit": "mmol/L"}},
+        ]
+    )
+
+    assert merged == {"sex": "M", "Sodium": {"number": "140", "unit": "mmol/L"}}
+
+
+def test_merge_lets_a_later_group_fill_an_empty_value():
+    merged = merge_page_group_results(
+        [
+            {"patient": "", "collection_date": None, "Total_PSA": {"number": None, "unit": None}},
+            {"patient": "DOE, JOHN", "collection_date": "2024-05-02", "Total_PSA": {"number": "6.8", "unit": "ug/L"}},
+            {"patient": None, "Total_PSA": {"number": "", "unit": ""}},
+        ]
+    )
+
+    assert merged == {
+        "patient": "DOE, JOHN",
+        "collection_date": "2024-05-02",
+        "Total_PSA": {"number": "6.8", "unit": "ug/L"},
+    }
+
+
+def test_merge_keeps_an_entity_no_group_reported():
+    merged = merge_page_group_results([{"Total_PSA": {"number": None, "unit": None}}, {}])
+
+    assert merged == {"Total_PSA": {"number": None, "unit": None}}
@@ -0,0 +1,138 @@
+import asyncio
+import copy
+
+import pytest
+
+from models.patient_models import GeneResultReport, GeneResultsGrouped
+from queries.patient_queries import (
+    BLOOD_WORK_FILE,
+    add_blood_work_report_dicts_to_patient,
+    add_blood_work_reports_to_patient,
+    add_gene_result_reports_to_patient,
+    build_blood_work_report_dict,
+    check_duplicate_blood_work_file_hash,
+    get_uploaded_file_doc_id,
+    get_uploaded_file_hashes,
+)
+import queries.patient_queries as patient_queries
+
+PATIENT = {
+    "id": "patient-1",
+    "doctor_id": "doctor-1",
+    "firstName": "John",
+    "lastName": "Doe",
+    "practitioner": "Dr Smith",
+    "phone": "5550100",
+    "address": "1 Main St",
+    "email": "john@example.com",
+    "gender": "male",
+    "bloodWorkReports": [],
+    "geneResultReports": [],
+}
+
+
+@pytest.fixture
+def patients(firestore):
+    firestore.collection("patients").write("patient-1", copy.deepcopy(PATIENT))
+    return firestore.collection("patients")
+
+
+def add_report(file_hash: str):
+    return add_blood_work_reports_to_patient(
+        "patient-1", "doctor-1", "male", 40, None, "2024-05-02", {}, file_hash, f"{file_hash}.pdf"
+    )
+
+
+def stored_hashes(patients, field: str = "bloodWorkReports"):
+    return [report["fileHash"] for report in patients.docs["patient-1"][field]]
+
+
+def indexed_hashes(firestore):
+    return sorted(entry["fileHash"] for entry in firestore.collection("uploaded_files").docs.values())
+
+
+def race_once(firestore, patients, write):
+    """Make the first commit find the patient changed by another writer since it was read."""
+
+    async def before_commit(batch):
+        if firestore.commits == 0 and not getattr(firestore, "raced", False):
+            firestore.raced = True
+            write(patients.docs["patient-1"])
+            patients.write("patient-1", patients.docs["patient-1"])
+
+    firestore.before_commit = before_commit
+
+
+def test_append_stores_the_report_and_its_index_entry(firestore, patients):
+    patient = asyncio.run(add_report("hash-a"))
+
+    assert [report["fileHash"] for report in patient.bloodWorkReports] == ["hash-a"]
+    assert indexed_hashes(firestore) == ["hash-a"]
+    assert asyncio.run(check_duplicate_blood_work_file_hash("patient-1", "doctor-1", "hash-a"))
+
+
+def test_append_retries_instead_of_overwriting_a_concurrent_write(firestore, patients):
+    concurrent = build_blood_work_report_dict("male", 40, None, "2024-04-01", {}, "hash-b", "b.pdf")
+    race_once(firestore, patients, lambda patient: patient["bloodWorkReports"].append(concurrent))
+
+    asyncio.run(add_report("hash-a"))
+
+    assert stored_hashes(patients) == ["hash-b", "hash-a"]
+    assert indexed_hashes(firestore) == ["hash-a"]
+
+
+def test_append_rejects_a_file_already_stored_on_the_patient(firestore, patients):
+    patients.docs["patient-1"]["bloodWorkReports"] = [{"fileHash": "hash-a", "fileName": "a.pdf"}]
+
+    with pytest.raises(ValueError, match="already been uploaded"):
+        asyncio.run(add_report("hash-a"))
+    assert indexed_hashes(firestore) == []
+
+
+def test_batch_append_leaves_out_files_uploaded_meanwhile(firestore, patients):
+    def upload_hash_b(patient):
+        patient["bloodWorkReports"].append({"fileHash": "hash-b", "fileName": "b.pdf"})
+        firestore.collection("uploaded_files").write(
+            get_uploaded_file_doc_id("patient-1", BLOOD_WORK_FILE, "hash-b"),
+            {"patientId": "patient-1", "doctorId": "doctor-1", "fileHash": "hash-b"},
+        )
+
+    race_once(firestore, patients, upload_hash_b)
+    reports = [
+        build_blood_work_report_dict("male", 40, None, "2024-05-02", {}, file_hash, f"{file_hash}.pdf")
+        for file_hash in ("hash-a", "hash-b", "hash-c")
+    ]
+
+    patient, added = asyncio.run(add_blood_work_report_dicts_to_patient("patient-1", "doctor-1", reports))
+
+    assert [report["fileHash"] for report in added] == ["hash-a", "hash-c"]
+    assert stored_hashes(patients) == ["hash-b", "hash-a", "hash-c"]
+    assert indexed_hashes(firestore) == ["hash-a", "hash-b", "hash-c"]
+
+
+def test_gene_append_retries_instead_of_overwriting_a_concurrent_write(firestore, patients):
+    report = GeneResultReport(reportDate="2024-05-02", geneResultsGrouped=GeneResultsGrouped())
+    concurrent = {**report.model_dump(), "fileHash": "hash-f", "fileName": "earlier.csv"}
+    race_once(firestore, patients, lambda patient: patient["geneResultReports"].append(concurrent))
+
+    asyncio.run(add_gene_result_reports_to_patient("patient-1", "doctor-1", report, "hash-g", "genes.csv"))
+
+    assert stored_hashes(patients, "geneResultReports") == ["hash-f", "hash-g"]
+    assert indexed_hashes(firestore) == ["hash-g"]
+
+
+def test_duplicate_check_finds_a_file_uploaded_before_the_index(firestore, patients):
+    patients.docs["patient-1"]["bloodWorkReports"] = [{"fileHash": "hash-old", "fileName": "old.pdf"}]
+
+    assert asyncio.run(check_duplicate_blood_work_file_hash("patient-1", "doctor-1", "hash-old"))
+    assert not asyncio.run(check_duplicate_blood_work_file_hash("patient-1", "doctor-1", "hash-new"))
+    assert asyncio.run(
+        get_uploaded_file_hashes("patient-1", "doctor-1", BLOOD_WORK_FILE, ["hash-old", "hash-new"])
+    ) == {"hash-old"}
+
+
+def test_duplicate_check_reads_only_the_index_once_backfilled(firestore, patients, monkeypatch):
+    monkeypatch.setattr(patient_queries.settings, "UPLOADED_FILE_INDEX_FALLBACK", False)
+    patients.docs["patient-1"]["bloodWorkReports"] = [{"fileHash": "hash-old", "fileName": "old.pdf"}]
+
+    assert not asyncio.run(check_duplicate_blood_work_file_hash("patient-1", "doctor-1", "hash-old"))
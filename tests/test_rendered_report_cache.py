@@ -0,0 +1,64 @@
+from datetime import date
+from functools import partial
+
+import pytest
+
+from male_report.gene_report.parse_gene_data import GeneResultIndex
+from utils.rendered_report_cache import RenderedPageCache, get_page_render_key, is_rendered_report_current
+
+GENE_REPORT = {
+    "geneResultsGrouped": {
+        "methylation": [{"name": "MTHFR", "rs_id": "rs1801133", "genotype": "CT"}],
+        "detox": [{"name": "GSTM1", "rs_id": None, "genotype": "Deleted"}],
+    }
+}
+
+
+def gene_page(report, gene_index):
+    pass
+
+
+def gene_render(report):
+    return partial(gene_page, report, GeneResultIndex(report))
+
+
+def test_gene_page_key_does_not_depend_on_the_index_instance():
+    assert get_page_render_key(gene_render(GENE_REPORT)) == get_page_render_key(gene_render(GENE_REPORT))
+
+
+def test_gene_page_key_changes_with_the_results():
+    changed = {"geneResultsGrouped": {"methylation": [{"name": "MTHFR", "rs_id": "rs1801133", "genotype": "TT"}]}}
+    assert get_page_render_key(gene_render(GENE_REPORT)) != get_page_render_key(gene_render(changed))
+
+
+def test_dates_are_encoded_by_value():
+    first = partial(gene_page, {"collectionDate": date(2026, 1, 5)}, None)
+    second = partial(gene_page, {"collectionDate": date(2026, 1, 5)}, None)
+    assert get_page_render_key(first) == get_page_render_key(second)
+
+
+def test_unknown_argument_types_are_rejected():
+    with pytest.raises(TypeError):
+        get_page_render_key(partial(gene_page, GENE_REPORT, object()))
+
+
+def test_second_gene_render_hits_the_page_cache():
+    cache = RenderedPageCache(max_bytes=1024)
+    assert cache.get(get_page_render_key(gene_render(GENE_REPORT))) is None
+    cache.put(get_page_render_key(gene_render(GENE_REPORT)), b"%PDF-page")
+
+    assert cache.get(get_page_render_key(gene_render(GENE_REPORT))) == b"%PDF-page"
+    assert cache.stats.as_dict()["hits"] == 1
+    assert cache.stats.as_dict()["misses"] == 1
+
+
+def test_rendered_report_is_reused_only_for_the_recorded_blob_generation():
+    entry = {"renderKey": "key", "generation": 1700000000000001}
+
+    assert is_rendered_report_current(entry, "key", 1700000000000001)
+    assert not is_rendered_report_current(entry, "other-key", 1700000000000001)
+    # Overwritten by another upload, or deleted
+    assert not is_rendered_report_current(entry, "key", 1700000000000002)
+    assert not is_rendered_report_current(entry, "key", None)
+    # Entries written before generations were recorded
+    assert not is_rendered_report_current({"renderKey": "key"}, "key", 1700000000000001)
@@ -0,0 +1,17 @@
+from utils import report_assets
+from utils.report_assets import BASE_DIR, get_report_image, glob_report_assets
+
+
+def test_assets_resolve_from_any_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    image_paths = glob_report_assets(report_assets.REPORT_IMAGE_PATTERNS)
+
+    assert "male_report/short_report/cover.jpg" in image_paths
+    cover_path = "male_report/short_report/cover.jpg"
+    assert get_report_image(cover_path) == str(BASE_DIR / cover_path)
+
+
+def test_pattern_without_matches_is_reported(capsys):
+    assert glob_report_assets(("male_report/short_report/*.missing",)) == []
+    assert "no report assets match male_report/short_report/*.missing" in capsys.readouterr().out
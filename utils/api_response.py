@@ -48,7 +48,11 @@ def error_response(message: str, status_code: int = 400, errors: Any = None) ->
 
 def handle_http_exception(exc: HTTPException) -> JSONResponse:
     """Convert HTTPException to unified error response"""
-    return error_response(message=exc.detail, status_code=exc.status_code)
+    response = error_response(message=exc.detail, status_code=exc.status_code)
+    # Keep headers the exception carries, e.g. Content-Range on a 416
+    if exc.headers:
+        response.headers.update(exc.headers)
+    return response
 
 
 def handle_generic_exception(exc: Exception) -> JSONResponse:
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Any, Dict
+
+from utils.cache_stats import CacheStats
+
+# Hit and miss counters of the extraction cache on this instance
+extraction_cache_stats = CacheStats()
+
+
+def get_prompt_version(*parts: str) -> str:
+    """
+    Hash of everything that decides what an extractor returns for a file (model name,
+    prompt text), so editing a prompt invalidates the cached extractions made with it.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def get_extraction_doc_id(file_hash: str, prompt_version: str) -> str:
+    """Firestore document id for the cached extraction of a file with one prompt version."""
+    return f"{file_hash}_{prompt_version}"
+
+
+class ExtractionSourceStats:
+    """Per-process count of uploaded files by where their extraction came from."""
+
+    # "local" files were read without an LLM, "cache" ones reused an earlier Gemini extraction
+    SOURCES = ("local", "cache", "gemini")
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.pages = {"total": 0, "sent": 0}
+
+    def record(self, file_type: str, source: str) -> None:
+        counts = self.counts.setdefault(file_type, dict.fromkeys(self.SOURCES, 0))
+        counts[source] += 1
+
+    def record_pages(self, total_pages: int, sent_pages: int) -> None:
+        """Pages of a PDF sent to Gemini, out of the pages it has."""
+        self.pages["total"] += total_pages
+        self.pages["sent"] += sent_pages
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = {}
+        for file_type, counts in self.counts.items():
+            total = sum(counts.values())
+            stats[file_type] = {
+                **counts,
+                "total": total,
+                "without_llm_rate": round((counts["local"] + counts["cache"]) / total, 4) if total else None,
+            }
+        if self.pages["total"]:
+            stats["pdf_pages"] = {
+                **self.pages,
+                "sent_rate": round(self.pages["sent"] / self.pages["total"], 4),
+            }
+        return stats
+
+
+extraction_source_stats = ExtractionSourceStats()
@@ -1,6 +1,8 @@
-from google.cloud import storage
 from datetime import timedelta
 import re
+from typing import Optional
+
+from config.cloud_storage import get_bucket
 
 
 def parse_gs_uri(gs_uri: str):
@@ -13,17 +15,17 @@ def parse_gs_uri(gs_uri: str):
     return match.group(1), match.group(2)
 
 
-def generate_signed_url(gs_uri: str, expiration_minutes: int = 60) -> str:
+def generate_signed_url(gs_uri: str, expiration_minutes: int = 60, response_disposition: Optional[str] = None) -> str:
     """
     Generate a signed URL for a GCS object given its gs:// URI.
+    response_disposition, if given, is the Content-Disposition storage sends with the file.
     """
     bucket_name, blob_name = parse_gs_uri(gs_uri)
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-    blob = bucket.blob(blob_name)
+    blob = get_bucket(bucket_name).blob(blob_name)
     url = blob.generate_signed_url(
         version="v4",
         expiration=timedelta(minutes=expiration_minutes),
         method="GET",
+        response_disposition=response_disposition,
     )
     return url
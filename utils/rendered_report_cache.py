@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache, partial
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.cache_stats import CacheStats
+
+BASE_DIR = Path(__file__).parent.parent
+
+# Everything that decides how a short report looks: page modules, fonts and images
+REPORT_TEMPLATE_DIRS = ("male_report/short_report", "female_report/short_report", "male_report/fonts")
+REPORT_TEMPLATE_FILES = ("utils/report_assets.py", "utils/report_rendering.py")
+
+# The request fields the short report pages actually draw
+REPORT_RENDER_FIELDS = (
+    "firstName",
+    "lastName",
+    "age",
+    "sex",
+    "dateOfBirth",
+    "collectionDate",
+    "practitioner",
+    "recommendations",
+    "selectedBioMarkerGroups",
+)
+
+rendered_report_cache_stats = CacheStats()
+
+
+class RenderedPageCache:
+    """
+    In-memory LRU of rendered page PDFs, keyed by get_page_render_key and bounded by size.
+
+    Pages are only ever reused for identical inputs, so an entry never goes stale; the
+    least recently used pages are dropped once the cache holds more than max_bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.stats = CacheStats()
+        self._pages: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        pdf_bytes = self._pages.get(key)
+        self.stats.record(hit=pdf_bytes is not None)
+        if pdf_bytes is not None:
+            self._pages.move_to_end(key)
+        return pdf_bytes
+
+    def put(self, key: str, pdf_bytes: bytes) -> None:
+        if len(pdf_bytes) > self.max_bytes or key in self._pages:
+            return
+        self._pages[key] = pdf_bytes
+        self.size += len(pdf_bytes)
+        while self.size > self.max_bytes:
+            _, evicted = self._pages.popitem(last=False)
+            self.size -= len(evicted)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**self.stats.as_dict(), "pages": len(self._pages), "bytes": self.size}
+
+
+@lru_cache(maxsize=None)
+def get_report_template_version() -> str:
+    """
+    Hash of every report template file, so a deploy that changes a page, a font or an
+    image invalidates the cache without anyone having to bump a version by hand.
+    """
+    digest = hashlib.sha256()
+    paths = [path for directory in REPORT_TEMPLATE_DIRS for path in (BASE_DIR / directory).rglob("*")]
+    paths += [BASE_DIR / path for path in REPORT_TEMPLATE_FILES]
+    for path in sorted(paths):
+        if path.is_file() and "__pycache__" not in path.parts:
+            digest.update(str(path.relative_to(BASE_DIR)).encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def get_report_render_key(request_data: Dict[str, Any], blood_work_group: Any) -> str:
+    """
+    Content hash of everything a short report is rendered from.
+
+    Two requests with the same key produce the same PDF, so the second one can reuse
+    the blob uploaded for the first.
+    """
+    if hasattr(blood_work_group, "model_dump"):
+        blood_work_group = blood_work_group.model_dump()
+    payload = {
+        "template": get_report_template_version(),
+        "bloodWorkBioMarkerGroup": blood_work_group,
+        **{field: request_data.get(field) for field in REPORT_RENDER_FIELDS},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _encode_render_value(value: Any) -> Any:
+    """
+    JSON form of a render argument json can't encode itself. Anything else raises, since
+    a fallback like str() would put memory addresses in the key and never hit again.
+    """
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "as_render_key"):
+        return value.as_render_key()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot build a page render key from {type(value).__name__}")
+
+
+def get_page_render_key(render: partial) -> str:
+    """
+    Content hash of one page render job: the page function, its arguments and the
+    template version. Jobs must be given only the inputs their page draws, so that
+    unrelated report changes keep the key stable.
+    """
+    payload = {
+        "template": get_report_template_version(),
+        "page": f"{render.func.__module__}.{render.func.__qualname__}",
+        "args": render.args,
+        "kwargs": render.keywords,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_encode_render_value)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_rendered_report_doc_id(blob_name: str) -> str:
+    """Firestore document id for the cache entry of a report blob."""
+    return hashlib.sha256(blob_name.encode("utf-8")).hexdigest()
+
+
+def is_rendered_report_current(
+    cache_entry: Optional[Dict[str, Any]], render_key: str, blob_generation: Optional[int]
+) -> bool:
+    """
+    True if the blob still exists and is the very object the entry was recorded for, and
+    that object was rendered from render_key. A blob deleted or overwritten since the
+    entry was written has a different generation (or none), so it is rendered again.
+    """
+    return (
+        bool(cache_entry)
+        and blob_generation is not None
+        and cache_entry.get("generation") == blob_generation
+        and cache_entry.get("renderKey") == render_key
+    )
@@ -0,0 +1,110 @@
+from functools import lru_cache
+from pathlib import Path
+import time
+from typing import Iterable, List, Union
+
+from PIL import Image
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+# ReportLab ASCII85-encodes every embedded image in pure Python by default, which took longer
+# than drawing the rest of the page. Binary streams are valid PDF, smaller and skip that work.
+rl_config.useA85 = 0
+
+# Asset paths are relative to the repository root, wherever the process is started from
+BASE_DIR = Path(__file__).parent.parent
+
+# The male and female report font files are identical, one copy is registered for both
+REPORT_FONTS = {
+    "Roboto-Thin": "male_report/fonts/Roboto-Thin.ttf",
+    "Roboto-Regular": "male_report/fonts/Roboto-Regular.ttf",
+    "Roboto-Bold": "male_report/fonts/Roboto-Bold.ttf",
+}
+
+# Backgrounds, covers and legends the report pages draw as they are
+REPORT_IMAGE_PATTERNS = (
+    "male_report/short_report/*.jpg",
+    "female_report/short_report/*.jpg",
+    "male_report/gene_report/cover_background.png",
+)
+
+# Transparent PNGs the report pages draw on a white background
+WHITE_BG_IMAGE_PATTERNS = (
+    "male_report/short_report/*_bar.png",
+    "female_report/short_report/*_bar.png",
+    "male_report/gene_report/yellow.png",
+    "male_report/gene_report/purple.png",
+)
+
+
+@lru_cache(maxsize=None)
+def register_report_fonts() -> None:
+    """Register the report fonts with ReportLab, once per process."""
+    for font_name, font_path in REPORT_FONTS.items():
+        pdfmetrics.registerFont(TTFont(font_name, str(BASE_DIR / font_path)))
+
+
+@lru_cache(maxsize=None)
+def get_report_image(image_path: str) -> Union[str, ImageReader]:
+    """
+    Return a reusable drawImage handle for a report background, cover or legend image.
+
+    JPEGs are embedded into the PDF byte for byte without being decoded, and ReportLab
+    identifies them by path, so the path itself is the cheapest handle. Other formats are
+    decoded once into a shared ImageReader.
+    """
+    if image_path.lower().endswith((".jpg", ".jpeg")):
+        return str(BASE_DIR / image_path)
+    reader = ImageReader(str(BASE_DIR / image_path))
+    reader.getRGBData()
+    return reader
+
+
+@lru_cache(maxsize=None)
+def get_white_bg_image(image_path: str) -> ImageReader:
+    """
+    Return a transparent PNG composited onto a white background, as a reusable ImageReader.
+
+    The compositing happens once per process and nothing is written to disk, so pages
+    rendered concurrently can share the same reader.
+    """
+    with Image.open(BASE_DIR / image_path) as img:
+        new_img = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        new_img.paste(img, (0, 0), img)
+        return ImageReader(new_img.convert("RGB"))
+
+
+def glob_report_assets(patterns: Iterable[str]) -> List[str]:
+    """
+    Repository-relative paths matching the patterns, the same strings the pages pass in,
+    so the warmed cache entries are the ones the pages hit.
+    """
+    paths = set()
+    for pattern in patterns:
+        matches = [path.relative_to(BASE_DIR).as_posix() for path in BASE_DIR.glob(pattern)]
+        if not matches:
+            print(f"Warning: no report assets match {pattern} under {BASE_DIR}")
+        paths.update(matches)
+    return sorted(paths)
+
+
+def warm_report_assets() -> None:
+    """Register the fonts and preprocess every report image up front."""
+    started_at = time.perf_counter()
+    register_report_fonts()
+
+    image_paths = glob_report_assets(REPORT_IMAGE_PATTERNS)
+    for image_path in image_paths:
+        get_report_image(image_path)
+
+    white_bg_paths = glob_report_assets(WHITE_BG_IMAGE_PATTERNS)
+    for image_path in white_bg_paths:
+        # Decode the RGB data now too; ReportLab hashes it on every drawImage
+        get_white_bg_image(image_path).getRGBData()
+
+    print(
+        f"Loaded {len(REPORT_FONTS)} report fonts and {len(image_paths) + len(white_bg_paths)} report images "
+        f"in {(time.perf_counter() - started_at) * 1000:.0f} ms"
+    )
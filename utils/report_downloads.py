@@ -0,0 +1,154 @@
+import asyncio
+import re
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+from config.env_config import settings
+from utils.api_response import success_response
+from utils.gcs_signed_url import generate_signed_url
+
+# Bytes fetched from storage per ranged read, which is also the most a download holds in memory
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# "stream" sends the bytes through the API, the others hand the client a signed storage URL
+DOWNLOAD_MODES = ("stream", "signed_url", "redirect")
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=start-end" header into inclusive offsets.
+
+    Returns None when the whole file should be sent (no header, or a multi-range or
+    malformed header, which RFC 9110 allows a server to ignore). Raises a 416 when the
+    range cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.group(1), match.group(2)
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    if size == 0 or start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def iter_blob_range(blob, start: int, end: int, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield blob bytes start..end (inclusive) in ranged reads, pinned to the generation that
+    was inspected, so a report overwritten mid-download fails instead of mixing versions.
+    """
+    position = start
+    while position <= end:
+        chunk_end = min(position + chunk_size - 1, end)
+        yield await asyncio.to_thread(
+            blob.download_as_bytes,
+            start=position,
+            end=chunk_end,
+            if_generation_match=blob.generation,
+            checksum=None,
+        )
+        position = chunk_end + 1
+
+
+async def stream_pdf_blob(bucket, blob_name: str, request: Request, download_name: Optional[str] = None) -> Response:
+    """
+    Stream a PDF from storage to the client in chunks, with ETag and Range support.
+
+    One metadata request replaces the exists() check, and the body is read from storage
+    chunk by chunk while it is sent, so memory use does not grow with the report size.
+    """
+    blob = await asyncio.to_thread(bucket.get_blob, blob_name)
+    if blob is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Report not found",
+        )
+
+    etag = f'"{blob.etag}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename={download_name or blob_name}",
+    }
+    if blob.updated:
+        headers["Last-Modified"] = blob.updated.strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    size = blob.size or 0
+    byte_range = None
+    # A Range is only honoured when If-Range (if sent) still names the current version
+    if request.headers.get("if-range") in (None, etag):
+        byte_range = parse_range_header(request.headers.get("range"), size)
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        iter_blob_range(blob, start, end),
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers,
+    )
+
+
+async def send_report_pdf(
+    bucket, blob_name: str, request: Request, download_name: Optional[str] = None, mode: Optional[str] = None
+) -> Response:
+    """
+    Deliver a report PDF in the requested download mode (REPORT_DOWNLOAD_MODE by default).
+
+    "signed_url" returns a short-lived V4 signed URL in the response data and "redirect"
+    answers 302 to it, so the client downloads straight from storage and no report bytes
+    pass through the API worker. "stream" streams the PDF through the API.
+    """
+    mode = mode or settings.REPORT_DOWNLOAD_MODE
+    if mode not in DOWNLOAD_MODES:
+        raise HTTPException(status_code=400, detail=f"Unsupported download mode: {mode}")
+    if mode == "stream":
+        return await stream_pdf_blob(bucket, blob_name, request, download_name)
+
+    blob = await asyncio.to_thread(bucket.get_blob, blob_name)
+    if blob is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Report not found",
+        )
+
+    expiration_minutes = settings.REPORT_SIGNED_URL_MINUTES
+    signed_url = await asyncio.to_thread(
+        generate_signed_url,
+        f"gs://{bucket.name}/{blob_name}",
+        expiration_minutes=expiration_minutes,
+        response_disposition=f"attachment; filename={download_name or blob_name}",
+    )
+    if mode == "redirect":
+        return RedirectResponse(signed_url, status_code=302, headers={"Cache-Control": "no-store"})
+    return success_response(
+        data={"url": signed_url, "expiresIn": expiration_minutes * 60},
+        message="Report download URL generated successfully",
+        status_code=200,
+    )
@@ -0,0 +1,130 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import io
+import multiprocessing
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from pypdf import PdfWriter
+
+from config.env_config import settings
+from utils.rendered_report_cache import RenderedPageCache, get_page_render_key
+from utils.report_assets import warm_report_assets
+
+# Request fields the short report cover pages draw
+COVER_FIELDS = ("firstName", "lastName", "age", "dateOfBirth", "collectionDate", "practitioner")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+page_cache = RenderedPageCache(max_bytes=settings.REPORT_PAGE_CACHE_MB * 1024 * 1024)
+
+
+def cover_inputs(report: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a report request the cover page draws."""
+    return {field: report[field] for field in COVER_FIELDS if field in report}
+
+
+def panel_recommendation_inputs(report: Dict[str, Any], panel_name: str) -> Dict[str, Any]:
+    """The part of a report request the recommendation and supplement pages of one panel draw."""
+    inputs = {
+        "recommendations": [rec for rec in report.get("recommendations") or [] if rec.get("panel") == panel_name]
+    }
+    if "sex" in report:
+        inputs["sex"] = report["sex"]
+    return inputs
+
+
+def get_container_cpu_count() -> int:
+    """
+    Number of CPUs this process may actually use: the cgroup v2 CPU quota if one is set
+    (Cloud Run / Docker limits), otherwise the CPU affinity of the process.
+    """
+    try:
+        cpu_count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpu_count = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpu_count = min(cpu_count, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpu_count)
+
+
+def get_render_executor() -> ProcessPoolExecutor:
+    """Return the process-wide report rendering pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        workers = settings.REPORT_RENDER_WORKERS or get_container_cpu_count()
+        # spawn, not fork: the API process holds gRPC/Firestore threads that must not be forked
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            # Each worker preprocesses the report images once when it starts
+            initializer=warm_report_assets,
+        )
+    return _executor
+
+
+def shutdown_render_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def render_page(render: Callable[[], io.BytesIO]) -> bytes:
+    """Run one page render job inside a pool worker and return the PDF bytes."""
+    return render().getvalue()
+
+
+async def render_pages(
+    pages: List[Callable[[], io.BytesIO]], cache: Optional[RenderedPageCache] = None
+) -> List[io.BytesIO]:
+    """
+    Render page jobs concurrently in the rendering pool without blocking the event loop.
+
+    With a cache, pages rendered before from the same inputs are reused and only the
+    others are sent to the pool. Buffers are returned in the same order as the jobs.
+    """
+    keys = [get_page_render_key(render) for render in pages] if cache is not None else [None] * len(pages)
+    rendered: List[Optional[bytes]] = [cache.get(key) for key in keys] if cache is not None else [None] * len(pages)
+
+    missing = [position for position, pdf_bytes in enumerate(rendered) if pdf_bytes is None]
+    if missing:
+        loop = asyncio.get_running_loop()
+        executor = get_render_executor()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, render_page, pages[position]) for position in missing)
+        )
+        for position, pdf_bytes in zip(missing, results):
+            rendered[position] = pdf_bytes
+            if cache is not None:
+                cache.put(keys[position], pdf_bytes)
+
+    return [io.BytesIO(pdf_bytes) for pdf_bytes in rendered]
+
+
+def merge_pdf_buffers(buffers: List[io.BytesIO]) -> io.BytesIO:
+    """
+    Merge page buffers into a single PDF buffer, positioned at the start.
+
+    Every page is its own ReportLab document, so each one carries its own copy of the
+    background, legend and bar images. Identical objects are collapsed after appending,
+    so the merged report embeds every shared image once.
+    """
+    writer = PdfWriter()
+    for buffer in buffers:
+        writer.append(buffer)
+    writer.compress_identical_objects()
+
+    final_buffer = io.BytesIO()
+    writer.write(final_buffer)
+    writer.close()
+
+    final_buffer.seek(0)
+    return final_buffer